@@ -1,15 +1,41 @@
-from . import actions, actiontypes, instruments, locations, locationtypes, objects, object_log, users, utils
-from .comm import authenticate
+from . import (actions, actiontypes, compact, export, graph, instruments, locations, locationtypes, mirror, objects, object_log, permissions,
+               timeseries, users, utils, watcher)
+from .comm import (Client, authenticate, close_session, configure_cache, configure_data, configure_mirror, configure_rate_limit, configure_references,
+                   configure_response_cache, configure_retries, configure_session, configure_timeout,
+                   configure_version_cache, get_client)
+from .retry import DeadlineExceeded, deadline
 
 __all__ = [
+    "Client",
+    "DeadlineExceeded",
     "authenticate",
+    "close_session",
+    "configure_cache",
+    "configure_data",
+    "configure_mirror",
+    "configure_rate_limit",
+    "configure_references",
+    "configure_response_cache",
+    "configure_retries",
+    "configure_session",
+    "configure_timeout",
+    "configure_version_cache",
+    "deadline",
+    "get_client",
     "actions",
     "actiontypes",
+    "compact",
+    "export",
+    "graph",
     "instruments",
     "locations",
     "locationtypes",
+    "mirror",
     "objects",
     "object_log",
+    "permissions",
+    "timeseries",
     "users",
-    "utils"
+    "utils",
+    "watcher"
 ]
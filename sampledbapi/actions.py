@@ -4,7 +4,7 @@ This is the module docstring.
 
 from typing import List, Optional
 
-from .comm import SampleDBObject, get_data
+from .comm import SampleDBObject, get_client, get_data
 
 __all__ = ["Action", "get_list", "get"]
 
@@ -30,7 +30,11 @@ def get_list() -> List[Action]:
     Returns:
         List: List of :class:`~sampledbapi.actions.Action` objects.
     """
-    return [Action(a) for a in get_data("actions")]
+    entities = [Action(a) for a in get_data("actions")]
+    identity_map = get_client().identity_map
+    for entity in entities:
+        identity_map.put(("actions", entity.action_id), entity)
+    return entities
 
 
 def get(action_id: int) -> Action:
@@ -43,6 +47,7 @@ def get(action_id: int) -> Action:
         Action: The requested :class:`~sampledbapi.action.Action`.
     """
     if isinstance(action_id, int):
-        return Action(get_data(f"actions/{action_id}"))
+        return get_client().identity_map.get_or_fetch(
+            ("actions", action_id), lambda: Action(get_data(f"actions/{action_id}")))
     else:
         raise TypeError()
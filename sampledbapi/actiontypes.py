@@ -1,6 +1,6 @@
 from typing import List, Optional
 
-from .comm import SampleDBObject, get_data
+from .comm import SampleDBObject, get_client, get_data
 
 __all__ = ["ActionType", "get_list", "get"]
 
@@ -22,7 +22,11 @@ def get_list() -> List[ActionType]:
     Returns:
         List: List of :class:`~sampledbapi.actiontypes.Actiontype` objects.
     """
-    return [ActionType(a) for a in get_data("action_types")]
+    entities = [ActionType(a) for a in get_data("action_types")]
+    identity_map = get_client().identity_map
+    for entity in entities:
+        identity_map.put(("action_types", entity.type_id), entity)
+    return entities
 
 
 def get(type_id: int) -> ActionType:
@@ -35,6 +39,7 @@ def get(type_id: int) -> ActionType:
         ActionType: The requested :class:`~sampledbapi.actiontypes.ActionType`.
     """
     if isinstance(type_id, int):
-        return ActionType(get_data(f"action_types/{type_id}"))
+        return get_client().identity_map.get_or_fetch(
+            ("action_types", type_id), lambda: ActionType(get_data(f"action_types/{type_id}")))
     else:
         raise TypeError()
@@ -0,0 +1,24 @@
+"""Native asyncio API.
+
+Awaitable counterparts of the synchronous modules, e.g.
+``await sampledbapi.aio.objects.get(1)``. Requires the optional dependency
+`httpx` (``pip install sampledbapi[async]``).
+"""
+
+from . import actions, actiontypes, instruments, locations, locationtypes, objects, object_log, users
+from .comm import AsyncClient, authenticate, configure, get_client
+
+__all__ = [
+    "AsyncClient",
+    "authenticate",
+    "configure",
+    "get_client",
+    "actions",
+    "actiontypes",
+    "instruments",
+    "locations",
+    "locationtypes",
+    "objects",
+    "object_log",
+    "users"
+]
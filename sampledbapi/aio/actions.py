@@ -0,0 +1,39 @@
+from typing import List
+
+from ..actions import Action
+from .comm import get_client, get_data
+
+__all__ = ["get_list", "get"]
+
+
+async def get_list() -> List[Action]:
+    """Get a list of all actions.
+
+    Returns:
+        List: List of :class:`~sampledbapi.actions.Action` objects.
+    """
+    entities = [Action(d) for d in await get_data("actions")]
+    identity_map = get_client().identity_map
+    for entity in entities:
+        identity_map.put(("actions", entity.action_id), entity)
+    return entities
+
+
+async def _fetch(action_id: int) -> Action:
+    return Action(await get_data(f"actions/{action_id}"))
+
+
+async def get(action_id: int) -> Action:
+    """Get the specific action (action_id).
+
+    Args:
+        action_id (int): ID of the action to be retrieved.
+
+    Returns:
+        Action: The requested :class:`~sampledbapi.actions.Action`.
+    """
+    if isinstance(action_id, int):
+        return await get_client().get_or_fetch(
+            ("actions", action_id), lambda: _fetch(action_id))
+    else:
+        raise TypeError()
@@ -0,0 +1,39 @@
+from typing import List
+
+from ..actiontypes import ActionType
+from .comm import get_client, get_data
+
+__all__ = ["get_list", "get"]
+
+
+async def get_list() -> List[ActionType]:
+    """Get a list of all action types.
+
+    Returns:
+        List: List of :class:`~sampledbapi.actiontypes.ActionType` objects.
+    """
+    entities = [ActionType(d) for d in await get_data("action_types")]
+    identity_map = get_client().identity_map
+    for entity in entities:
+        identity_map.put(("action_types", entity.type_id), entity)
+    return entities
+
+
+async def _fetch(type_id: int) -> ActionType:
+    return ActionType(await get_data(f"action_types/{type_id}"))
+
+
+async def get(type_id: int) -> ActionType:
+    """Get the specific action type (type_id).
+
+    Args:
+        type_id (int): ID of the action type.
+
+    Returns:
+        ActionType: The requested :class:`~sampledbapi.actiontypes.ActionType`.
+    """
+    if isinstance(type_id, int):
+        return await get_client().get_or_fetch(
+            ("action_types", type_id), lambda: _fetch(type_id))
+    else:
+        raise TypeError()
@@ -0,0 +1,312 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import contextvars
+import json
+import typing
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterator, Optional
+
+from .. import comm
+from ..cache import IdentityMap
+from ..retry import DeadlineExceeded, RateLimiter, RetryPolicy, get_remaining_time
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None  # type: ignore
+
+
+class AsyncClient:
+    """Asynchronous connection to a SampleDB instance.
+
+    The async counterpart of :class:`~sampledbapi.comm.Client`. All requests
+    share one pooled `httpx` connection pool and at most `max_concurrency`
+    requests are in flight at the same time. If no address and API key are
+    given, those of the current synchronous client are used, so a single
+    call to :func:`sampledbapi.authenticate` is enough for both APIs.
+    Retries, rate limit and timeouts work as for the synchronous client and
+    are set via the attributes `retry_policy`, `rate_limiter` and `timeout`.
+
+    Requires the optional dependency `httpx`
+    (``pip install sampledbapi[async]``).
+
+    Arguments:
+        address: URL of the SampleDB server.
+        api_key: API token you can generate using "Preferences/API Tokens".
+        max_concurrency: Maximum number of concurrent requests.
+        max_connections: Maximum number of open connections.
+        max_keepalive_connections: Maximum number of idle connections kept
+            open for reuse.
+        keepalive_expiry: Seconds after which idle connections are closed.
+        transport: Custom `httpx` transport (e.g. for testing).
+    """
+
+    def __init__(self, address: Optional[str] = None,
+                 api_key: Optional[str] = None, max_concurrency: int = 10,
+                 max_connections: int = 10,
+                 max_keepalive_connections: int = 10,
+                 keepalive_expiry: float = 5.0, transport: Any = None):
+        if httpx is None:
+            raise ImportError("The asyncio API requires httpx, install it "
+                              "with 'pip install sampledbapi[async]'.")
+        if max_concurrency < 1 or max_connections < 1:
+            raise ValueError("Limits have to be positive.")
+        self.address = address
+        self.api_key = api_key
+        self.max_concurrency = max_concurrency
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry)
+        self._transport = transport
+        # Connection pool and semaphore of each event loop
+        self._pools: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop,
+            typing.Tuple[httpx.AsyncClient, asyncio.Semaphore]] = \
+            weakref.WeakKeyDictionary()
+        self._pending: Dict[Hashable, asyncio.Future] = {}
+        self.identity_map = IdentityMap()
+        self.retry_policy = RetryPolicy()
+        self.rate_limiter: Optional[RateLimiter] = None
+        self.timeout: typing.Tuple[float, float] = (10.0, 300.0)
+
+    def __repr__(self) -> str:
+        return f"AsyncClient ({self._credentials()[0]})"
+
+    async def __aenter__(self) -> AsyncClient:
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    @contextlib.contextmanager
+    def activate(self) -> Iterator[AsyncClient]:
+        """Use this client for module-level calls within a `with` block."""
+        token = _current_client.set(self)
+        try:
+            yield self
+        finally:
+            _current_client.reset(token)
+
+    async def authenticate(self, address: str, api_key: str):
+        """Authenticate with a SampleDB instance.
+
+        Arguments:
+            address: URL of the SampleDB server.
+            api_key: API token you can generate using "Preferences/API Tokens".
+        """
+        old_address, old_key = self.address, self.api_key
+        self.address, self.api_key = address, api_key
+        self.identity_map.invalidate()
+        try:
+            await self.get_data("users/me")
+        except httpx.HTTPStatusError as e:
+            self.address, self.api_key = old_address, old_key
+            raise Exception("Authentication not successful: " + str(e))
+
+    async def aclose(self):
+        """Close the connection pools.
+
+        The pool of the running event loop is closed directly, pools of
+        loops running in other threads are closed in their loop.
+        """
+        loop = asyncio.get_running_loop()
+        pools, self._pools = self._pools, weakref.WeakKeyDictionary()
+        for pool_loop, (http, _) in list(pools.items()):
+            if pool_loop is loop:
+                await http.aclose()
+            elif pool_loop.is_running():
+                asyncio.run_coroutine_threadsafe(http.aclose(), pool_loop)
+
+    async def get_or_fetch(self, key: Hashable,
+                           fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Get an entity from the identity map or fetch and store it.
+
+        Concurrent lookups of the same missing entity share one request.
+
+        Arguments:
+            key: Key of the entity, e.g. ``("users", 1)``.
+            fetch: Coroutine function retrieving the entity on a cache miss.
+        """
+        value = self.identity_map.get(key)
+        if value is not None:
+            return value
+        pending = self._pending.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            value = await fetch()
+            self.identity_map.put(key, value)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved if nobody else waits for it
+            future.exception()
+            raise
+        finally:
+            del self._pending[key]
+
+    def _credentials(self) -> typing.Tuple[Optional[str], Optional[str]]:
+        if self.address is None and self.api_key is None:
+            client = comm.get_client()
+            return client.address, client.api_key
+        return self.address, self.api_key
+
+    def _pool(self) -> typing.Tuple[httpx.AsyncClient, asyncio.Semaphore]:
+        # Connection pools and semaphores are bound to an event loop, so
+        # each loop the client is used from gets its own.
+        loop = asyncio.get_running_loop()
+        pool = self._pools.get(loop)
+        if pool is None:
+            # The pools of closed loops (e.g. of finished asyncio.run calls)
+            # cannot be closed any more, they are dropped so their
+            # connections are released
+            for closed in [other for other in self._pools if other.is_closed()]:
+                del self._pools[closed]
+            pool = self._pools[loop] = (
+                httpx.AsyncClient(limits=self._limits,
+                                  transport=self._transport),
+                asyncio.Semaphore(self.max_concurrency))
+        return pool
+
+    def _request_args(self, path: str) -> typing.Tuple[str, Dict]:
+        address, api_key = self._credentials()
+        if address is None:
+            raise Exception("You have to authenticate first.")
+        if api_key is None:
+            raise Exception("You need to provide an API key.")
+        return (address + "/api/v1/" + path,
+                {"Authorization": "Bearer " + api_key})
+
+    async def _send(self, method: str, path: str, **kwargs) -> httpx.Response:
+        url, headers = self._request_args(path)
+        http, semaphore = self._pool()
+        attempt = 0
+        while True:
+            attempt += 1
+            remaining = get_remaining_time()
+            if remaining is not None and remaining <= 0:
+                raise DeadlineExceeded(f"Deadline exceeded before {method} "
+                                       f"{path}")
+            if self.rate_limiter is not None:
+                wait = self.rate_limiter.reserve(remaining)
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            timeout = httpx.Timeout(self.timeout[1], connect=self.timeout[0])
+            remaining = get_remaining_time()
+            if remaining is not None:
+                if remaining <= 0:
+                    raise DeadlineExceeded(f"Deadline exceeded before "
+                                           f"{method} {path}")
+                timeout = httpx.Timeout(min(self.timeout[1], remaining),
+                                        connect=min(self.timeout[0],
+                                                    remaining))
+            try:
+                async with semaphore:
+                    response = await http.request(method, url,
+                                                  headers=headers,
+                                                  timeout=timeout, **kwargs)
+            except httpx.TransportError:
+                if not self.retry_policy.should_retry(method, attempt):
+                    raise
+                delay = self.retry_policy.get_delay(attempt)
+            else:
+                if not self.retry_policy.should_retry(
+                        method, attempt, response.status_code):
+                    break
+                delay = self.retry_policy.get_delay(attempt, response.headers)
+            remaining = get_remaining_time()
+            if remaining is not None and delay >= remaining:
+                raise DeadlineExceeded(f"Deadline exceeded while retrying "
+                                       f"{method} {path}")
+            await asyncio.sleep(delay)
+        if response.status_code >= 400:
+            try:
+                response.raise_for_status()
+            except httpx.HTTPStatusError as exc:
+                if 400 <= exc.response.status_code < 500:
+                    raise Exception(f'{exc}\nResponse text: {response.text}')
+                raise
+        return response
+
+    async def get_data(self, path: str,
+                       params: typing.Dict[str, Any] | None = None) -> Any:
+        r = await self._send("GET", path, params=params)
+        try:
+            return json.loads(r.text)
+        except Exception as e:
+            raise Exception("JSON could not be parsed: " + str(e) +
+                            "\nJSON was\n" + r.text)
+
+    async def post_data(self, path: str, data) -> httpx.Response:
+        return await self._send("POST", path, content=json.dumps(data))
+
+    async def put_data(self, path: str, data) -> httpx.Response:
+        return await self._send("PUT", path, content=json.dumps(data))
+
+
+_default_client: Optional[AsyncClient] = None
+_current_client: contextvars.ContextVar[Optional[AsyncClient]] = \
+    contextvars.ContextVar("sampledbapi_async_client", default=None)
+
+
+def get_client() -> AsyncClient:
+    """Get the async client used by the module-level coroutines.
+
+    Returns:
+        AsyncClient: The client activated via :meth:`AsyncClient.activate`
+        in the current task, or the default client.
+    """
+    global _default_client
+    client = _current_client.get()
+    if client is not None:
+        return client
+    if _default_client is None:
+        _default_client = AsyncClient()
+    return _default_client
+
+
+async def configure(max_concurrency: int = 10, max_connections: int = 10,
+                    max_keepalive_connections: int = 10,
+                    keepalive_expiry: float = 5.0, transport: Any = None):
+    """Replace the default async client by one with the given limits.
+
+    See :class:`AsyncClient` for the arguments. The credentials of the
+    previous default client are kept.
+    """
+    global _default_client
+    old = _default_client
+    _default_client = AsyncClient(
+        max_concurrency=max_concurrency, max_connections=max_connections,
+        max_keepalive_connections=max_keepalive_connections,
+        keepalive_expiry=keepalive_expiry, transport=transport)
+    if old is not None:
+        _default_client.address, _default_client.api_key = \
+            old.address, old.api_key
+        await old.aclose()
+
+
+async def authenticate(address: str, api_key: str):
+    """Authenticate the current async client with a SampleDB instance."""
+    await get_client().authenticate(address, api_key)
+
+
+async def get_data(path: str,
+                   params: typing.Dict[str, Any] | None = None) -> Any:
+    return await get_client().get_data(path, params)
+
+
+async def post_data(path: str, data) -> httpx.Response:
+    return await get_client().post_data(path, data)
+
+
+async def put_data(path: str, data) -> httpx.Response:
+    return await get_client().put_data(path, data)
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Dict, List
+
+from ..instruments import Instrument, InstrumentLogEntry
+from . import users
+from .comm import get_data
+
+__all__ = ["get_list", "get", "get_log_entry_list"]
+
+
+async def _instrument(d: Dict) -> Instrument:
+    # Instrument scientists are fetched concurrently instead of blocking in
+    # the constructor.
+    scientist_ids = d.pop("instrument_scientists", None)
+    instrument = Instrument(d)
+    if scientist_ids is not None:
+        instrument.instrument_scientists = list(await asyncio.gather(
+            *(users.get(i) for i in scientist_ids)))
+    return instrument
+
+
+async def _log_entry(instrument_id: int, d: Dict) -> InstrumentLogEntry:
+    author = d.pop("author", None)
+    entry = InstrumentLogEntry(instrument_id, d)
+    if author is not None:
+        entry.author = await users.get(author)
+    return entry
+
+
+async def get_list() -> List[Instrument]:
+    """Get a list of all instruments.
+
+    Returns:
+        List: List of :class:`~sampledbapi.instruments.Instrument` objects.
+    """
+    return list(await asyncio.gather(
+        *(_instrument(i) for i in await get_data("instruments"))))
+
+
+async def get(instrument_id: int) -> Instrument:
+    """Get the specific instrument (instrument_id).
+
+    Args:
+        instrument_id (int): ID of the specific instrument.
+
+    Returns:
+        Instrument: The requested :class:`~sampledbapi.instruments.Instrument`.
+    """
+    if isinstance(instrument_id, int):
+        return await _instrument(await get_data(f"instruments/{instrument_id}"))
+    else:
+        raise TypeError()
+
+
+async def get_log_entry_list(instrument: Instrument) -> List[InstrumentLogEntry]:
+    """Get a list of all log entries of an instrument.
+
+    Returns:
+        List: List of :class:`~sampledbapi.instruments.InstrumentLogEntry`.
+    """
+    if instrument.instrument_id is not None:
+        instrument_id = instrument.instrument_id
+        return list(await asyncio.gather(
+            *(_log_entry(instrument_id, log) for log in await get_data(
+                f"instruments/{instrument_id}/log_entries"))))
+    else:
+        raise Exception('instrument_id can not be None')
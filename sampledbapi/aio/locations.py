@@ -0,0 +1,39 @@
+from typing import List
+
+from ..locations import Location
+from .comm import get_client, get_data
+
+__all__ = ["get_list", "get"]
+
+
+async def get_list() -> List[Location]:
+    """Get a list of all locations.
+
+    Returns:
+        List: List of :class:`~sampledbapi.locations.Location` objects.
+    """
+    entities = [Location(d) for d in await get_data("locations")]
+    identity_map = get_client().identity_map
+    for entity in entities:
+        identity_map.put(("locations", entity.location_id), entity)
+    return entities
+
+
+async def _fetch(location_id: int) -> Location:
+    return Location(await get_data(f"locations/{location_id}"))
+
+
+async def get(location_id: int) -> Location:
+    """Get the specific location (location_id).
+
+    Args:
+        location_id (int): ID of the location to be retrieved.
+
+    Returns:
+        Location: The requested :class:`~sampledbapi.locations.Location`.
+    """
+    if isinstance(location_id, int):
+        return await get_client().get_or_fetch(
+            ("locations", location_id), lambda: _fetch(location_id))
+    else:
+        raise TypeError()
@@ -0,0 +1,30 @@
+from typing import List
+
+from ..locationtypes import LocationType
+from .comm import get_data
+
+__all__ = ["get_list", "get"]
+
+
+async def get_list() -> List[LocationType]:
+    """Get a list of all location types.
+
+    Returns:
+        List: List of :class:`~sampledbapi.locationtypes.LocationType` objects.
+    """
+    return [LocationType(d) for d in await get_data("location_types")]
+
+
+async def get(location_type_id: int) -> LocationType:
+    """Get the specific location type (location_type_id).
+
+    Args:
+        location_type_id (int): ID of the location type to be retrieved.
+
+    Returns:
+        LocationType: The requested :class:`~sampledbapi.locationtypes.LocationType`.
+    """
+    if isinstance(location_type_id, int):
+        return LocationType(await get_data(f"location_types/{location_type_id}"))
+    else:
+        raise TypeError()
@@ -0,0 +1,23 @@
+import typing
+
+from ..object_log import ObjectLogEntry
+from .comm import get_data
+
+__all__ = ["get_object_log_entries"]
+
+
+async def get_object_log_entries(after_id: typing.Optional[int] = None) -> typing.List[ObjectLogEntry]:
+    """Query the contents of the object log.
+
+    Args:
+        after_id (int): only log entries created after the entry with the id after_id are returned
+
+    Returns:
+        List: List of :class:`~sampledbapi.object_log.ObjectLogEntry`.
+    """
+    if after_id is None:
+        return [ObjectLogEntry(entry) for entry in await get_data('object_log_entries/')]
+    if isinstance(after_id, int):
+        return [ObjectLogEntry(entry) for entry in await get_data('object_log_entries/', params={'after_id': after_id})]
+    else:
+        raise TypeError()
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+from typing import Any, Dict, List, Optional, Tuple
+
+from .. import objects
+from ..objects import Comment, File, LocationOccurence, Object
+from . import locations, users
+from .comm import get_data, post_data
+
+__all__ = ["get_list", "get", "create", "get_version", "update",
+           "get_related_objects", "get_location_occurences",
+           "get_file_list", "get_comment_list"]
+
+
+async def _object(d: Dict) -> Object:
+    # The referenced user is fetched asynchronously instead of blocking in
+    # the constructor.
+    user_id = d.pop("user_id", None)
+    obj = Object(d)
+    if user_id is not None:
+        obj.version_editor = await users.get(user_id)
+    return obj
+
+
+async def _objects(ds: List[Dict]) -> List[Object]:
+    # Decoding the data of many objects takes a while, so it runs in the
+    # default executor instead of blocking the event loop
+    user_ids = [d.pop("user_id", None) for d in ds]
+    context = contextvars.copy_context()
+    objs = await asyncio.get_running_loop().run_in_executor(
+        None, context.run, lambda: [Object(d) for d in ds])
+
+    async def editor(user_id: Optional[int]) -> Optional[users.User]:
+        return None if user_id is None else await users.get(user_id)
+    editors = await asyncio.gather(*(editor(i) for i in user_ids))
+    for obj, user in zip(objs, editors):
+        if user is not None:
+            obj.version_editor = user
+    return objs
+
+
+async def _location_occurence(d: Dict) -> LocationOccurence:
+    refs = {key: d.pop(key) for key in ("location", "responsible_user", "user")
+            if key in d}
+    occurence = LocationOccurence(d)
+    if "location" in refs:
+        occurence.location = await locations.get(refs["location"])
+    if "responsible_user" in refs:
+        occurence.responsible_user = await users.get(refs["responsible_user"])
+    if "user" in refs:
+        occurence.user = await users.get(refs["user"])
+    return occurence
+
+
+async def get_list(q: str = "", action_id: int = -1, action_type: str = "",
+                   limit: int = -1, offset: int = -1,
+                   name_only: bool = False) -> List[Object]:
+    """Get a list of all objects visible to the current user.
+
+    See :func:`sampledbapi.objects.get_list`. The object data is decoded
+    in the default executor, so long lists do not block the event loop;
+    with lazy data (see :func:`~sampledbapi.comm.configure_data`) only the
+    properties that are read are decoded.
+
+    Returns:
+        List: List of :class:`~sampledbapi.objects.Object`.
+    """
+    if (isinstance(q, str) and isinstance(action_id, int) and
+            isinstance(action_type, str) and isinstance(limit, int) and
+            isinstance(offset, int) and isinstance(name_only, bool)):
+        pars: Dict[str, Any] = {}
+        if q != "":
+            pars["q"] = q
+        if action_id > 0:
+            pars["action_id"] = action_id
+        if action_type != "":
+            pars["action_type"] = action_type
+        if limit > 0:
+            pars["limit"] = limit
+        if offset > 0:
+            pars["offset"] = offset
+        if name_only:
+            pars["name_only"] = "true"
+
+        return await _objects(await get_data("objects", pars))
+    else:
+        raise TypeError()
+
+
+async def get(object_id: int) -> Object:
+    """Get the current version of an object (object_id).
+
+    Args:
+        object_id (int): ID of the object.
+
+    Returns:
+        Object: Requested :class:`~sampledbapi.objects.Object`.
+    """
+    if isinstance(object_id, int):
+        return await _object(await get_data(f"objects/{object_id}"))
+    else:
+        raise TypeError()
+
+
+async def create(action_id: int, data: dict) -> int:
+    """Create a new object.
+
+    See :func:`sampledbapi.objects.create`.
+
+    Returns:
+        int: ID of the new object.
+    """
+    if isinstance(action_id, int) and isinstance(data, dict):
+        response = await post_data(
+            "objects/", {"action_id": action_id, "data": data})
+        return int(response.headers['Location'].rsplit("/objects/", 1)[1].split("/versions/", 1)[0])
+    else:
+        raise TypeError()
+
+
+async def get_version(obj: Object, version_id: int) -> Object:
+    """Get the specific version (version_id) of an object.
+
+    Args:
+        obj (Object): The object.
+        version_id (int): ID of the version to be retrieved.
+
+    Returns:
+        Object: Requested :class:`~sampledbapi.objects.Object`.
+    """
+    if isinstance(version_id, int):
+        return await _object(await get_data(
+            f"objects/{obj.object_id}/versions/{version_id}"))
+    else:
+        raise TypeError()
+
+
+async def update(obj: Object, data: dict, schema: Optional[dict] = None):
+    """Create a new version of an object.
+
+    See :meth:`sampledbapi.objects.Object.update`.
+    """
+    if isinstance(data, dict):
+        data_to_post = {"data": data}
+        if isinstance(schema, dict):
+            data_to_post['schema'] = schema
+        return await post_data(f"objects/{obj.object_id}/versions/",
+                               data_to_post)
+    else:
+        raise TypeError()
+
+
+async def get_related_objects(obj: Object) -> Tuple[List[Object], List[Object]]:
+    """Gets objects related to an object.
+
+    All related objects are fetched concurrently.
+
+    Returns:
+        Two lists containing referenced objects and referencing objects.
+    """
+    related_objects = await get_data(
+        f"objects/{obj.object_id}/related_objects")
+    referenced, referencing = await asyncio.gather(
+        asyncio.gather(*(get(o['object_id'])
+                         for o in related_objects['referenced_objects'])),
+        asyncio.gather(*(get(o['object_id'])
+                         for o in related_objects['referencing_objects'])))
+    return list(referenced), list(referencing)
+
+
+async def get_location_occurences(obj: Object) -> List[LocationOccurence]:
+    """Get a list of all object locations assignments for an object.
+
+    Returns:
+        List: List of :class:`~sampledbapi.objects.LocationOccurence`.
+    """
+    return list(await asyncio.gather(
+        *(_location_occurence(d)
+          for d in await get_data(f"objects/{obj.object_id}/locations"))))
+
+
+async def get_file_list(obj: Object) -> List[File]:
+    """Get a list of all files of an object.
+
+    Returns:
+        List: List of :class:`~sampledbapi.objects.File`.
+    """
+    return [File(d) for d in await get_data(f"objects/{obj.object_id}/files")]
+
+
+async def get_comment_list(obj: Object) -> List[Comment]:
+    """Get a list of all comments of an object.
+
+    Returns:
+        List: List of :class:`~sampledbapi.objects.Comment`.
+    """
+    return [Comment(c)
+            for c in await get_data(f"objects/{obj.object_id}/comments")]
@@ -0,0 +1,48 @@
+from typing import List
+
+from ..users import User
+from .comm import get_client, get_data
+
+__all__ = ["get_list", "get", "get_current"]
+
+
+async def get_list() -> List[User]:
+    """Get a list of all users.
+
+    Returns:
+        List: List of :class:`~sampledbapi.users.User` objects.
+    """
+    entities = [User(d) for d in await get_data("users")]
+    identity_map = get_client().identity_map
+    for entity in entities:
+        identity_map.put(("users", entity.user_id), entity)
+    return entities
+
+
+async def _fetch(user_id: int) -> User:
+    return User(await get_data(f"users/{user_id}"))
+
+
+async def get(user_id: int) -> User:
+    """Get the specific user (user_id).
+
+    Args:
+        user_id (int): ID of the user to be retrieved.
+
+    Returns:
+        User: Requested :class:`~sampledbapi.users.User`.
+    """
+    if isinstance(user_id, int):
+        return await get_client().get_or_fetch(
+            ("users", user_id), lambda: _fetch(user_id))
+    else:
+        raise TypeError()
+
+
+async def get_current() -> User:
+    """Get the current user.
+
+    Returns:
+        User: Current :class:`~sampledbapi.users.User`.
+    """
+    return User(await get_data("users/me"))
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Set, Tuple
+
+from . import retry
+
+__all__ = ["BulkResult", "Progress", "run", "get_many"]
+
+
+class BulkResult:
+    """Results of a bulk operation in input order.
+
+    Failed items do not abort the operation. Their result is None and the
+    exception is stored in `errors` under the key of the item (its ID or its
+    index in the input). Items that did not need any work (e.g. files that
+    were already uploaded) are listed in `skipped` by the same keys.
+    """
+
+    def __init__(self, results: List[Any], errors: Dict[Hashable, Exception],
+                 skipped: Optional[List[Hashable]] = None):
+        self.results = results
+        self.errors = errors
+        self.skipped = [] if skipped is None else skipped
+
+    def __repr__(self) -> str:
+        return f"BulkResult ({len(self.results)} results, " \
+            + f"{len(self.errors)} errors, {len(self.skipped)} skipped)"
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.results)
+
+    def __getitem__(self, index: int) -> Any:
+        return self.results[index]
+
+    @property
+    def ok(self) -> bool:
+        """Whether all items succeeded."""
+        return len(self.errors) == 0
+
+    def raise_for_errors(self):
+        """Raise the first error, if any item failed."""
+        for error in self.errors.values():
+            raise error
+
+
+class Progress:
+    """Progress of a bulk operation, passed to progress callbacks.
+
+    Attributes:
+        total: Number of items if known in advance, else None.
+        done: Number of finished items (including failed ones).
+        failed: Number of failed items.
+        bytes: Number of bytes processed by successful items.
+        skipped: Number of successful items that were skipped (e.g. files
+            that were already uploaded).
+        skipped_bytes: Number of bytes of the skipped items, not counted in
+            `bytes`.
+    """
+
+    def __init__(self, total: Optional[int] = None):
+        self.total = total
+        self.done = 0
+        self.failed = 0
+        self.bytes = 0
+        self.skipped = 0
+        self.skipped_bytes = 0
+        self.started = time.monotonic()
+
+    def __repr__(self) -> str:
+        total = "?" if self.total is None else self.total
+        return f"Progress ({self.done}/{total} items, {self.failed} " \
+            + f"failed, {self.throughput / 1e6:.1f} MB/s)"
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the operation started."""
+        return time.monotonic() - self.started
+
+    @property
+    def rate(self) -> float:
+        """Finished items per second."""
+        return self.done / max(self.elapsed, 1e-9)
+
+    @property
+    def throughput(self) -> float:
+        """Processed bytes per second."""
+        return self.bytes / max(self.elapsed, 1e-9)
+
+
+def run(func: Callable[[Any], Any], items: Iterable[Any],
+        max_workers: int = 8, window: Optional[int] = None,
+        key: Optional[Callable[[int, Any], Hashable]] = None,
+        deadline: Optional[float] = None,
+        progress: Optional[Callable[[Progress], None]] = None,
+        size: Optional[Callable[[Any], int]] = None,
+        skip: Optional[Callable[[Any], bool]] = None) -> BulkResult:
+    """Apply `func` to all items concurrently.
+
+    Items are consumed lazily, at most `window` of them are in flight at the
+    same time. All workers use the client that is active in the calling
+    thread and share its connection pool, so `max_workers` should not
+    exceed the pool size (see :func:`sampledbapi.comm.configure_session`).
+
+    Args:
+        func: Function called with each item.
+        items: Iterable of items, consumed lazily.
+        max_workers (int): Number of worker threads.
+        window (int): Maximum number of items in flight, defaults to twice
+            the number of workers.
+        key: Function mapping (index, item) to the key under which errors
+            are reported, defaults to the index.
+        deadline (float): Seconds after which outstanding requests fail with
+            :class:`~sampledbapi.retry.DeadlineExceeded`.
+        progress: Called in the calling thread with a :class:`Progress`
+            after each finished item.
+        size: Function returning the number of bytes of an item, counted
+            in :attr:`Progress.bytes` once the item succeeded.
+        skip: Function telling from the result of an item whether it was
+            skipped; skipped items count in :attr:`Progress.skipped` and
+            :attr:`Progress.skipped_bytes` instead of :attr:`Progress.bytes`.
+
+    Returns:
+        BulkResult: Results in input order and errors of failed items.
+    """
+    if not isinstance(max_workers, int) or max_workers < 1:
+        raise ValueError("max_workers has to be a positive integer.")
+    if window is None:
+        window = 2 * max_workers
+    results: List[Any] = []
+    errors: Dict[Hashable, Exception] = {}
+    pending: Dict[Future, Tuple[int, Any]] = {}
+    total = len(items) if isinstance(items, (list, tuple)) else None
+    state = Progress(total)
+
+    def collect(done: Set[Future]):
+        for future in done:
+            index, item = pending.pop(future)
+            try:
+                results[index] = future.result()
+                if skip is not None and skip(results[index]):
+                    state.skipped += 1
+                    if size is not None:
+                        state.skipped_bytes += size(item)
+                elif size is not None:
+                    state.bytes += size(item)
+            except Exception as e:
+                errors[index if key is None else key(index, item)] = e
+                state.failed += 1
+            state.done += 1
+            if progress is not None:
+                progress(state)
+
+    with contextlib.ExitStack() as stack:
+        if deadline is not None:
+            stack.enter_context(retry.deadline(deadline))
+        executor = stack.enter_context(
+            ThreadPoolExecutor(max_workers=max_workers))
+        for index, item in enumerate(items):
+            if len(pending) >= window:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+            results.append(None)
+            # Each worker runs in a copy of the caller's context, so it uses
+            # the same client.
+            future = executor.submit(contextvars.copy_context().run, func,
+                                     item)
+            pending[future] = (index, item)
+        while pending:
+            collect(wait(pending, return_when=FIRST_COMPLETED)[0])
+    return BulkResult(results, errors)
+
+
+def get_many(get: Callable[[int], Any], ids: Iterable[int],
+             max_workers: int = 8,
+             deadline: Optional[float] = None) -> BulkResult:
+    """Fetch entities by ID concurrently.
+
+    Repeated IDs are only fetched once, the results are returned in input
+    order and errors are reported per ID.
+
+    Args:
+        get: Function fetching a single entity, e.g.
+            :func:`sampledbapi.objects.get`.
+        ids: IDs of the entities.
+        max_workers (int): Number of parallel requests.
+        deadline (float): Seconds after which outstanding requests fail.
+
+    Returns:
+        BulkResult: Entities in input order and errors by ID.
+    """
+    ids = list(ids)
+    if not all(isinstance(i, int) for i in ids):
+        raise TypeError()
+    unique = list(dict.fromkeys(ids))
+    fetched = run(get, unique, max_workers,
+                  key=lambda index, item: item, deadline=deadline)
+    by_id = dict(zip(unique, fetched.results))
+    return BulkResult([by_id[i] for i in ids], fetched.errors)
@@ -0,0 +1,473 @@
+from __future__ import annotations
+
+import contextlib
+import copy
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Mapping, Optional, Tuple
+
+__all__ = ["IdentityMap", "ResponseCache", "VersionCache", "HashIndex"]
+
+_Key = Tuple[str, Tuple[Tuple[str, Any], ...]]
+
+
+class IdentityMap:
+    """In-process cache of reference entities (users, locations, ...).
+
+    Entities are stored under keys like ``("users", 1)``, so repeated lookups
+    of the same entity return the same instance without a request. Entries
+    expire after `ttl` seconds and the least recently used entries are
+    evicted once more than `maxsize` entries are stored. The map is
+    thread-safe.
+
+    Arguments:
+        ttl: Seconds after which an entry expires, None to never expire.
+        maxsize: Maximum number of cached entities.
+        enabled: Whether entities are cached at all.
+    """
+
+    def __init__(self, ttl: Optional[float] = 300.0, maxsize: int = 1024,
+                 enabled: bool = True):
+        self._entries: OrderedDict[Hashable, Tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.configure(ttl, maxsize, enabled)
+
+    def __repr__(self) -> str:
+        return f"IdentityMap ({len(self)} entries, {self.hits} hits, " \
+            + f"{self.misses} misses)"
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def configure(self, ttl: Optional[float] = 300.0, maxsize: int = 1024,
+                  enabled: bool = True):
+        """Change the cache settings, see :class:`IdentityMap`."""
+        if ((ttl is None or isinstance(ttl, (int, float))) and
+                isinstance(maxsize, int) and isinstance(enabled, bool)):
+            if maxsize < 1:
+                raise ValueError("maxsize has to be positive.")
+            with self._lock:
+                self.ttl = ttl
+                self.maxsize = maxsize
+                self.enabled = enabled
+                self.hits = 0
+                self.misses = 0
+                self.evictions = 0
+                self._entries.clear()
+        else:
+            raise TypeError()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get a cached entity, None if it is not cached or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (self.ttl is None or
+                                      time.monotonic() < entry[0]):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, value: Any):
+        """Store an entity."""
+        if not self.enabled:
+            return
+        expires = time.monotonic() + self.ttl if self.ttl is not None else 0.0
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_fetch(self, key: Hashable, fetch: Callable[[], Any]) -> Any:
+        """Get a cached entity or fetch and store it.
+
+        Arguments:
+            key: Key of the entity, e.g. ``("users", 1)``.
+            fetch: Callable retrieving the entity on a cache miss.
+        """
+        if not self.enabled:
+            return fetch()
+        value = self.get(key)
+        if value is None:
+            value = fetch()
+            self.put(key, value)
+        return value
+
+    def invalidate(self, kind: Optional[str] = None,
+                   entity_id: Optional[Hashable] = None):
+        """Remove entities from the cache.
+
+        Arguments:
+            kind: Kind of entities to remove (e.g. "users"), None for all.
+            entity_id: ID of a single entity of that kind to remove.
+        """
+        with self._lock:
+            if kind is None:
+                self._entries.clear()
+            elif entity_id is not None:
+                self._entries.pop((kind, entity_id), None)
+            else:
+                for key in [k for k in self._entries
+                            if isinstance(k, tuple) and k[0] == kind]:
+                    del self._entries[key]
+
+    def stats(self) -> Dict[str, int]:
+        """Get the hit, miss and eviction counters and the current size."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses,
+                    "evictions": self.evictions, "size": len(self._entries)}
+
+
+class _CachedResponse:
+
+    __slots__ = ("payload", "etag", "last_modified", "expires")
+
+    def __init__(self, payload: Any, etag: Optional[str],
+                 last_modified: Optional[str], expires: float):
+        self.payload = payload
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires = expires
+
+
+class ResponseCache:
+    """Cache of decoded GET responses, revalidated with conditional requests.
+
+    Responses of the configured endpoints are stored together with their
+    `ETag` and `Last-Modified` validators. Later requests send
+    `If-None-Match` / `If-Modified-Since`, and if the server answers with
+    `304 Not Modified` the cached payload is returned without downloading
+    and decoding it again. Responses without validators are served from the
+    cache for `fallback_ttl` seconds. Writes to an endpoint invalidate its
+    cached responses. The cache is thread-safe.
+
+    Arguments:
+        paths: First path segments of the cached endpoints.
+        fallback_ttl: Seconds a response without validators is reused
+            without asking the server, 0 to not cache such responses.
+        maxsize: Maximum number of cached responses, the least recently
+            used ones are evicted first.
+        enabled: Whether responses are cached at all.
+    """
+
+    def __init__(self, paths: Iterable[str] = ("actions", "action_types",
+                                               "locations", "location_types",
+                                               "users", "instruments"),
+                 fallback_ttl: float = 0.0, maxsize: int = 256,
+                 enabled: bool = True):
+        self._entries: OrderedDict[_Key, _CachedResponse] = OrderedDict()
+        self._lock = threading.Lock()
+        self.configure(paths, fallback_ttl, maxsize, enabled)
+
+    def __repr__(self) -> str:
+        return f"ResponseCache ({len(self)} responses, {self.hits} hits, " \
+            + f"{self.misses} misses)"
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def configure(self, paths: Iterable[str] = ("actions", "action_types",
+                                                "locations", "location_types",
+                                                "users", "instruments"),
+                  fallback_ttl: float = 0.0, maxsize: int = 256,
+                  enabled: bool = True):
+        """Change the cache settings, see :class:`ResponseCache`."""
+        if (isinstance(fallback_ttl, (int, float)) and
+                isinstance(maxsize, int) and isinstance(enabled, bool)):
+            if maxsize < 1:
+                raise ValueError("maxsize has to be positive.")
+            with self._lock:
+                self.paths = frozenset(paths)
+                self.fallback_ttl = fallback_ttl
+                self.maxsize = maxsize
+                self.enabled = enabled
+                self.hits = 0
+                self.revalidations = 0
+                self.misses = 0
+                self._entries.clear()
+        else:
+            raise TypeError()
+
+    def key(self, path: str,
+            params: Optional[Dict[str, Any]] = None) -> Optional[_Key]:
+        """Get the cache key of a request, None if it is not cached."""
+        if not self.enabled or path.split("/", 1)[0] not in self.paths:
+            return None
+        return (path, tuple(sorted((params or {}).items())))
+
+    def lookup(self, key: _Key) -> Tuple[Optional[Any], Dict[str, str]]:
+        """Look up a request.
+
+        Returns:
+            The payload if it can be used without asking the server (or
+            None), and the conditional headers for revalidating it.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None, {}
+            self._entries.move_to_end(key)
+            if entry.etag is None and entry.last_modified is None:
+                if time.monotonic() < entry.expires:
+                    self.hits += 1
+                    return copy.deepcopy(entry.payload), {}
+                del self._entries[key]
+                self.misses += 1
+                return None, {}
+            headers = {}
+            if entry.etag is not None:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified is not None:
+                headers["If-Modified-Since"] = entry.last_modified
+            return None, headers
+
+    def not_modified(self, key: _Key) -> Optional[Any]:
+        """Get the cached payload after the server answered with 304, None
+        if it has been evicted since."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self.revalidations += 1
+            return copy.deepcopy(entry.payload)
+
+    def store(self, key: _Key, headers: Mapping[str, str], payload: Any):
+        """Store a decoded response with the validators from its headers."""
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if etag is None and last_modified is None and self.fallback_ttl <= 0:
+            return
+        entry = _CachedResponse(copy.deepcopy(payload), etag, last_modified,
+                                time.monotonic() + self.fallback_ttl)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, path: Optional[str] = None):
+        """Remove cached responses.
+
+        Arguments:
+            path: Remove only responses of the endpoint this path belongs
+                to (e.g. "locations/1" removes all location responses).
+        """
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                prefix = path.split("/", 1)[0]
+                for key in [k for k in self._entries
+                            if k[0].split("/", 1)[0] == prefix]:
+                    del self._entries[key]
+
+    def stats(self) -> Dict[str, int]:
+        """Get the hit, revalidation and miss counters and the size."""
+        with self._lock:
+            return {"hits": self.hits, "revalidations": self.revalidations,
+                    "misses": self.misses, "size": len(self._entries)}
+
+
+class VersionCache:
+    """On-disk cache of object versions.
+
+    Object versions never change once they have been written, so they can
+    be kept on disk and reused by later runs without any request. Each
+    version is stored as gzip-compressed JSON under
+    ``<directory>/<server>/<object_id>/<version_id>.json.gz``. Files are
+    written to a temporary file and atomically renamed, so several processes
+    can share one directory. Once the cache grows beyond `max_bytes`, the
+    least recently used versions are removed.
+
+    The cache does not check permissions, so only share a directory between
+    users who may read the same objects.
+
+    Arguments:
+        directory: Directory of the cache, created if necessary.
+        max_bytes: Maximum total size of the cached files.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 512 * 1024 * 1024):
+        if not isinstance(directory, str) or not isinstance(max_bytes, int):
+            raise TypeError()
+        if max_bytes < 1:
+            raise ValueError("max_bytes has to be positive.")
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._size: Optional[int] = None
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def __repr__(self) -> str:
+        return f"VersionCache ({self.directory})"
+
+    def _path(self, address: str, object_id: int, version_id: int) -> str:
+        server = hashlib.sha256(address.encode()).hexdigest()[:16]
+        return os.path.join(self.directory, server, str(object_id),
+                            f"{version_id}.json.gz")
+
+    def get(self, address: str, object_id: int,
+            version_id: int) -> Optional[Dict]:
+        """Get a cached version, None if it is not cached.
+
+        Arguments:
+            address: URL of the SampleDB server.
+            object_id: ID of the object.
+            version_id: ID of the version.
+        """
+        path = self._path(address, object_id, version_id)
+        try:
+            with open(path, "rb") as f:
+                data = json.loads(gzip.decompress(f.read()))
+            # The modification time marks the last use for the eviction
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, ValueError):
+            # Corrupt file, e.g. from a full disk
+            with contextlib.suppress(OSError):
+                os.remove(path)
+            return None
+        return data
+
+    def put(self, address: str, object_id: int, version_id: int, data: Dict):
+        """Store a version.
+
+        Arguments:
+            address: URL of the SampleDB server.
+            object_id: ID of the object.
+            version_id: ID of the version.
+            data: JSON data of the version as returned by the API.
+        """
+        path = self._path(address, object_id, version_id)
+        content = gzip.compress(
+            json.dumps(data, separators=(",", ":")).encode())
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(content)
+            os.replace(tmp, path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.remove(tmp)
+            raise
+        with self._lock:
+            if self._size is not None:
+                self._size += len(content)
+            if self._size is None or self._size > self.max_bytes:
+                self._evict()
+
+    def _files(self) -> List[Tuple[float, int, str]]:
+        files = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if name.endswith(".tmp"):
+                    # Being written by another process
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+        return files
+
+    def _evict(self):
+        # Other processes may have added or removed files, so the size is
+        # recomputed from the directory before evicting.
+        files = self._files()
+        size = sum(f[1] for f in files)
+        if size > self.max_bytes:
+            # Evict down to 90 % so not every following put has to scan
+            target = self.max_bytes * 9 // 10
+            for _, file_size, path in sorted(files):
+                if size <= target:
+                    break
+                with contextlib.suppress(OSError):
+                    os.remove(path)
+                size -= file_size
+        self._size = size
+
+    def size(self) -> int:
+        """Total size of the cached files in bytes."""
+        return sum(f[1] for f in self._files())
+
+    def clear(self):
+        """Remove all cached versions."""
+        with self._lock:
+            for _, _, path in self._files():
+                with contextlib.suppress(OSError):
+                    os.remove(path)
+            self._size = 0
+
+
+class HashIndex:
+    """Persistent index of uploaded file contents.
+
+    Maps the sha256 hash of a file uploaded to an object to the ID of the
+    created file, so re-runs can skip uploading identical content without
+    asking the server. The index is stored in an SQLite database that can
+    be shared by several processes.
+
+    Arguments:
+        path: Path of the SQLite database, created if necessary.
+    """
+
+    def __init__(self, path: str):
+        if not isinstance(path, str):
+            raise TypeError()
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._db.execute("CREATE TABLE IF NOT EXISTS files "
+                             "(address TEXT, object_id INTEGER, "
+                             "sha256 TEXT, file_id INTEGER, "
+                             "PRIMARY KEY (address, object_id, sha256))")
+
+    def __repr__(self) -> str:
+        return f"HashIndex ({self.path})"
+
+    def __enter__(self) -> HashIndex:
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Close the database."""
+        with self._lock:
+            self._db.close()
+
+    def get(self, address: str, object_id: int,
+            hexdigest: str) -> Optional[int]:
+        """Get the ID of a file with this content, None if unknown."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT file_id FROM files WHERE address = ? AND "
+                "object_id = ? AND sha256 = ?",
+                (address, object_id, hexdigest)).fetchone()
+        return None if row is None else row[0]
+
+    def put(self, address: str, object_id: int, hexdigest: str,
+            file_id: int):
+        """Record an uploaded file."""
+        with self._lock, self._db:
+            self._db.execute("INSERT OR REPLACE INTO files VALUES "
+                             "(?, ?, ?, ?)",
+                             (address, object_id, hexdigest, file_id))
@@ -1,105 +1,772 @@
 from __future__ import annotations
 
+import contextlib
+import contextvars
 import json
+import threading
+import time
 import typing
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Generator, Iterator, Optional
 
 import requests
 from requests import HTTPError
+from requests.adapters import HTTPAdapter
 
-_address = None
-_api_key = None
+from .cache import IdentityMap, ResponseCache, VersionCache
+from .retry import DeadlineExceeded, RateLimiter, RetryPolicy, get_remaining_time
+from .streaming import iter_json_array
+
+if typing.TYPE_CHECKING:
+    from .mirror import Mirror
 
 
 class SampleDBObject:
 
+    # Names of the attributes initialized from the dictionary, computed once
+    # per class
+    _fields: typing.Tuple[str, ...] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._fields = tuple(
+            key for key in dir(cls) if not key.startswith("_") and
+            (isinstance(getattr(cls, key), Reference) or
+             not callable(getattr(cls, key))))
+
     def __init__(self, d: Dict):
         """Initialize class attributes from dictionary."""
-        for key in dir(self):
-            if not key.startswith("__") and key in d:
+        for key in self._fields:
+            if key in d:
                 setattr(self, key, d[key])
 
+    def get_reference_id(self, name: str) -> Any:
+        """Get the ID(s) of a referenced entity without resolving it.
 
-def authenticate(address: str, api_key: str):
-    """Authenticate with a SampleDB instance
+        Args:
+            name (str): Name of the :class:`Reference` attribute, e.g.
+                "version_editor".
 
-    To retrieve data from SampleDB and upload data to it, you have to
-    authenticate first.
+        Returns:
+            The ID (or list of IDs) of the referenced entity, or None.
+        """
+        reference = getattr(type(self), name, None)
+        if isinstance(reference, Reference):
+            return reference.get_id(self)
+        else:
+            raise AttributeError(f"{name} is not a reference")
+
+
+class Reference:
+    """Model attribute referencing other SampleDB entities by ID.
+
+    Assigning an ID (or a list of IDs if `many` is set) stores the raw ID.
+    With eager references (the default) the entity is resolved immediately
+    using `resolve`, with lazy references (see
+    :meth:`Client.configure_references`) it is resolved on first access,
+    using the client that was active when the model was created.
+
+    Arguments:
+        resolve: Function retrieving an entity by its ID, e.g.
+            :func:`sampledbapi.users.get`.
+        id_attribute: Attribute holding the ID on a resolved entity.
+        many: Whether the attribute holds a list of entities.
+    """
+
+    def __init__(self, resolve: Callable[[Any], Any], id_attribute: str,
+                 many: bool = False):
+        self._resolve = resolve
+        self._id_attribute = id_attribute
+        self._many = many
+        self._name = ""
+
+    def __set_name__(self, owner, name: str):
+        self._name = name
+        self._ref = "_" + name + "_ref"
+
+    def __get__(self, obj, objtype=None) -> Any:
+        if obj is None:
+            return self
+        d = obj.__dict__
+        if self._name not in d:
+            ref = d.get(self._ref)
+            if ref is None:
+                return None
+            ids, client = ref
+            with client.activate():
+                if self._many:
+                    d[self._name] = [self._resolve(i) for i in ids]
+                else:
+                    d[self._name] = self._resolve(ids)
+        return d[self._name]
+
+    def __set__(self, obj, value: Any):
+        d = obj.__dict__
+        d.pop(self._name, None)
+        d.pop(self._ref, None)
+        if value is None:
+            return
+        if self._is_id(value):
+            client = get_client()
+            d[self._ref] = (value, client)
+            if not client.lazy_references:
+                self.__get__(obj)
+        else:
+            d[self._name] = value
+
+    def _is_id(self, value: Any) -> bool:
+        if self._many:
+            return isinstance(value, list) and \
+                all(isinstance(i, int) for i in value)
+        return isinstance(value, int)
+
+    def get_id(self, obj) -> Any:
+        """Get the raw ID(s) stored on `obj` without resolving them."""
+        d = obj.__dict__
+        if self._ref in d:
+            return d[self._ref][0]
+        value = d.get(self._name)
+        if value is None:
+            return None
+        if self._many:
+            return [getattr(v, self._id_attribute) for v in value]
+        return getattr(value, self._id_attribute)
+
+
+class Client:
+    """Connection to a SampleDB instance.
+
+    A client owns the server address, the API token, the pooled HTTP session,
+    the caches and all settings, so several clients can talk to different servers or
+    with different identities in the same process. The module-level
+    functions (e.g. :func:`sampledbapi.objects.get`) use the client that is
+    active in the current thread or task, or the default client that
+    :func:`authenticate` configures.
+
+    .. code-block::
+
+        client = Client()
+        client.authenticate(server_address, api_key)
+        with client.activate():
+            print(objects.get_list())
 
     Arguments:
         address: URL of the SampleDB server.
         api_key: API token you can generate using "Preferences/API Tokens".
     """
 
-    global _address, _api_key
-    old_address, old_key = _address, _api_key
-    _address, _api_key = address, api_key
-    try:
-        get_data("users/me")
-    except requests.exceptions.HTTPError as e:
-        _address, _api_key = old_address, old_key
-        raise Exception("Authentication not successful: " + str(e))
+    def __init__(self, address: Optional[str] = None,
+                 api_key: Optional[str] = None):
+        self.address = address
+        self.api_key = api_key
+        self._session: Optional[requests.Session] = None
+        self._session_lock = threading.Lock()
+        self._session_settings: Dict[str, Any] = {
+            "pool_connections": 10,
+            "pool_maxsize": 10,
+            "pool_block": False,
+            "keep_alive": True
+        }
+        self.identity_map = IdentityMap()
+        self.response_cache = ResponseCache()
+        self.version_cache: Optional[VersionCache] = None
+        self.mirror: Optional[Mirror] = None
+        self.schema_converters: Dict[int, Callable[[Any], Any]] = {}
+        self.lazy_references = False
+        self.lazy_data = False
+        self.retry_policy = RetryPolicy()
+        self.rate_limiter: Optional[RateLimiter] = None
+        self.timeout: typing.Tuple[float, float] = (10.0, 300.0)
 
+    def __repr__(self) -> str:
+        return f"Client ({self.address})"
 
-def __headers() -> Dict:
-    if _api_key is not None:
-        return {"Authorization": "Bearer " + _api_key}
-    else:
-        raise Exception("You need to provide an API key.")
+    def __enter__(self) -> Client:
+        return self
 
+    def __exit__(self, *exc_info):
+        self.close()
 
-def get_data(path: str, params: typing.Dict[str, Any] | None = None) -> Any:
-    if _address is not None:
-        address = _address + "/api/v1/" + path
-        r = requests.get(address, headers=__headers(), params=params)
+    @contextlib.contextmanager
+    def activate(self) -> Iterator[Client]:
+        """Use this client for module-level calls within a `with` block.
+
+        The activation is local to the current thread (or asyncio task), so
+        parallel threads can each work with their own client.
+        """
+        token = _current_client.set(self)
+        try:
+            yield self
+        finally:
+            _current_client.reset(token)
+
+    def authenticate(self, address: str, api_key: str):
+        """Authenticate with a SampleDB instance.
+
+        Arguments:
+            address: URL of the SampleDB server.
+            api_key: API token you can generate using "Preferences/API Tokens".
+        """
+        old_address, old_key = self.address, self.api_key
+        self.address, self.api_key = address, api_key
+        self.identity_map.invalidate()
+        self.response_cache.invalidate()
+        self.schema_converters.clear()
+        try:
+            self.get_data("users/me")
+        except requests.exceptions.HTTPError as e:
+            self.address, self.api_key = old_address, old_key
+            raise Exception("Authentication not successful: " + str(e))
+
+    def configure_session(self, pool_connections: int = 10,
+                          pool_maxsize: int = 10, pool_block: bool = False,
+                          keep_alive: bool = True):
+        """Configure the HTTP session used for all requests of this client.
+
+        All requests share one session, so TCP and TLS connections are pooled
+        and reused between calls. An already open session is closed and
+        replaced by one with the new settings on the next request.
+
+        Arguments:
+            pool_connections: Number of per-host connection pools to keep.
+            pool_maxsize: Maximum number of connections kept per host.
+            pool_block: Block instead of opening additional connections when
+                all pooled connections of a host are in use.
+            keep_alive: Keep connections open for reuse between requests.
+        """
+        if (isinstance(pool_connections, int) and
+                isinstance(pool_maxsize, int) and
+                isinstance(pool_block, bool) and
+                isinstance(keep_alive, bool)):
+            if pool_connections < 1 or pool_maxsize < 1:
+                raise ValueError("Pool sizes have to be positive.")
+            self._session_settings.update(pool_connections=pool_connections,
+                                          pool_maxsize=pool_maxsize,
+                                          pool_block=pool_block,
+                                          keep_alive=keep_alive)
+            self.close_session()
+        else:
+            raise TypeError()
+
+    def configure_cache(self, ttl: Optional[float] = 300.0,
+                        maxsize: int = 1024, enabled: bool = True):
+        """Configure the identity map caching users, locations, actions and
+        action types.
+
+        Arguments:
+            ttl: Seconds after which a cached entity expires, None to never
+                expire.
+            maxsize: Maximum number of cached entities, the least recently
+                used ones are evicted first.
+            enabled: Whether entities are cached at all.
+        """
+        self.identity_map.configure(ttl, maxsize, enabled)
+
+    def configure_response_cache(
+            self, paths: typing.Iterable[str] = (
+                "actions", "action_types", "locations", "location_types",
+                "users", "instruments"),
+            fallback_ttl: float = 0.0, maxsize: int = 256,
+            enabled: bool = True):
+        """Configure the cache of GET responses revalidated with
+        `ETag` / `Last-Modified`.
+
+        Cached responses are requested again with `If-None-Match` /
+        `If-Modified-Since`, so unchanged lists are not transferred and
+        decoded again. See :class:`~sampledbapi.cache.ResponseCache`.
+
+        Arguments:
+            paths: First path segments of the cached endpoints.
+            fallback_ttl: Seconds a response without validators is reused
+                without asking the server, 0 to not cache such responses.
+            maxsize: Maximum number of cached responses.
+            enabled: Whether responses are cached at all.
+        """
+        self.response_cache.configure(paths, fallback_ttl, maxsize, enabled)
+
+    def configure_version_cache(self, directory: Optional[str],
+                                max_bytes: int = 512 * 1024 * 1024):
+        """Keep object versions retrieved via
+        :meth:`~sampledbapi.objects.Object.get_version` on disk.
+
+        Versions never change, so cached versions are returned without any
+        request, also in later runs. See
+        :class:`~sampledbapi.cache.VersionCache`.
+
+        Arguments:
+            directory: Directory of the cache, None to disable it.
+            max_bytes: Maximum total size of the cached files.
+        """
+        self.version_cache = None if directory is None \
+            else VersionCache(directory, max_bytes)
+
+    def configure_mirror(self, mirror: Optional[Mirror]):
+        """Answer object queries from a local mirror.
+
+        :func:`objects.get <sampledbapi.objects.get>`,
+        :func:`objects.get_list <sampledbapi.objects.get_list>` and
+        :func:`users.get <sampledbapi.users.get>` (which also resolves the
+        editors of objects) read from the mirror if it can answer the query
+        and fall back to the server otherwise (e.g. for searches or unknown
+        objects). A mirror imported from another server is ignored. See
+        :class:`~sampledbapi.mirror.Mirror`.
+
+        Arguments:
+            mirror: The mirror, None to always ask the server.
+        """
+        self.mirror = mirror
+
+    @property
+    def active_mirror(self) -> Optional[Mirror]:
+        """The configured mirror if it was imported from the server of this
+        client, None otherwise."""
+        mirror = self.mirror
+        if mirror is None or mirror.address != self.address:
+            return None
+        return mirror
+
+    def configure_references(self, lazy: bool = True):
+        """Choose between eager and lazy resolution of references.
+
+        With lazy references, attributes like `Object.version_editor` or
+        `Instrument.instrument_scientists` hold the raw IDs and the
+        referenced entities are only fetched on first access.
+
+        Arguments:
+            lazy: Resolve references on first access instead of when the
+                model is created.
+        """
+        if isinstance(lazy, bool):
+            self.lazy_references = lazy
+        else:
+            raise TypeError()
+
+    def configure_data(self, lazy: bool = True):
+        """Choose between eager and lazy decoding of object data.
+
+        With lazy decoding, `Object.data` is a
+        :class:`~sampledbapi.utils.LazyData` view that decodes each property
+        on first access (see :func:`~sampledbapi.utils.convert_json`), so
+        scans over many objects only pay for the properties they read.
+
+        Arguments:
+            lazy: Decode properties on access instead of when the object is
+                created.
+        """
+        if isinstance(lazy, bool):
+            self.lazy_data = lazy
+        else:
+            raise TypeError()
+
+    def configure_retries(self, max_attempts: int = 3,
+                          backoff_factor: float = 0.5,
+                          max_backoff: float = 30.0, jitter: bool = True,
+                          statuses: typing.Iterable[int] = (429, 502, 503, 504),
+                          methods: typing.Iterable[str] = (
+                              "GET", "HEAD", "OPTIONS", "PUT", "DELETE"),
+                          respect_retry_after: bool = True):
+        """Configure how failed requests are retried.
+
+        See :class:`~sampledbapi.retry.RetryPolicy` for the arguments. Use
+        `max_attempts=1` to disable retries.
+        """
+        self.retry_policy = RetryPolicy(max_attempts, backoff_factor,
+                                        max_backoff, jitter, statuses,
+                                        methods, respect_retry_after)
+
+    def configure_rate_limit(self, rate: Optional[float], burst: int = 1):
+        """Limit the number of requests per second sent by this client.
+
+        All threads using the client share one token bucket, see
+        :class:`~sampledbapi.retry.RateLimiter`.
+
+        Arguments:
+            rate: Requests per second, None to disable the limit.
+            burst: Maximum number of requests sent at once after a pause.
+        """
+        self.rate_limiter = None if rate is None else RateLimiter(rate, burst)
+
+    def configure_timeout(self, connect: float = 10.0, read: float = 300.0):
+        """Configure the timeouts of each request.
+
+        Arguments:
+            connect: Seconds to wait for a connection to the server.
+            read: Seconds to wait for the server between two bytes of the
+                response.
+        """
+        if isinstance(connect, (int, float)) and isinstance(read, (int, float)):
+            self.timeout = (connect, read)
+        else:
+            raise TypeError()
+
+    def get_session(self) -> requests.Session:
+        """Get the pooled HTTP session, creating it on first use."""
+        with self._session_lock:
+            if self._session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=self._session_settings["pool_connections"],
+                    pool_maxsize=self._session_settings["pool_maxsize"],
+                    pool_block=self._session_settings["pool_block"])
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                if not self._session_settings["keep_alive"]:
+                    session.headers["Connection"] = "close"
+                self._session = session
+            return self._session
+
+    def close_session(self):
+        """Close the HTTP session and all of its pooled connections."""
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def close(self):
+        """Release all resources held by this client."""
+        self.close_session()
+
+    def _headers(self) -> Dict:
+        if self.api_key is not None:
+            return {"Authorization": "Bearer " + self.api_key}
+        else:
+            raise Exception("You need to provide an API key.")
+
+    def _url(self, path: str) -> str:
+        if self.address is not None:
+            return self.address + "/api/v1/" + path
+        else:
+            raise Exception("You have to authenticate first.")
+
+    def request(self, method: str, path: str, **kwargs) -> requests.Response:
+        """Send a request, applying timeouts, rate limit and retries.
+
+        Failed attempts are repeated according to the client's
+        :class:`~sampledbapi.retry.RetryPolicy`. If a
+        :func:`~sampledbapi.retry.deadline` is active, the request raises
+        :class:`~sampledbapi.retry.DeadlineExceeded` instead of running past
+        it.
+
+        Arguments:
+            method: HTTP method.
+            path: API path, e.g. "objects/1".
+            kwargs: Further arguments for :meth:`requests.Session.request`.
+        """
+        address = self._url(path)
+        headers = self._headers()
+        headers.update(kwargs.pop("headers", None) or {})
+        session = self.get_session()
+        attempt = 0
+        while True:
+            attempt += 1
+            remaining = get_remaining_time()
+            if remaining is not None and remaining <= 0:
+                raise DeadlineExceeded(f"Deadline exceeded before {method} "
+                                       f"{path}")
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(remaining)
+            timeout = self.timeout
+            remaining = get_remaining_time()
+            if remaining is not None:
+                if remaining <= 0:
+                    raise DeadlineExceeded(f"Deadline exceeded before "
+                                           f"{method} {path}")
+                timeout = (min(timeout[0], remaining),
+                           min(timeout[1], remaining))
+            try:
+                r = session.request(method, address, headers=headers,
+                                    timeout=timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if not self.retry_policy.should_retry(method, attempt):
+                    raise
+                delay = self.retry_policy.get_delay(attempt)
+            else:
+                if not self.retry_policy.should_retry(method, attempt,
+                                                      r.status_code):
+                    return r
+                delay = self.retry_policy.get_delay(attempt, r.headers)
+                r.close()
+            remaining = get_remaining_time()
+            if remaining is not None and delay >= remaining:
+                raise DeadlineExceeded(f"Deadline exceeded while retrying "
+                                       f"{method} {path}")
+            time.sleep(delay)
+
+    def get_data(self, path: str,
+                 params: typing.Dict[str, Any] | None = None) -> Any:
+        key = self.response_cache.key(path, params)
+        headers: Dict[str, str] = {}
+        if key is not None:
+            data, headers = self.response_cache.lookup(key)
+            if data is not None:
+                return data
+        r = self.request("GET", path, params=params, headers=headers)
+        if r.status_code == 304 and key is not None:
+            data = self.response_cache.not_modified(key)
+            if data is not None:
+                return data
+            # The entry was evicted in the meantime
+            r = self.request("GET", path, params=params)
         if r.status_code == 200 or r.status_code == 201:
             try:
-                return json.loads(r.text)
+                data = json.loads(r.text)
             except Exception as e:
                 # We need better error handling here
                 raise Exception("JSON could not be parsed: " + str(e) +
                                 "\nJSON was\n" + r.text)
+            if key is not None:
+                self.response_cache.store(key, r.headers, data)
+            return data
+        else:
+            _raise_for_status(r)
+
+    def iter_data(self, path: str,
+                  params: typing.Dict[str, Any] | None = None,
+                  chunk_size: int = 65536,
+                  skip_field: Optional[str] = None) -> Iterator[Any]:
+        """Stream a list endpoint and yield its elements one at a time.
+
+        In contrast to :meth:`get_data`, the response body is decoded
+        incrementally while it arrives, so the memory needed does not grow
+        with the length of the list.
+
+        Arguments:
+            path: API path of a list endpoint, e.g. "objects".
+            params: Query parameters.
+            chunk_size: Number of bytes read from the socket at once.
+            skip_field: String field of the elements that is dropped while
+                decoding, e.g. "base64_content".
+        """
+        return iter_json_array(self.iter_content(path, params, chunk_size),
+                               skip_field)
+
+    def iter_content(self, path: str,
+                     params: typing.Dict[str, Any] | None = None,
+                     chunk_size: int = 65536
+                     ) -> Generator[bytes, None, None]:
+        """Stream the raw response body of a GET request.
+
+        The request is sent immediately, so errors are raised before the
+        iteration starts. Closing the generator closes the connection, even
+        if the body was not read completely.
+
+        Arguments:
+            path: API path, e.g. "objects/1/files/1".
+            params: Query parameters.
+            chunk_size: Number of bytes read from the socket at once.
+        """
+        r = self.request("GET", path, params=params, stream=True)
+        if r.status_code == 200 or r.status_code == 201:
+            return _iter_response(r, chunk_size)
         else:
             try:
-                r.raise_for_status()
-            except HTTPError as exc:
-                if exc.response is not None:
-                    if 400 <= exc.response.status_code < 500:
-                        raise Exception(f'{exc}\nResponse text: {r.text}')
-                raise
-    else:
-        raise Exception("You have to authenticate first.")
+                _raise_for_status(r)
+            finally:
+                r.close()
+            empty: typing.Tuple[bytes, ...] = ()
+            return (chunk for chunk in empty)
+
+    def post_data(self, path: str, data) -> requests.Response:
+        response = self.request("POST", path, data=json.dumps(data))
+        self.response_cache.invalidate(path)
+        _raise_for_status(response)
+        return response
 
+    def post_stream(self, path: str, body: Any) -> requests.Response:
+        """Post a JSON body that is generated while it is sent.
 
-def post_data(path: str, data) -> requests.Response:
-    if _address is not None:
-        address = _address + "/api/v1/" + path
-        data = json.dumps(data)
-        response = requests.post(address, headers=__headers(), data=data)
-        try:
-            response.raise_for_status()
-        except HTTPError as exc:
-            if exc.response is not None:
-                if 400 <= exc.response.status_code < 500:
-                    raise Exception(f'{exc}\nResponse text: {response.text}')
-            raise
+        Arguments:
+            path: API path, e.g. "objects/1/files/".
+            body: Iterable of UTF-8 encoded JSON chunks. If it has a `len`
+                attribute, it is sent as Content-Length, otherwise the body
+                is sent with chunked transfer encoding.
+        """
+        response = self.request("POST", path, data=body,
+                                headers={"Content-Type": "application/json"})
+        self.response_cache.invalidate(path)
+        _raise_for_status(response)
         return response
-    else:
-        raise Exception("You have to authenticate first.")
+
+    def put_data(self, path: str, data) -> requests.Response:
+        response = self.request("PUT", path, data=json.dumps(data))
+        self.response_cache.invalidate(path)
+        _raise_for_status(response)
+        return response
+
+
+def _raise_for_status(r: requests.Response):
+    try:
+        r.raise_for_status()
+    except HTTPError as exc:
+        if exc.response is not None:
+            if 400 <= exc.response.status_code < 500:
+                raise Exception(f'{exc}\nResponse text: {r.text}')
+        raise
+
+
+def _iter_response(r: requests.Response,
+                   chunk_size: int) -> Generator[bytes, None, None]:
+    with r:
+        yield from r.iter_content(chunk_size)
+
+
+_default_client = Client()
+_current_client: contextvars.ContextVar[Optional[Client]] = \
+    contextvars.ContextVar("sampledbapi_client", default=None)
+
+
+def get_client() -> Client:
+    """Get the client used by the module-level functions.
+
+    Returns:
+        Client: The client activated via :meth:`Client.activate` in the
+        current thread or task, or the default client.
+    """
+    client = _current_client.get()
+    return _default_client if client is None else client
+
+
+def authenticate(address: str, api_key: str):
+    """Authenticate with a SampleDB instance
+
+    To retrieve data from SampleDB and upload data to it, you have to
+    authenticate first.
+
+    Arguments:
+        address: URL of the SampleDB server.
+        api_key: API token you can generate using "Preferences/API Tokens".
+    """
+    get_client().authenticate(address, api_key)
+
+
+def configure_session(pool_connections: int = 10, pool_maxsize: int = 10,
+                      pool_block: bool = False, keep_alive: bool = True):
+    """Configure the HTTP session of the current client.
+
+    See :meth:`Client.configure_session`.
+    """
+    get_client().configure_session(pool_connections, pool_maxsize,
+                                   pool_block, keep_alive)
+
+
+def configure_cache(ttl: Optional[float] = 300.0, maxsize: int = 1024,
+                    enabled: bool = True):
+    """Configure the identity map of the current client.
+
+    See :meth:`Client.configure_cache`.
+    """
+    get_client().configure_cache(ttl, maxsize, enabled)
+
+
+def configure_response_cache(
+        paths: typing.Iterable[str] = (
+            "actions", "action_types", "locations", "location_types",
+            "users", "instruments"),
+        fallback_ttl: float = 0.0, maxsize: int = 256, enabled: bool = True):
+    """Configure the response cache of the current client.
+
+    See :meth:`Client.configure_response_cache`.
+    """
+    get_client().configure_response_cache(paths, fallback_ttl, maxsize,
+                                          enabled)
+
+
+def configure_version_cache(directory: Optional[str],
+                            max_bytes: int = 512 * 1024 * 1024):
+    """Configure the on-disk version cache of the current client.
+
+    See :meth:`Client.configure_version_cache`.
+    """
+    get_client().configure_version_cache(directory, max_bytes)
+
+
+def configure_mirror(mirror: Optional[Mirror]):
+    """Answer object queries of the current client from a local mirror.
+
+    See :meth:`Client.configure_mirror`.
+    """
+    get_client().configure_mirror(mirror)
+
+
+def configure_data(lazy: bool = True):
+    """Choose between eager and lazy decoding of object data for the current
+    client.
+
+    See :meth:`Client.configure_data`.
+    """
+    get_client().configure_data(lazy)
+
+
+def configure_references(lazy: bool = True):
+    """Choose between eager and lazy references for the current client.
+
+    See :meth:`Client.configure_references`.
+    """
+    get_client().configure_references(lazy)
+
+
+def configure_retries(max_attempts: int = 3, backoff_factor: float = 0.5,
+                      max_backoff: float = 30.0, jitter: bool = True,
+                      statuses: typing.Iterable[int] = (429, 502, 503, 504),
+                      methods: typing.Iterable[str] = (
+                          "GET", "HEAD", "OPTIONS", "PUT", "DELETE"),
+                      respect_retry_after: bool = True):
+    """Configure retries of the current client.
+
+    See :meth:`Client.configure_retries`.
+    """
+    get_client().configure_retries(max_attempts, backoff_factor, max_backoff,
+                                   jitter, statuses, methods,
+                                   respect_retry_after)
+
+
+def configure_rate_limit(rate: Optional[float], burst: int = 1):
+    """Configure the rate limit of the current client.
+
+    See :meth:`Client.configure_rate_limit`.
+    """
+    get_client().configure_rate_limit(rate, burst)
+
+
+def configure_timeout(connect: float = 10.0, read: float = 300.0):
+    """Configure the request timeouts of the current client.
+
+    See :meth:`Client.configure_timeout`.
+    """
+    get_client().configure_timeout(connect, read)
+
+
+def get_session() -> requests.Session:
+    """Get the pooled HTTP session of the current client."""
+    return get_client().get_session()
+
+
+def close_session():
+    """Close the HTTP session of the current client."""
+    get_client().close_session()
+
+
+def get_data(path: str, params: typing.Dict[str, Any] | None = None) -> Any:
+    return get_client().get_data(path, params)
+
+
+def iter_data(path: str, params: typing.Dict[str, Any] | None = None,
+              chunk_size: int = 65536,
+              skip_field: Optional[str] = None) -> Iterator[Any]:
+    return get_client().iter_data(path, params, chunk_size, skip_field)
+
+
+def iter_content(path: str, params: typing.Dict[str, Any] | None = None,
+                 chunk_size: int = 65536) -> Generator[bytes, None, None]:
+    return get_client().iter_content(path, params, chunk_size)
+
+
+def post_data(path: str, data) -> requests.Response:
+    return get_client().post_data(path, data)
+
+
+def post_stream(path: str, body: Any) -> requests.Response:
+    return get_client().post_stream(path, body)
 
 
 def put_data(path: str, data) -> requests.Response:
-    if _address is not None:
-        address = _address + "/api/v1/" + path
-        data = json.dumps(data)
-        try:
-            response = requests.put(address, headers=__headers(), data=data)
-            response.raise_for_status()
-        except HTTPError as exc:
-            if exc.response is not None:
-                if 400 <= exc.response.status_code < 500:
-                    raise Exception(f'{exc}\nResponse text: {response.text}')
-            raise
-        return response
-    else:
-        raise Exception("You have to authenticate first.")
+    return get_client().put_data(path, data)
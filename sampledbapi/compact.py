@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+from typing import Any, ClassVar, Dict, Optional, Tuple
+
+from . import instruments, locations, object_log, objects, users
+
+__all__ = ["CompactModel", "CompactObject", "CompactUser", "CompactLocation",
+           "CompactFile", "CompactComment", "CompactObjectLogEntry",
+           "CompactInstrumentLogEntry", "CompactInstrumentLogEntryVersion",
+           "CompactInstrumentLogCategory", "CompactInstrumentLogFileAttachment",
+           "CompactInstrumentLogObjectAttachment"]
+
+
+class CompactModel:
+    """Memory-efficient, read-only-by-convention model.
+
+    Compact models store the fields of an API payload in ``__slots__``, so
+    instances have no per-instance ``__dict__``, and the field table is
+    computed once per class, so construction is a single pass over it.
+    Values are kept as returned by the API: references are raw IDs,
+    datetimes strings and object data unconverted. Use them to hold many
+    entities in memory and :meth:`to_model` to get the full model of one.
+
+    .. code-block::
+
+        entries = [CompactObjectLogEntry(d)
+                   for d in comm.iter_data("object_log_entries/")]
+
+    Arguments:
+        d: Payload as returned by the API.
+    """
+
+    __slots__ = ()
+
+    _fields: ClassVar[Tuple[str, ...]] = ()
+    _model: ClassVar[Optional[type]] = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._fields = tuple(
+            name for klass in reversed(cls.__mro__)
+            for name in klass.__dict__.get("__slots__", ()))
+
+    def __init__(self, d: Dict):
+        get = d.get
+        for name in self._fields:
+            setattr(self, name, get(name))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__} ({self._fields[0]} " \
+            + f"{getattr(self, self._fields[0])})"
+
+    def __eq__(self, other) -> bool:
+        return type(other) is type(self) and self.to_dict() == other.to_dict()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the fields as a payload dictionary."""
+        return {name: getattr(self, name) for name in self._fields}
+
+    def to_model(self) -> Any:
+        """Create the full model (e.g. :class:`~sampledbapi.objects.Object`).
+
+        This resolves references and converts values like the full models
+        do, which may need requests.
+        """
+        if self._model is None:
+            raise Exception(f"{type(self).__name__} has no full model.")
+        return self._model(self._payload())
+
+    def _payload(self) -> Dict[str, Any]:
+        # Fields missing from the original payload are None
+        return {name: value for name, value in self.to_dict().items()
+                if value is not None}
+
+
+class CompactObject(CompactModel):
+    __slots__ = ("object_id", "version_id", "action_id", "user_id",
+                 "utc_datetime", "schema", "data")
+    _model = objects.Object
+
+
+class CompactUser(CompactModel):
+    __slots__ = ("user_id", "name", "orcid", "affiliation", "role", "email")
+    _model = users.User
+
+
+class CompactLocation(CompactModel):
+    __slots__ = ("location_id", "name", "description", "parent_location_id",
+                 "type_id", "is_hidden")
+    _model = locations.Location
+
+
+class CompactFile(CompactModel):
+    __slots__ = ("file_id", "object_id", "storage", "original_file_name",
+                 "url", "hash", "base64_content")
+    _model = objects.File
+
+
+class CompactComment(CompactModel):
+    __slots__ = ("comment_id", "object_id", "user_id", "content",
+                 "utc_datetime")
+    _model = objects.Comment
+
+
+class CompactObjectLogEntry(CompactModel):
+    __slots__ = ("log_entry_id", "type", "object_id", "user_id", "data",
+                 "utc_datetime")
+    _model = object_log.ObjectLogEntry
+
+
+class CompactInstrumentLogCategory(CompactModel):
+    __slots__ = ("category_id", "title")
+    _model = instruments.InstrumentLogCategory
+
+
+class CompactInstrumentLogEntryVersion(CompactModel):
+    __slots__ = ("log_entry_id", "version_id", "utc_datetime", "content",
+                 "categories", "event_utc_datetime", "content_is_markdown")
+    _model = instruments.InstrumentLogEntryVersion
+
+
+class CompactInstrumentLogEntry(CompactModel):
+    """Compact :class:`~sampledbapi.instruments.InstrumentLogEntry`.
+
+    Unlike the payload, `instrument_id` is set, so :meth:`to_model` works
+    without further arguments.
+    """
+
+    __slots__ = ("log_entry_id", "instrument_id", "author", "versions")
+
+    def __init__(self, instrument_id: int, d: Dict):
+        super().__init__(d)
+        self.instrument_id = instrument_id
+
+    def to_model(self) -> instruments.InstrumentLogEntry:
+        return instruments.InstrumentLogEntry(self.instrument_id,
+                                              self._payload())
+
+
+class CompactInstrumentLogFileAttachment(CompactModel):
+    __slots__ = ("file_attachment_id", "file_name", "content")
+    _model = instruments.InstrumentLogFileAttachment
+
+
+class CompactInstrumentLogObjectAttachment(CompactModel):
+    __slots__ = ("object_attachment_id", "object_id")
+    _model = instruments.InstrumentLogObjectAttachment
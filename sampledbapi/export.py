@@ -0,0 +1,287 @@
+"""Columnar export of objects to Arrow, Parquet and pandas.
+
+The columns are derived from the action schema, so all objects of an export
+should be created with the same action:
+
+- `object_id`, `version_id` and `action_id`,
+- text as strings (the English text of multilingual text),
+- quantities as two columns, the magnitude (`float64`) and `<name>.units`,
+- datetimes as timestamps, bools as booleans,
+- object references and users as integer IDs,
+- nested objects flattened into `<name>.<property>` columns.
+
+Arrays, time series, files and other types are not exported. Objects are
+consumed lazily in chunks of `chunk_size`, so exporting from
+:func:`objects.iter_list <sampledbapi.objects.iter_list>` to a file keeps
+the memory use bounded.
+
+.. code-block::
+
+    export.write_parquet(objects.iter_list(action_id=1), "samples.parquet",
+                         actions.get(1).schema)
+
+Requires the optional dependencies `pyarrow` and, for :func:`to_dataframe`,
+`pandas` (``pip install sampledbapi[export]``).
+"""
+
+from __future__ import annotations
+
+import itertools
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from .utils import Quantity, _decode
+
+try:
+    import pyarrow as pa  # type: ignore
+except ImportError:  # pragma: no cover
+    pa = None  # type: ignore
+
+__all__ = ["schema_columns", "iter_batches", "to_table", "to_dataframe",
+           "write_parquet", "write_arrow"]
+
+_Column = Tuple[str, Any, Callable[[Any], Any]]
+
+
+def schema_columns(schema: Optional[Dict]) -> List[Tuple[str, str]]:
+    """Get the columns exported for objects of a schema.
+
+    Args:
+        schema (dict): Action schema, None for only the ID columns.
+
+    Returns:
+        List: Pairs of column name and SampleDB type (e.g. "quantity" for
+        the value and "units" for the units column of a quantity).
+    """
+    return [(name, kind) for name, kind, _ in _columns(schema)]
+
+
+def iter_batches(objs: Iterable[Any], schema: Optional[Dict] = None,
+                 chunk_size: int = 10000) -> Iterator[Any]:
+    """Export objects in chunks of Arrow record batches.
+
+    Args:
+        objs (Iterable): :class:`~sampledbapi.objects.Object` (or
+            :class:`~sampledbapi.compact.CompactObject`) instances.
+        schema (dict): Action schema, by default that of the first object.
+        chunk_size (int): Number of objects per batch.
+
+    Returns:
+        Iterator: Iterator over `pyarrow.RecordBatch` objects.
+    """
+    _, batches = _export(objs, schema, chunk_size)
+    return batches
+
+
+def to_table(objs: Iterable[Any], schema: Optional[Dict] = None,
+             chunk_size: int = 10000) -> Any:
+    """Export objects to an Arrow table.
+
+    See :func:`iter_batches` for the arguments.
+
+    Returns:
+        pyarrow.Table: The table.
+    """
+    arrow_schema, batches = _export(objs, schema, chunk_size)
+    return pa.Table.from_batches(list(batches), schema=arrow_schema)
+
+
+def to_dataframe(objs: Iterable[Any], schema: Optional[Dict] = None,
+                 chunk_size: int = 10000) -> Any:
+    """Export objects to a pandas DataFrame.
+
+    See :func:`iter_batches` for the arguments.
+
+    Returns:
+        pandas.DataFrame: The table.
+    """
+    return to_table(objs, schema, chunk_size).to_pandas()
+
+
+def write_parquet(objs: Iterable[Any], path: Any,
+                  schema: Optional[Dict] = None, chunk_size: int = 10000,
+                  **kwargs) -> int:
+    """Export objects to a Parquet file, one row group per chunk.
+
+    See :func:`iter_batches` for the arguments; other keyword arguments
+    (e.g. `compression`) are passed to `pyarrow.parquet.ParquetWriter`.
+
+    Returns:
+        int: Number of exported objects.
+    """
+    arrow_schema, batches = _export(objs, schema, chunk_size)
+    import pyarrow.parquet as pq  # type: ignore
+    rows = 0
+    with pq.ParquetWriter(path, arrow_schema, **kwargs) as writer:
+        for batch in batches:
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    return rows
+
+
+def write_arrow(objs: Iterable[Any], path: Any,
+                schema: Optional[Dict] = None,
+                chunk_size: int = 10000) -> int:
+    """Export objects to an Arrow IPC (Feather v2) file.
+
+    See :func:`iter_batches` for the arguments.
+
+    Returns:
+        int: Number of exported objects.
+    """
+    arrow_schema, batches = _export(objs, schema, chunk_size)
+    rows = 0
+    with pa.ipc.new_file(path, arrow_schema) as writer:
+        for batch in batches:
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    return rows
+
+
+def _export(objs: Iterable[Any], schema: Optional[Dict],
+            chunk_size: int) -> Tuple[Any, Iterator[Any]]:
+    if pa is None:
+        raise ImportError("The export requires pyarrow, install it with "
+                          "'pip install sampledbapi[export]'.")
+    if not isinstance(chunk_size, int):
+        raise TypeError()
+    if chunk_size < 1:
+        raise ValueError("chunk_size has to be positive.")
+    iterator = iter(objs)
+    first = next(iterator, None)
+    if schema is None and first is not None:
+        schema = first.schema
+    columns = _columns(schema)
+    arrow_schema = pa.schema([(name, _ARROW_TYPES[kind]())
+                              for name, kind, _ in columns])
+    if first is not None:
+        iterator = itertools.chain([first], iterator)
+
+    def batches() -> Iterator[Any]:
+        while True:
+            chunk = list(itertools.islice(iterator, chunk_size))
+            if not chunk:
+                return
+            arrays = [pa.array([get(obj) for obj in chunk], type=field.type)
+                      for field, (_, _, get) in zip(arrow_schema, columns)]
+            yield pa.RecordBatch.from_arrays(arrays, schema=arrow_schema)
+    return arrow_schema, batches()
+
+
+_ARROW_TYPES: Dict[str, Callable[[], Any]] = {
+    "id": lambda: pa.int64(),
+    "text": lambda: pa.string(),
+    "quantity": lambda: pa.float64(),
+    "units": lambda: pa.string(),
+    "datetime": lambda: pa.timestamp("us"),
+    "bool": lambda: pa.bool_(),
+    "object_reference": lambda: pa.int64(),
+    "user": lambda: pa.int64(),
+}
+
+
+def _columns(schema: Optional[Dict]) -> List[_Column]:
+    columns: List[_Column] = [
+        (name, "id", _attribute(name))
+        for name in ("object_id", "version_id", "action_id")]
+    if schema is not None:
+        columns += _property_columns(schema, ())
+    return columns
+
+
+def _attribute(name: str) -> Callable[[Any], Any]:
+    return lambda obj: getattr(obj, name)
+
+
+def _property_columns(schema: Mapping, path: Tuple[str, ...]
+                      ) -> List[_Column]:
+    columns: List[_Column] = []
+    for key, child in schema.get("properties", {}).items():
+        if not isinstance(child, Mapping):
+            continue
+        kind = child.get("type")
+        name = ".".join(path + (key,))
+        get = _property(path + (key,))
+        if kind == "object":
+            columns += _property_columns(child, path + (key,))
+        elif kind == "quantity":
+            columns.append((name, kind, _chain(get, _magnitude)))
+            columns.append((name + ".units", "units", _chain(get, _units)))
+        elif kind in ("sample", "measurement", "object_reference"):
+            columns.append((name, "object_reference",
+                            _chain(get, _object_id)))
+        elif kind in _CONVERTERS:
+            columns.append((name, kind, _chain(get, _CONVERTERS[kind])))
+    return columns
+
+
+def _property(path: Tuple[str, ...]) -> Callable[[Any], Any]:
+    def get(obj: Any) -> Any:
+        value = obj.data
+        for key in path:
+            if not isinstance(value, Mapping):
+                return None
+            value = value.get(key)
+        # Raw data, e.g. of a CompactObject
+        if type(value) is dict and "_type" in value:
+            value = _decode(value)
+        return value
+    return get
+
+
+def _chain(get: Callable[[Any], Any],
+           convert: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    def get_converted(obj: Any) -> Any:
+        value = get(obj)
+        return None if value is None else convert(value)
+    return get_converted
+
+
+def _text(value: Any) -> Optional[str]:
+    if isinstance(value, dict):
+        # Multilingual text
+        return value.get("en", next(iter(value.values()), None))
+    return str(value)
+
+
+def _magnitude(value: Any) -> Optional[float]:
+    if isinstance(value, Quantity):
+        # SampleDB sends the magnitude in the given units and in base units,
+        # "value" is only set by quantities created locally
+        for magnitude in (value.magnitude, value.magnitude_in_base_units,
+                          value.value):
+            if magnitude is not None:
+                return float(magnitude)
+        return None
+    return float(value)
+
+
+def _units(value: Any) -> Optional[str]:
+    return value.units if isinstance(value, Quantity) else None
+
+
+def _object_id(value: Any) -> Optional[int]:
+    if isinstance(value, dict):
+        # Types without decoder, e.g. "sample"
+        return None if value.get("object_id") is None \
+            else int(value["object_id"])
+    return int(value)
+
+
+def _user_id(value: Any) -> Optional[int]:
+    if isinstance(value, dict):
+        return None if value.get("user_id") is None \
+            else int(value["user_id"])
+    return int(value)
+
+
+def _datetime(value: Any) -> Optional[datetime]:
+    return value if isinstance(value, datetime) else None
+
+
+_CONVERTERS: Dict[str, Callable[[Any], Any]] = {
+    "text": _text,
+    "datetime": _datetime,
+    "bool": bool,
+    "user": _user_id,
+}
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Any, Collection, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+from . import bulk, objects
+from .comm import get_data
+from .objects import Object
+
+__all__ = ["ObjectGraph", "crawl"]
+
+_DIRECTIONS = ("both", "referenced", "referencing")
+
+
+class ObjectGraph:
+    """Objects found by :func:`crawl` and the references between them.
+
+    Attributes:
+        objects: Fetched objects by ID, in the order they were visited.
+        depth: Distance of each object from the start objects.
+        referenced: IDs of the objects each object references.
+        referencing: IDs of the objects referencing each object.
+        errors: Exceptions of objects that could not be fetched, by ID.
+    """
+
+    objects: Dict[int, Object]
+    depth: Dict[int, int]
+    referenced: Dict[int, List[int]]
+    referencing: Dict[int, List[int]]
+    errors: Dict[int, Exception]
+
+    def __init__(self):
+        self.objects = {}
+        self.depth = {}
+        self.referenced = {}
+        self.referencing = {}
+        self.errors = {}
+
+    def __repr__(self) -> str:
+        return f"ObjectGraph ({len(self.objects)} objects, " \
+            + f"{len(self.edges())} edges)"
+
+    def __len__(self) -> int:
+        return len(self.objects)
+
+    def __contains__(self, object_id: Any) -> bool:
+        return object_id in self.objects
+
+    def edges(self) -> List[Tuple[int, int]]:
+        """All references as (referencing ID, referenced ID) pairs."""
+        # Objects at the depth limit are not expanded, so their references
+        # are only known from the other side
+        edges = dict.fromkeys(
+            (source, target) for source, targets in self.referenced.items()
+            for target in targets)
+        edges.update(dict.fromkeys(
+            (source, target) for target, sources in self.referencing.items()
+            for source in sources))
+        return list(edges)
+
+
+def crawl(object_ids: Iterable[int], max_depth: Optional[int] = None,
+          direction: str = "both",
+          action_ids: Optional[Collection[int]] = None, order: str = "bfs",
+          max_workers: int = 8,
+          max_objects: Optional[int] = None) -> ObjectGraph:
+    """Traverse the graph of related objects.
+
+    Starting at the given objects, related objects (see
+    :meth:`Object.get_related_objects
+    <sampledbapi.objects.Object.get_related_objects>`) are followed up to
+    `max_depth` references. The objects of each step are fetched
+    concurrently and every object is only fetched once.
+
+    .. code-block::
+
+        graph = crawl([sample_id], max_depth=3, direction="referencing")
+        for source, target in graph.edges():
+            print(graph.objects[source], "->", graph.objects[target])
+
+    Args:
+        object_ids (Iterable[int]): IDs of the start objects.
+        max_depth (int): Maximum number of references followed, None for
+            no limit.
+        direction (str): Follow references to other objects ("referenced"),
+            from other objects ("referencing") or both ("both").
+        action_ids (Collection[int]): Only include and follow objects
+            created with these actions (start objects are always included).
+        order (str): Visit objects breadth-first ("bfs") or depth-first
+            ("dfs"). With "dfs" and a depth limit, objects are expanded at
+            the depth they are first reached.
+        max_workers (int): Number of parallel requests.
+        max_objects (int): Stop after this many objects.
+
+    Returns:
+        ObjectGraph: The objects and the references between them.
+    """
+    object_ids = list(object_ids)
+    if not all(isinstance(i, int) for i in object_ids) \
+            or not (max_depth is None or isinstance(max_depth, int)) \
+            or not (max_objects is None or isinstance(max_objects, int)):
+        raise TypeError()
+    if direction not in _DIRECTIONS:
+        raise ValueError(f"direction has to be one of {_DIRECTIONS}.")
+    if order not in ("bfs", "dfs"):
+        raise ValueError("order has to be 'bfs' or 'dfs'.")
+    actions = None if action_ids is None else frozenset(action_ids)
+    graph = ObjectGraph()
+    pending: Deque[Tuple[int, int]] = deque(
+        (i, 0) for i in dict.fromkeys(object_ids))
+    seen: Set[int] = set(object_ids)
+    batch_size = 2 * max_workers
+
+    def visit(item: Tuple[int, int]) -> Tuple[Object, Optional[Dict]]:
+        object_id, depth = item
+        obj = objects.get(object_id)
+        if depth > 0 and actions is not None \
+                and obj.action_id not in actions:
+            return obj, None
+        if max_depth is not None and depth >= max_depth:
+            return obj, {}
+        return obj, get_data(f"objects/{object_id}/related_objects")
+
+    while pending and (max_objects is None or len(graph) < max_objects):
+        if order == "bfs":
+            batch = [pending.popleft()
+                     for _ in range(min(batch_size, len(pending)))]
+        else:
+            batch = [pending.pop()
+                     for _ in range(min(batch_size, len(pending)))]
+        result = bulk.run(visit, batch, max_workers)
+        children: List[Tuple[int, int]] = []
+        for index, (object_id, depth) in enumerate(batch):
+            if index in result.errors:
+                graph.errors[object_id] = result.errors[index]
+                continue
+            obj, related = result.results[index]
+            if related is None:
+                # Excluded by the action filter
+                continue
+            if max_objects is not None and len(graph) >= max_objects:
+                break
+            graph.objects[object_id] = obj
+            graph.depth[object_id] = depth
+            referenced = [o["object_id"] for o in
+                          related.get("referenced_objects", [])]
+            referencing = [o["object_id"] for o in
+                           related.get("referencing_objects", [])]
+            graph.referenced[object_id] = referenced
+            graph.referencing[object_id] = referencing
+            follow = []
+            if direction in ("both", "referenced"):
+                follow += referenced
+            if direction in ("both", "referencing"):
+                follow += referencing
+            for child in follow:
+                if child not in seen:
+                    seen.add(child)
+                    children.append((child, depth + 1))
+        if order == "bfs":
+            pending.extend(children)
+        else:
+            pending.extend(reversed(children))
+    # Only keep references between objects of the graph
+    for adjacency in (graph.referenced, graph.referencing):
+        for object_id, ids in adjacency.items():
+            adjacency[object_id] = [i for i in ids if i in graph.objects]
+    return graph
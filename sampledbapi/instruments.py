@@ -3,16 +3,17 @@ from __future__ import annotations
 import base64
 import os
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, Iterator, List, Optional, Any
 
 from requests import Response
 
-from .comm import SampleDBObject, get_data, post_data
-from . import users
+from .comm import Reference, SampleDBObject, get_data, iter_data, post_data
+from . import bulk, users
+from .bulk import BulkResult
 
 __all__ = ["Instrument", "InstrumentLogCategory", "InstrumentLogEntry",
            "InstrumentLogFileAttachment", "InstrumentLogObjectAttachment",
-           "get_list", "get"]
+           "get_list", "get", "get_many"]
 
 
 class Instrument(SampleDBObject):
@@ -21,14 +22,7 @@ class Instrument(SampleDBObject):
     name: Optional[str] = None
     description: Optional[str] = None
     is_hidden: Optional[bool] = None
-    instrument_scientists: Optional[List[users.User]] = None
-
-    def __init__(self, d: Dict):
-        """Initialize a new instrument from dictionary."""
-        super().__init__(d)
-        if "instrument_scientists" in d:
-            self.instrument_scientists = [
-                users.get(i) for i in d["instrument_scientists"]]
+    instrument_scientists = Reference(users.get, "user_id", many=True)
 
     def __repr__(self) -> str:
         return f"Instrument {self.instrument_id} ({self.name})"
@@ -45,6 +39,20 @@ class Instrument(SampleDBObject):
         else:
             raise Exception('instrument_id can not be None')
 
+    def iter_log_entry_list(self) -> Iterator[InstrumentLogEntry]:
+        """Iterate over all log entries while they are streamed.
+
+        Returns:
+            Iterator: Iterator over
+                :class:`~sampledbapi.instrument.InstrumentLogEntry`.
+        """
+        if self.instrument_id is not None:
+            instrument_id = self.instrument_id
+            return (InstrumentLogEntry(instrument_id, log) for log in iter_data(
+                f"instruments/{instrument_id}/log_entries"))
+        else:
+            raise Exception('instrument_id can not be None')
+
     def get_log_entry(self, log_entry_id: int) -> InstrumentLogEntry:
         """Get the specific log entry (log_entry_id).
 
@@ -155,6 +163,25 @@ def get(instrument_id: int) -> Instrument:
         raise TypeError()
 
 
+def get_many(instrument_ids: Iterable[int], max_workers: int = 8,
+             deadline: Optional[float] = None) -> BulkResult:
+    """Get several instruments concurrently.
+
+    Repeated IDs are only fetched once. A failing request does not abort the
+    others, its error is reported in the result instead.
+
+    Args:
+        instrument_ids (Iterable[int]): IDs of the instruments.
+        max_workers (int): Number of parallel requests.
+        deadline (float): Seconds after which outstanding requests fail.
+
+    Returns:
+        BulkResult: :class:`~sampledbapi.instruments.Instrument` objects in input order
+        and errors by ID, see :class:`~sampledbapi.bulk.BulkResult`.
+    """
+    return bulk.get_many(get, instrument_ids, max_workers, deadline)
+
+
 """Instrument log entries"""
 
 
@@ -196,7 +223,7 @@ class InstrumentLogEntry(SampleDBObject):
 
     log_entry_id: Optional[int] = None
     instrument_id: Optional[int] = None
-    author: Optional[users.User] = None
+    author = Reference(users.get, "user_id")
     versions: Optional[List[InstrumentLogEntryVersion]] = None
 
     def __init__(self, instrument_id: int, d: Dict):
@@ -204,8 +231,6 @@ class InstrumentLogEntry(SampleDBObject):
         super().__init__(d)
         self.instrument_id = instrument_id
 
-        if "author" in d:
-            self.author = users.get(d["author"])
         if "versions" in d:
             self.versions = [InstrumentLogEntryVersion(v) for v in d["versions"]]
 
@@ -1,8 +1,10 @@
-from typing import List, Optional
+from typing import Iterable, List, Optional
 
-from .comm import SampleDBObject, get_data
+from . import bulk
+from .bulk import BulkResult
+from .comm import SampleDBObject, get_client, get_data
 
-__all__ = ["Location", "get_list", "get"]
+__all__ = ["Location", "get_list", "get", "get_many"]
 
 
 class Location(SampleDBObject):
@@ -24,7 +26,11 @@ def get_list() -> List[Location]:
     Returns:
         List: List of :class:`~sampledbapi.locations.Location` objects.
     """
-    return [Location(loc) for loc in get_data("locations")]
+    entities = [Location(loc) for loc in get_data("locations")]
+    identity_map = get_client().identity_map
+    for entity in entities:
+        identity_map.put(("locations", entity.location_id), entity)
+    return entities
 
 
 def get(location_id: int) -> Location:
@@ -37,6 +43,26 @@ def get(location_id: int) -> Location:
         Location: The requested :class:`~sampledbapi.locations.Location`.
     """
     if isinstance(location_id, int):
-        return Location(get_data(f"locations/{location_id}"))
+        return get_client().identity_map.get_or_fetch(
+            ("locations", location_id), lambda: Location(get_data(f"locations/{location_id}")))
     else:
         raise TypeError()
+
+
+def get_many(location_ids: Iterable[int], max_workers: int = 8,
+             deadline: Optional[float] = None) -> BulkResult:
+    """Get several locations concurrently.
+
+    Repeated IDs are only fetched once. A failing request does not abort the
+    others, its error is reported in the result instead.
+
+    Args:
+        location_ids (Iterable[int]): IDs of the locations.
+        max_workers (int): Number of parallel requests.
+        deadline (float): Seconds after which outstanding requests fail.
+
+    Returns:
+        BulkResult: :class:`~sampledbapi.locations.Location` objects in input order
+        and errors by ID, see :class:`~sampledbapi.bulk.BulkResult`.
+    """
+    return bulk.get_many(get, location_ids, max_workers, deadline)
@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from . import bulk
+from .actions import Action
+from .comm import _raise_for_status, get_client, get_data, iter_data
+from .locations import Location
+from .object_log import _newest_log_entry_id
+from .users import User
+
+__all__ = ["Mirror"]
+
+_TABLES = {
+    "objects": "object_id",
+    "actions": "action_id",
+    "users": "user_id",
+    "locations": "location_id"
+}
+# Status codes of objects that were deleted or can no longer be read, they
+# are removed from the mirror
+_GONE = (403, 404)
+_OBJECT_COLUMNS = "(object_id INTEGER PRIMARY KEY, action_id INTEGER, " \
+    "json TEXT NOT NULL)"
+
+
+class Mirror:
+    """Local SQLite copy of the objects, actions, users and locations of a
+    SampleDB instance.
+
+    After one :meth:`initial_import`, :meth:`sync` keeps the mirror up to
+    date by reading only the object log entries created since the last
+    sync and fetching the objects they refer to. Once a mirror is set via
+    :func:`~sampledbapi.comm.configure_mirror`, :func:`objects.get
+    <sampledbapi.objects.get>` and :func:`objects.get_list
+    <sampledbapi.objects.get_list>` are answered from it without requests,
+    including the users referenced as version editors.
+
+    .. code-block::
+
+        mirror = Mirror("sampledb.sqlite")
+        if mirror.checkpoint is None:
+            mirror.initial_import()
+        mirror.sync()
+        configure_mirror(mirror)
+        objs = objects.get_list(action_id=3)
+
+    The mirror only contains what the user who imported it may read.
+
+    Arguments:
+        path: Path of the SQLite database, created if necessary.
+    """
+
+    def __init__(self, path: str):
+        if not isinstance(path, str):
+            raise TypeError()
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._db.execute("CREATE TABLE IF NOT EXISTS meta "
+                             "(key TEXT PRIMARY KEY, value TEXT)")
+            self._db.execute(
+                f"CREATE TABLE IF NOT EXISTS objects {_OBJECT_COLUMNS}")
+            self._db.execute("CREATE INDEX IF NOT EXISTS objects_action "
+                             "ON objects (action_id)")
+            for table, key in _TABLES.items():
+                if table != "objects":
+                    self._db.execute(f"CREATE TABLE IF NOT EXISTS {table} "
+                                     f"({key} INTEGER PRIMARY KEY, "
+                                     "json TEXT NOT NULL)")
+
+    def __repr__(self) -> str:
+        return f"Mirror ({self.path})"
+
+    def __enter__(self) -> Mirror:
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Close the database."""
+        with self._lock:
+            self._db.close()
+
+    @property
+    def checkpoint(self) -> Optional[int]:
+        """ID of the last object log entry included, None before the
+        initial import."""
+        value = self._get_meta("checkpoint")
+        return None if value is None else int(value)
+
+    @property
+    def address(self) -> Optional[str]:
+        """URL of the SampleDB server this mirror was imported from."""
+        return self._get_meta("address")
+
+    def initial_import(self, chunk_size: int = 1000):
+        """Import all objects, actions, users and locations.
+
+        The object list is streamed and written in chunks, so the import
+        needs little memory regardless of the number of objects. The chunks
+        are written to a staging table that replaces the mirrored objects at
+        the end, so the mirror can be read during the import. Existing data
+        in the mirror is replaced.
+
+        Arguments:
+            chunk_size: Number of objects written per statement.
+        """
+        address = get_client().address
+        # Take the checkpoint before the import, so changes made during the
+        # import are picked up by the next sync. The search starts at the
+        # previous checkpoint of the same server, log entry IDs only grow.
+        previous = self.checkpoint if self.address == address else None
+        checkpoint = _newest_log_entry_id(previous or 0)
+        references = {table: get_data(table) for table in _TABLES
+                      if table != "objects"}
+        with self._lock, self._db:
+            self._db.execute("DROP TABLE IF EXISTS objects_import")
+            self._db.execute(
+                f"CREATE TABLE objects_import {_OBJECT_COLUMNS}")
+        chunk: List[Tuple[int, Any, str]] = []
+        for d in iter_data("objects"):
+            chunk.append(_object_row(d))
+            if len(chunk) >= chunk_size:
+                self._stage(chunk)
+                chunk = []
+        self._stage(chunk)
+        with self._lock, self._db:
+            self._db.execute("DROP TABLE objects")
+            self._db.execute("ALTER TABLE objects_import RENAME TO objects")
+            self._db.execute("CREATE INDEX objects_action "
+                             "ON objects (action_id)")
+            self._store_references(references)
+            self._set_meta("address", address)
+            self._set_meta("checkpoint", checkpoint)
+            self._set_meta("pending", json.dumps([]))
+
+    def sync(self, max_workers: int = 8,
+             refresh_references: bool = True) -> int:
+        """Apply the changes made since the last import or sync.
+
+        Only object log entries after the stored checkpoint are read, and
+        only the objects they refer to are fetched again (concurrently).
+        Objects that were deleted or can no longer be read (403 or 404) are
+        removed from the mirror. Objects whose request failed otherwise (e.g.
+        with a server error) are kept as they are and fetched again by the
+        next sync; the other changes are still applied and the checkpoint
+        advances, then the first of these errors is raised.
+
+        Arguments:
+            max_workers: Number of parallel requests for changed objects.
+            refresh_references: Also reload actions, users and locations,
+                which are not covered by the object log.
+
+        Returns:
+            int: Number of updated or removed objects.
+        """
+        checkpoint = self.checkpoint
+        if checkpoint is None:
+            raise Exception("The mirror has to be imported first.")
+        if self.address != get_client().address:
+            raise Exception(f"The mirror belongs to {self.address}.")
+        entries = get_data("object_log_entries/",
+                           params={"after_id": checkpoint})
+        # Objects whose update failed during the previous sync come first
+        object_ids = list(dict.fromkeys(
+            self._get_pending() + [e["object_id"] for e in entries
+                                   if e.get("object_id") is not None]))
+        result = bulk.run(_fetch_object, object_ids, max_workers,
+                          key=lambda index, object_id: object_id)
+        references = {table: get_data(table) for table in _TABLES
+                      if table != "objects" and refresh_references}
+        gone = [(object_id,) for object_id, d in zip(object_ids, result)
+                if d is None and object_id not in result.errors]
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO objects VALUES (?, ?, ?)",
+                [_object_row(d) for d in result if d is not None])
+            self._db.executemany("DELETE FROM objects WHERE object_id = ?",
+                                 gone)
+            self._store_references(references)
+            self._set_meta("pending", json.dumps(list(result.errors)))
+            if entries:
+                self._set_meta("checkpoint", max(
+                    [checkpoint] + [e["log_entry_id"] for e in entries]))
+        result.raise_for_errors()
+        return len(object_ids)
+
+    def get_object(self, object_id: int) -> Optional[Dict]:
+        """Get the JSON data of an object, None if it is not mirrored."""
+        rows = self._query("SELECT json FROM objects WHERE object_id = ?",
+                           (object_id,))
+        return json.loads(rows[0][0]) if rows else None
+
+    def get_user(self, user_id: int) -> Optional[Dict]:
+        """Get the JSON data of a user, None if it is not mirrored."""
+        rows = self._query("SELECT json FROM users WHERE user_id = ?",
+                           (user_id,))
+        return json.loads(rows[0][0]) if rows else None
+
+    def get_objects(self, action_id: int = -1, limit: int = -1,
+                    offset: int = -1) -> List[Dict]:
+        """Get the JSON data of objects, newest first.
+
+        Arguments:
+            action_id: Only objects created with this action.
+            limit: Maximum number of objects.
+            offset: Number of objects to skip.
+        """
+        sql = "SELECT json FROM objects"
+        params: List[int] = []
+        if action_id > 0:
+            sql += " WHERE action_id = ?"
+            params.append(action_id)
+        sql += " ORDER BY object_id DESC LIMIT ? OFFSET ?"
+        params += [limit if limit > 0 else -1, max(offset, 0)]
+        return [json.loads(row[0]) for row in self._query(sql, params)]
+
+    def get_actions(self) -> List[Action]:
+        """Get all mirrored actions."""
+        return [Action(d) for d in self._load("actions")]
+
+    def get_users(self) -> List[User]:
+        """Get all mirrored users."""
+        return [User(d) for d in self._load("users")]
+
+    def get_locations(self) -> List[Location]:
+        """Get all mirrored locations."""
+        return [Location(d) for d in self._load("locations")]
+
+    def _load(self, table: str) -> List[Dict]:
+        return [json.loads(row[0]) for row in self._query(
+            f"SELECT json FROM {table} ORDER BY {_TABLES[table]}")]
+
+    def _query(self, sql: str, params: Iterable = ()) -> List[Tuple]:
+        with self._lock:
+            return self._db.execute(sql, tuple(params)).fetchall()
+
+    def _stage(self, rows: List[Tuple[int, Any, str]]):
+        # The lock is only held per chunk, readers are not blocked while
+        # the objects are streamed
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO objects_import VALUES (?, ?, ?)",
+                rows)
+
+    def _store_references(self, references: Dict[str, List[Dict]]):
+        for table, entities in references.items():
+            self._db.execute(f"DELETE FROM {table}")
+            self._db.executemany(
+                f"INSERT OR REPLACE INTO {table} VALUES (?, ?)",
+                [(d[_TABLES[table]], json.dumps(d)) for d in entities])
+
+    def _get_pending(self) -> List[int]:
+        value = self._get_meta("pending")
+        return [] if value is None else json.loads(value)
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        rows = self._query("SELECT value FROM meta WHERE key = ?", (key,))
+        return rows[0][0] if rows else None
+
+    def _set_meta(self, key: str, value: Any):
+        self._db.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                         (key, None if value is None else str(value)))
+
+
+def _fetch_object(object_id: int) -> Optional[Dict]:
+    # None if the object was deleted or can no longer be read
+    r = get_client().request("GET", f"objects/{object_id}")
+    if r.status_code in _GONE:
+        return None
+    _raise_for_status(r)
+    return r.json()
+
+
+def _object_row(d: Dict) -> Tuple[int, Any, str]:
+    return d["object_id"], d.get("action_id"), json.dumps(d)
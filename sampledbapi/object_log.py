@@ -1,9 +1,11 @@
 import typing
 from datetime import datetime
 
-from .comm import get_data, SampleDBObject
+from .comm import get_data, iter_content, iter_data, SampleDBObject
+from .streaming import iter_json_array
 
-__all__ = ["ObjectLogEntry", "get_object_log_entries"]
+__all__ = ["ObjectLogEntry", "get_object_log_entries",
+           "iter_object_log_entries"]
 
 
 class ObjectLogEntry(SampleDBObject):
@@ -34,3 +36,63 @@ def get_object_log_entries(after_id: typing.Optional[int] = None) -> typing.List
         return [ObjectLogEntry(entry) for entry in get_data('object_log_entries/', params={'after_id': after_id})]
     else:
         raise TypeError()
+
+
+def iter_object_log_entries(after_id: typing.Optional[int] = None) -> typing.Iterator[ObjectLogEntry]:
+    """Iterate over the object log while it is streamed from the server.
+
+    Args:
+        after_id (int): only log entries created after the entry with the id after_id are returned
+
+    Returns:
+        Iterator: Iterator over :class:`~sampledbapi.object_log.ObjectLogEntry`.
+    """
+    if after_id is None:
+        entries = iter_data('object_log_entries/')
+    elif isinstance(after_id, int):
+        entries = iter_data('object_log_entries/', params={'after_id': after_id})
+    else:
+        raise TypeError()
+    return (ObjectLogEntry(entry) for entry in entries)
+
+
+def _newest_log_entry_id(after_id: int = 0, limit: int = 1000) -> int:
+    # The object log can only be listed after a given entry, so instead of
+    # streaming it completely, lists after growing IDs are probed (galloping
+    # from after_id, which has to be an existing entry or 0) and then
+    # narrowed down by bisection. Only up to `limit` entries of each list
+    # are read; a list shorter than that contains the newest entry.
+    def probe(log_entry_id: int) -> typing.Tuple[typing.Optional[int], bool]:
+        chunks = iter_content('object_log_entries/',
+                              params={'after_id': log_entry_id})
+        try:
+            newest = None
+            for count, entry in enumerate(iter_json_array(chunks), 1):
+                newest = max(newest or 0, entry['log_entry_id'])
+                if count >= limit:
+                    return newest, False
+            return newest, True
+        finally:
+            chunks.close()
+
+    newest, complete = probe(after_id)
+    if newest is None or complete:
+        return after_id if newest is None else newest
+    # There are entries after low and, once known, none after high
+    low, step = newest, limit
+    high: typing.Optional[int] = None
+    while True:
+        if high is None:
+            middle = low + step
+            step *= 2
+        elif high - low <= 1:
+            return high
+        else:
+            middle = (low + high) // 2
+        newest, complete = probe(middle)
+        if newest is None:
+            high = middle
+        elif complete:
+            return newest
+        else:
+            low = newest
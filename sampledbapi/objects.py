@@ -1,29 +1,42 @@
 from __future__ import annotations
 
 import base64
+import contextlib
+import contextvars
+import io
+import json
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from io import IOBase
-from typing import BinaryIO, Dict, List, Optional, Any
+from typing import BinaryIO, Callable, Dict, Hashable, Iterable, Iterator, List, Mapping, Optional, Tuple, Any
 
 from requests import Response
 
 import hashlib
 
-from .comm import SampleDBObject, get_data, post_data, put_data
-from . import locations, users, utils
+from .comm import (Reference, SampleDBObject, get_client, get_data,
+                   iter_content, iter_data, post_data, post_stream, put_data)
+from . import bulk, locations, users, utils
+from .streaming import read_json_object
+from .bulk import BulkResult, Progress
+from .cache import HashIndex
 
-__all__ = ["Object", "File", "Comment", "get_list", "get", "create"]
+__all__ = ["Object", "File", "Comment", "get_list", "iter_list", "get",
+           "get_many", "create", "create_many", "upload_files"]
 
 
 class Object(SampleDBObject):
 
     object_id: Optional[int] = None
     version_id: Optional[int] = None
-    version_editor: Optional[users.User] = None
+    version_editor = Reference(users.get, "user_id")
     version_datetime: Optional[datetime] = None
     action_id: Optional[int] = None
     schema: Optional[dict] = None
-    data: Optional[dict] = None
+    data: Optional[Mapping[str, Any]] = None
 
     def __init__(self, d: Dict):
         """Initialize a new instrument from dictionary."""
@@ -31,9 +44,13 @@ class Object(SampleDBObject):
         if "utc_datetime" in d:
             self.version_datetime = utils.str2datetime(d['utc_datetime'])
         if "user_id" in d:
-            self.version_editor = users.get(d['user_id'])
+            self.version_editor = d['user_id']
         if "data" in d:
-            self.data = utils.convert_json(d['data'])
+            if get_client().lazy_data:
+                self.data = utils.LazyData(d['data'])
+            else:
+                self.data = utils.convert_json(d['data'], d.get('schema'),
+                                               d.get('action_id'))
 
     def __repr__(self) -> str:
         return f"Object {self.object_id}"
@@ -50,6 +67,9 @@ class Object(SampleDBObject):
     def get_version(self, version_id: int) -> Object:
         """Get the specific version (version_id).
 
+        Versions are served from the on-disk cache if one is configured (see
+        :func:`~sampledbapi.comm.configure_version_cache`).
+
         Args:
             version_id (int): ID of the version to be retrieved.
 
@@ -57,9 +77,18 @@ class Object(SampleDBObject):
             Object: Requested :class:`~sampledbapi.objects.Object`.
         """
         if isinstance(version_id, int):
-            return Object(get_data(
-                f"objects/{self.object_id}/versions/{version_id}"
-            ))
+            path = f"objects/{self.object_id}/versions/{version_id}"
+            cache = get_client().version_cache
+            address = get_client().address
+            if cache is not None and address is not None \
+                    and self.object_id is not None:
+                d = cache.get(address, self.object_id, version_id)
+                if d is None:
+                    d = get_data(path)
+                    cache.put(address, self.object_id, version_id, d)
+            else:
+                d = get_data(path)
+            return Object(d)
         else:
             raise TypeError()
 
@@ -88,15 +117,19 @@ class Object(SampleDBObject):
     def get_related_objects(self):
         """Gets objects related to an object.
 
+        The related objects are fetched concurrently.
+
         Returns:
             Two lists containing referenced objects and referencing objects.
 
         """
         related_objects = get_data(f"objects/{self.object_id}/related_objects")
-        referenced_object_ids = related_objects['referenced_objects']
-        referencing_object_ids = related_objects['referencing_objects']
-        referenced_objects = list(map(get, map(lambda dic: dic['object_id'], referenced_object_ids)))
-        referencing_objects = list(map(get, map(lambda dic: dic['object_id'], referencing_object_ids)))
+        referenced_object_ids = [o['object_id'] for o in related_objects['referenced_objects']]
+        referencing_object_ids = [o['object_id'] for o in related_objects['referencing_objects']]
+        fetched = get_many(referenced_object_ids + referencing_object_ids)
+        fetched.raise_for_errors()
+        referenced_objects = fetched.results[:len(referenced_object_ids)]
+        referencing_objects = fetched.results[len(referenced_object_ids):]
         return referenced_objects, referencing_objects
 
     def get_public(self) -> bool:
@@ -280,13 +313,24 @@ class Object(SampleDBObject):
         else:
             raise TypeError()
 
-    def get_file_list(self) -> List:
+    def get_file_list(self, include_content: bool = True) -> List:
         """Get a list of all files.
 
+        Args:
+            include_content (bool): Keep the base64 encoded content of the
+                files. If False, the list is streamed and the content is
+                dropped while decoding, so it is never held in memory; use
+                :meth:`download_file` to retrieve single files.
+
         Returns:
             List: `See here. <https://scientific-it-systems.iffgit.fz-juelich.de/SampleDB/developer_guide/api.html#files>`__
         """
-        return [File(i) for i in get_data(f"objects/{self.object_id}/files")]
+        if not isinstance(include_content, bool):
+            raise TypeError()
+        if include_content:
+            return [File(i) for i in get_data(f"objects/{self.object_id}/files")]
+        return [File(i) for i in iter_data(f"objects/{self.object_id}/files",
+                                           skip_field="base64_content")]
 
     def get_file(self, file_id: int) -> File:
         """Get a specific file (file_id).
@@ -304,26 +348,105 @@ class Object(SampleDBObject):
         else:
             raise TypeError()
 
-    def upload_file(self, path: str, name: Optional[str] = None) -> int:
+    def download_file(self, file_id: int, dest: Any) -> File:
+        """Download the content of a file to disk.
+
+        The response is decoded and written while it arrives, so the memory
+        needed does not depend on the file size. The content is checked
+        against the sha256 hash stored in SampleDB. If `dest` is a path,
+        the file only appears there once it is complete and verified.
+
+        Args:
+            file_id (int): ID of the file.
+            dest: Path or writable binary file object.
+
+        Returns:
+            File: The :class:`~sampledbapi.objects.File` without content.
+        """
+        if isinstance(file_id, int) and isinstance(dest, (str, IOBase)):
+            chunks = iter_content(f"objects/{self.object_id}/files/{file_id}")
+            return _write_file(dest, lambda out: _decode_file(chunks, out))
+        else:
+            raise TypeError()
+
+    def upload_file(self, path: str, name: Optional[str] = None,
+                    dedupe: Any = False) -> int:
         """Create a new file.
 
+        With `dedupe`, the sha256 hash of the file is computed first and the
+        upload is skipped if the object already has a file with the same
+        content. The ID of that file is returned instead. Pass True to
+        compare with the files of the object on the server, or a
+        :class:`~sampledbapi.cache.HashIndex` to look the hash up in a local
+        index that records all uploads (no request needed).
+
         Args:
             path (str): Path of the file to be uploaded.
+            name (str): Name that the file will have online, defaults to
+                the path.
+            dedupe: False, True or a :class:`~sampledbapi.cache.HashIndex`.
 
         Returns:
             HTTPResponse: `See here. <https://scientific-it-systems.iffgit.fz-juelich.de/SampleDB/developer_guide/api.html#files>`__
         """
-        if isinstance(path, str):
-            with open(path, "rb") as f:
-                f.name
-                i = self.upload_file_raw(f.name if name is None else name, f)
-            return i
+        if isinstance(path, str) and isinstance(dedupe, (bool, HashIndex)):
+            if dedupe is True:
+                return self._upload_file(path, name, self.find_file)[0]
+            if isinstance(dedupe, HashIndex):
+                return self._upload_file(path, name,
+                                         *_index_lookup(dedupe,
+                                                        self.object_id))[0]
+            return self._upload_file(path, name)[0]
         else:
             raise TypeError()
 
+    def _upload_file(self, path: str, name: Optional[str],
+                     find: Optional[Callable[[str], Optional[int]]] = None,
+                     record: Optional[Callable[[str, int], None]] = None
+                     ) -> Tuple[int, bool]:
+        """Upload a file unless `find` knows its hash, return the file ID
+        and whether the upload was skipped."""
+        with open(path, "rb") as f:
+            if find is None:
+                return self.upload_file_raw(f.name if name is None else name,
+                                            f), False
+            sha256 = hashlib.sha256()
+            for chunk in iter(lambda: f.read(2 ** 20), b""):
+                sha256.update(chunk)
+            hexdigest = sha256.hexdigest()
+            file_id = find(hexdigest)
+            if file_id is not None:
+                return file_id, True
+            f.seek(0)
+            file_id = self.upload_file_raw(f.name if name is None else name,
+                                           f)
+        if record is not None:
+            record(hexdigest, file_id)
+        return file_id, False
+
+    def find_file(self, hexdigest: str) -> Optional[int]:
+        """Find a file of this object by the sha256 hash of its content.
+
+        Args:
+            hexdigest (str): sha256 hash as hexadecimal string.
+
+        Returns:
+            int: ID of the file, None if there is none with this content.
+        """
+        if not isinstance(hexdigest, str):
+            raise TypeError()
+        for file in self.get_file_list(include_content=False):
+            if _sha256_hexdigest(file.hash) == hexdigest:
+                return file.file_id
+        return None
+
     def upload_file_raw(self, name: str, file_obj: BinaryIO) -> int:
         """Create a new file with local storage.
 
+        The file is read, hashed and base64-encoded in chunks while the
+        request is sent, so the memory needed does not depend on the file
+        size.
+
         Args:
             name (str): Name that the file will have online.
             file_obj (BinaryIO): A binary stream that can be read to be uploaded.
@@ -332,18 +455,8 @@ class Object(SampleDBObject):
             HTTPResponse: `See here. <https://scientific-it-systems.iffgit.fz-juelich.de/SampleDB/developer_guide/api.html#files>`__
         """
         if isinstance(name, str) and isinstance(file_obj, IOBase):
-            data = file_obj.read()
-            base64encoded = base64.b64encode(data)
-            sha256 = hashlib.sha256()
-            sha256.update(data)
-            response = post_data(f"objects/{self.object_id}/files/",
-                                 {"storage": "database", "original_file_name": name,
-                                  "base64_content": base64encoded.decode(),
-                                  "hash": {
-                                      "algorithm": "sha256",
-                                      "hexdigest": sha256.hexdigest()
-                                  }})
-
+            response = post_stream(f"objects/{self.object_id}/files/",
+                                   _FileUploadBody(name, file_obj))
             return int(response.headers['Location'].rsplit("/files/", 1)[1])
         else:
             raise TypeError()
@@ -403,6 +516,56 @@ class Object(SampleDBObject):
             raise TypeError()
 
 
+class _FileUploadBody:
+    """JSON body of a file upload, generated while it is sent.
+
+    The file is read in chunks that are hashed and base64-encoded in the
+    same pass; the hash is appended after the content. If the file is
+    seekable, its size and thus the length of the body is known in advance
+    (`len`) and the body can be iterated again, e.g. to retry the request.
+    """
+
+    # Multiple of 3, so the base64 encoded chunks can be concatenated
+    chunk_size = 3 * 2 ** 16
+
+    def __init__(self, name: str, file_obj: BinaryIO):
+        self.file_obj = file_obj
+        self.head = ('{"storage": "database", "original_file_name": '
+                     f'{json.dumps(name)}, "base64_content": "').encode()
+        self.start: Optional[int] = None
+        if file_obj.seekable():
+            self.start = file_obj.tell()
+            size = file_obj.seek(0, io.SEEK_END) - self.start
+            file_obj.seek(self.start)
+            self.len = len(self.head) + 4 * ((size + 2) // 3) \
+                + len(self._tail(64 * "0"))
+
+    @staticmethod
+    def _tail(hexdigest: str) -> bytes:
+        return ('", "hash": {"algorithm": "sha256", "hexdigest": '
+                f'"{hexdigest}"}}}}').encode()
+
+    def __iter__(self) -> Iterator[bytes]:
+        if self.start is not None:
+            self.file_obj.seek(self.start)
+        sha256 = hashlib.sha256()
+        yield self.head
+        while True:
+            chunk = self.file_obj.read(self.chunk_size)
+            # Short reads from pipes or sockets must be filled up to a
+            # multiple of 3 bytes, except for the last chunk
+            while chunk and len(chunk) % 3 != 0:
+                more = self.file_obj.read(3 - len(chunk) % 3)
+                if not more:
+                    break
+                chunk += more
+            if not chunk:
+                break
+            sha256.update(chunk)
+            yield base64.b64encode(chunk)
+        yield self._tail(sha256.hexdigest())
+
+
 def get_list(q: str = "", action_id: int = -1, action_type: str = "",
              limit: int = -1, offset: int = -1,
              name_only: bool = False) -> List[Object]:
@@ -421,6 +584,10 @@ def get_list(q: str = "", action_id: int = -1, action_type: str = "",
     reduced to the name property, omitting all other properties and schema
     information.
 
+    If a mirror is configured (see :func:`~sampledbapi.comm.configure_mirror`),
+    queries without search string, action type and name_only are answered
+    from it.
+
     Args:
         q (str): Search string for advanced search, `see here. <https://scientific-it-systems.iffgit.fz-juelich.de/SampleDB/user_guide/search.html#advanced-search>`__
         action_id (int): Filter by action ID.
@@ -435,28 +602,109 @@ def get_list(q: str = "", action_id: int = -1, action_type: str = "",
     if (isinstance(q, str) and isinstance(action_id, int) and
             isinstance(action_type, str) and isinstance(limit, int) and
             isinstance(offset, int) and isinstance(name_only, bool)):
-        pars: Dict[str, Any] = {}
-        if q != "":
-            pars["q"] = q
-        if action_id > 0:
-            pars["action_id"] = action_id
-        if action_type != "":
-            pars["action_type"] = action_type
-        if limit > 0:
-            pars["limit"] = limit
-        if offset > 0:
-            pars["offset"] = offset
-        if name_only:
-            pars["name_only"] = "true"
-
+        mirror = get_client().active_mirror
+        if mirror is not None and q == "" and action_type == "" \
+                and not name_only:
+            return [Object(o) for o in mirror.get_objects(action_id, limit,
+                                                          offset)]
+        pars = _list_params(q, action_id, action_type, limit, offset,
+                            name_only)
         return [Object(o) for o in get_data("objects", pars)]
     else:
         raise TypeError()
 
 
+def iter_list(q: str = "", action_id: int = -1, action_type: str = "",
+              page_size: Optional[int] = 100, name_only: bool = False,
+              prefetch: bool = True) -> Iterator[Object]:
+    """Iterate over all objects visible to the current user page by page.
+
+    Takes the same filters as :func:`get_list`, but walks the result set in
+    pages of `page_size` objects and yields each object as soon as its page
+    has arrived. While the caller processes a page, the next one is fetched
+    in the background, so only about two pages are held in memory at once.
+
+    If `page_size` is None, all objects are requested at once and decoded
+    incrementally while the response is streamed, so only one object is
+    held in memory at a time.
+
+    Args:
+        q (str): Search string for advanced search.
+        action_id (int): Filter by action ID.
+        action_type (str): Filter by action type.
+        page_size (int): Number of objects requested per page, None to
+            stream all objects in a single request.
+        name_only (bool): Only names will be returned, no other information.
+        prefetch (bool): Fetch the next page while the current one is
+            processed.
+
+    Returns:
+        Iterator: Iterator over :class:`~sampledbapi.objects.Object`.
+    """
+    if (isinstance(q, str) and isinstance(action_id, int) and
+            isinstance(action_type, str) and
+            (page_size is None or isinstance(page_size, int)) and
+            isinstance(name_only, bool) and isinstance(prefetch, bool)):
+        if page_size is None:
+            return (Object(o) for o in iter_data("objects", _list_params(
+                q, action_id, action_type, -1, -1, name_only)))
+        if page_size < 1:
+            raise ValueError("page_size has to be positive.")
+        return _iter_pages(q, action_id, action_type, page_size, name_only,
+                           prefetch)
+    else:
+        raise TypeError()
+
+
+def _iter_pages(q: str, action_id: int, action_type: str, page_size: int,
+                name_only: bool, prefetch: bool) -> Iterator[Object]:
+    def fetch(offset: int) -> List[Dict]:
+        return get_data("objects", _list_params(
+            q, action_id, action_type, page_size, offset, name_only))
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        offset = 0
+        # The worker runs in a copy of the current context, so it uses the
+        # same client as the caller.
+        page = executor.submit(contextvars.copy_context().run, fetch, offset)
+        while True:
+            data = page.result()
+            offset += len(data)
+            if len(data) >= page_size and prefetch:
+                page = executor.submit(contextvars.copy_context().run,
+                                       fetch, offset)
+            for o in data:
+                yield Object(o)
+            if len(data) < page_size:
+                break
+            if not prefetch:
+                page = executor.submit(contextvars.copy_context().run,
+                                       fetch, offset)
+
+
+def _list_params(q: str, action_id: int, action_type: str, limit: int,
+                 offset: int, name_only: bool) -> Dict[str, Any]:
+    pars: Dict[str, Any] = {}
+    if q != "":
+        pars["q"] = q
+    if action_id > 0:
+        pars["action_id"] = action_id
+    if action_type != "":
+        pars["action_type"] = action_type
+    if limit > 0:
+        pars["limit"] = limit
+    if offset > 0:
+        pars["offset"] = offset
+    if name_only:
+        pars["name_only"] = "true"
+    return pars
+
+
 def get(object_id: int) -> Object:
     """Get the current version of an object (object_id).
 
+    Objects contained in a configured mirror are read from it.
+
     Args:
         object_id (int): ID of the object.
 
@@ -464,11 +712,128 @@ def get(object_id: int) -> Object:
         Object: Requested :class:`~sampledbapi.objects.Object`.
     """
     if isinstance(object_id, int):
-        return Object(get_data(f"objects/{object_id}"))
+        mirror = get_client().active_mirror
+        d = None if mirror is None else mirror.get_object(object_id)
+        if d is None:
+            d = get_data(f"objects/{object_id}")
+        return Object(d)
     else:
         raise TypeError()
 
 
+def get_many(object_ids: Iterable[int], max_workers: int = 8,
+             deadline: Optional[float] = None) -> BulkResult:
+    """Get several objects concurrently.
+
+    Repeated IDs are only fetched once. A failing request does not abort the
+    others, its error is reported in the result instead.
+
+    Args:
+        object_ids (Iterable[int]): IDs of the objects.
+        max_workers (int): Number of parallel requests.
+        deadline (float): Seconds after which outstanding requests fail.
+
+    Returns:
+        BulkResult: :class:`~sampledbapi.objects.Object` objects in input order
+        and errors by ID, see :class:`~sampledbapi.bulk.BulkResult`.
+    """
+    return bulk.get_many(get, object_ids, max_workers, deadline)
+
+
+def upload_files(items: Iterable[tuple], max_workers: int = 8,
+                 progress: Optional[Callable[[Progress], None]] = None,
+                 deadline: Optional[float] = None,
+                 dedupe: Any = False) -> BulkResult:
+    """Upload many files concurrently.
+
+    Each item is a tuple (object_id, path) or (object_id, path, name) and is
+    uploaded with :meth:`Object.upload_file`. Items are read lazily and the
+    uploads share the connection pool of the current client, so
+    `max_workers` should not exceed its size (see
+    :func:`~sampledbapi.comm.configure_session`). A failed upload does not
+    stop the others.
+
+    With `dedupe`, files whose content the object already has are not
+    uploaded again (see :meth:`Object.upload_file`); their indices are
+    listed in :attr:`~sampledbapi.bulk.BulkResult.skipped` and their result
+    is the ID of the existing file. With `dedupe=True` the file list of
+    each object is only retrieved once.
+
+    .. code-block::
+
+        result = objects.upload_files(
+            [(1, "scan_001.h5"), (1, "scan_002.h5", "Scan 2")],
+            progress=lambda p: print(p))
+        result.raise_for_errors()
+
+    Args:
+        items (Iterable[tuple]): Object ID, path and optional file name.
+        max_workers (int): Number of parallel uploads.
+        progress (Callable): Called with a :class:`~sampledbapi.bulk.Progress`
+            (files done, bytes uploaded, throughput) after each file; skipped
+            files are counted in `skipped_bytes` instead of `bytes`.
+        deadline (float): Seconds after which outstanding uploads fail.
+        dedupe: False, True or a :class:`~sampledbapi.cache.HashIndex`.
+
+    Returns:
+        BulkResult: File IDs in input order and errors by index, see
+        :class:`~sampledbapi.bulk.BulkResult`.
+    """
+    if not isinstance(dedupe, (bool, HashIndex)):
+        raise TypeError()
+    known: Dict[int, Dict[str, int]] = {}
+    locks: Dict[int, threading.Lock] = {}
+    lock = threading.Lock()
+
+    def remote_hashes(object_id: int) -> Dict[str, int]:
+        # The file list of each object is only retrieved once, the global
+        # lock only guards the per-object locks, so uploads to other objects
+        # do not wait for the request
+        with lock:
+            object_lock = locks.setdefault(object_id, threading.Lock())
+        with object_lock:
+            if object_id not in known:
+                files = Object({"object_id": object_id}).get_file_list(
+                    include_content=False)
+                hashes = known[object_id] = {}
+                for f in files:
+                    hexdigest = _sha256_hexdigest(f.hash)
+                    if hexdigest is not None and f.file_id is not None:
+                        hashes[hexdigest] = f.file_id
+            return known[object_id]
+
+    def upload(item: tuple) -> Tuple[int, bool]:
+        if not isinstance(item, tuple) or len(item) not in (2, 3) \
+                or not isinstance(item[0], int):
+            raise TypeError()
+        obj = Object({"object_id": item[0]})
+        name = item[2] if len(item) == 3 else None
+        if isinstance(dedupe, HashIndex):
+            return obj._upload_file(item[1], name,
+                                    *_index_lookup(dedupe, item[0]))
+        if dedupe:
+            hashes = remote_hashes(item[0])
+            return obj._upload_file(item[1], name, hashes.get,
+                                    hashes.__setitem__)
+        return obj._upload_file(item[1], name)
+
+    result = bulk.run(upload, items, max_workers, progress=progress,
+                      size=lambda item: os.path.getsize(item[1]),
+                      deadline=deadline, skip=lambda r: r[1])
+    skipped: List[Hashable] = [i for i, r in enumerate(result.results)
+                               if r is not None and r[1]]
+    return BulkResult([None if r is None else r[0] for r in result.results],
+                      result.errors, skipped)
+
+
+def _index_lookup(index: HashIndex, object_id: Any) -> Tuple[
+        Callable[[str], Optional[int]], Callable[[str, int], None]]:
+    address = get_client().address or ""
+    return (lambda hexdigest: index.get(address, object_id, hexdigest),
+            lambda hexdigest, file_id: index.put(address, object_id,
+                                                 hexdigest, file_id))
+
+
 def create(action_id: int, data: dict) -> int:
     """Create a new object.
 
@@ -493,6 +858,103 @@ def create(action_id: int, data: dict) -> int:
         raise TypeError()
 
 
+def create_many(action_id: int, data: Iterable[dict], max_workers: int = 8,
+                window: Optional[int] = None, journal: Optional[str] = None,
+                progress: Optional[Callable[[Progress], None]] = None,
+                deadline: Optional[float] = None) -> BulkResult:
+    """Create many objects concurrently.
+
+    The data is consumed lazily and at most `window` creations are in
+    flight at the same time, so large imports need little memory. A failed
+    creation does not stop the others.
+
+    If a `journal` file is given, every created object is recorded in it
+    right away. Running the same import again with the same journal skips
+    all entries that were already created, so a crashed import can be
+    continued without creating duplicates. Entries are identified by their
+    position and checked against a hash of their data, so the input must be
+    the same as before. Objects whose creation was interrupted before the
+    server answered cannot be detected.
+
+    .. code-block::
+
+        result = objects.create_many(3, rows, journal="import.journal")
+        result.raise_for_errors()
+
+    Args:
+        action_id (int): ID of the action of all objects.
+        data (Iterable[dict]): Data of the objects, see :func:`create`.
+        max_workers (int): Number of parallel requests.
+        window (int): Maximum number of creations in flight.
+        journal (str): Path of the journal file.
+        progress (Callable): Called with a :class:`~sampledbapi.bulk.Progress`
+            after each finished entry.
+        deadline (float): Seconds after which outstanding requests fail.
+
+    Returns:
+        BulkResult: Object IDs in input order and errors by index; entries
+        created by an earlier run are listed in `skipped`.
+    """
+    if not isinstance(action_id, int) or \
+            not (journal is None or isinstance(journal, str)):
+        raise TypeError()
+    done = {} if journal is None else _read_journal(journal)
+    lock = threading.Lock()
+    log = None
+    if journal is not None:
+        log = open(journal, "a+")
+        log.seek(0, io.SEEK_END)
+        if log.tell() > 0:
+            log.seek(log.tell() - 1)
+            if log.read(1) != "\n":
+                # Terminate the incomplete last line of a crashed run
+                log.write("\n")
+
+    def create_entry(item: Tuple[int, dict]) -> Tuple[int, bool]:
+        index, d = item
+        digest = hashlib.sha256(
+            json.dumps(d, sort_keys=True).encode()).hexdigest()
+        if index in done:
+            object_id, recorded = done[index]
+            if recorded != digest:
+                raise Exception(f"Entry {index} differs from the entry in "
+                                "the journal.")
+            return object_id, True
+        object_id = create(action_id, d)
+        if log is not None:
+            with lock:
+                log.write(json.dumps({"index": index, "object_id": object_id,
+                                      "sha256": digest}) + "\n")
+                log.flush()
+        return object_id, False
+
+    try:
+        result = bulk.run(create_entry, enumerate(data), max_workers, window,
+                          progress=progress, deadline=deadline)
+    finally:
+        if log is not None:
+            log.close()
+    skipped: List[Hashable] = [i for i, r in enumerate(result.results)
+                               if r is not None and r[1]]
+    return BulkResult([None if r is None else r[0] for r in result.results],
+                      result.errors, skipped)
+
+
+def _read_journal(path: str) -> Dict[int, Tuple[int, str]]:
+    done: Dict[int, Tuple[int, str]] = {}
+    if not os.path.exists(path):
+        return done
+    with open(path) as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # Incomplete last line of a crashed run
+                continue
+            done[entry["index"]] = (entry["object_id"], entry["sha256"])
+    return done
+
+
 class File(SampleDBObject):
 
     object_id: Optional[int] = None
@@ -507,25 +969,112 @@ class File(SampleDBObject):
         return f"File {self.file_id}, " \
             + f"Name {self.original_file_name}"
 
+    def save(self, path: str):
+        """Write the content of the file to `path`.
+
+        If the content has not been retrieved (see
+        :meth:`Object.get_file_list`), it is downloaded via
+        :meth:`Object.download_file`. Otherwise it is decoded in chunks.
+        In both cases the sha256 hash is verified.
+
+        Args:
+            path (str): Destination path.
+        """
+        if not isinstance(path, str):
+            raise TypeError()
+        if self.base64_content is None:
+            if self.object_id is None or self.file_id is None:
+                raise Exception("The file has no content.")
+            Object({"object_id": self.object_id}).download_file(self.file_id,
+                                                                path)
+            return
+        content = self.base64_content
+
+        def decode(out: BinaryIO) -> File:
+            sink = _Base64Sink(out)
+            # Decode in slices so no full copy of the content is needed
+            for i in range(0, len(content), 4 * 2 ** 16):
+                sink.write(content[i:i + 4 * 2 ** 16])
+            sink.close(_sha256_hexdigest(self.hash))
+            return self
+
+        _write_file(path, decode)
+
+
+class _Base64Sink:
+    """Decode base64 text written in pieces and write the bytes to a file,
+    computing their sha256 hash on the way."""
+
+    def __init__(self, out: BinaryIO):
+        self.out = out
+        self.sha256 = hashlib.sha256()
+        self.pending = ""
+
+    def write(self, piece: str):
+        self.pending += piece
+        n = len(self.pending) - len(self.pending) % 4
+        if n > 0:
+            data = base64.b64decode(self.pending[:n])
+            self.pending = self.pending[n:]
+            self.sha256.update(data)
+            self.out.write(data)
+
+    def close(self, hexdigest: Optional[str]):
+        """Finish decoding and compare the hash with `hexdigest`."""
+        if self.pending:
+            raise Exception("Invalid base64 content.")
+        if hexdigest is not None and hexdigest != self.sha256.hexdigest():
+            raise Exception("The sha256 hash of the file does not match.")
+
+
+def _sha256_hexdigest(file_hash: Any) -> Optional[str]:
+    # The API returns {"algorithm": "sha256", "hexdigest": ...}
+    if isinstance(file_hash, dict):
+        if file_hash.get("algorithm") == "sha256":
+            return file_hash.get("hexdigest")
+        return None
+    return file_hash
+
+
+def _decode_file(chunks: Iterable[bytes], out: BinaryIO) -> File:
+    sink = _Base64Sink(out)
+    fields, found = read_json_object(chunks, "base64_content", sink.write)
+    if not found:
+        raise Exception(f"File {fields.get('file_id')} has no content "
+                        f"(storage {fields.get('storage')}).")
+    sink.close(_sha256_hexdigest(fields.get("hash")))
+    return File(fields)
+
+
+def _write_file(dest: Any, write: Callable[[BinaryIO], File]) -> File:
+    """Call `write` with a binary file; paths are written atomically."""
+    if not isinstance(dest, str):
+        return write(dest)
+    directory = os.path.dirname(os.path.abspath(dest))
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            file = write(f)
+        os.replace(tmp, dest)
+        return file
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp)
+        raise
+
 
 class LocationOccurence(SampleDBObject):
 
     object_id: Optional[int] = None
-    location: Optional[locations.Location] = None
-    responsible_user: Optional[users.User] = None
-    user: Optional[users.User] = None
+    location = Reference(locations.get, "location_id")
+    responsible_user = Reference(users.get, "user_id")
+    user = Reference(users.get, "user_id")
     description: Optional[str] = None
     utc_datetime: Optional[datetime] = None
 
     def __init__(self, d: Dict):
         """Initialize a new instrument from dictionary."""
         super().__init__(d)
-        if "location" in d:
-            self.location = locations.get(d["location"])
-        if "responsible_user" in d:
-            self.responsible_user = users.get(d["responsible_user"])
-        if "user" in d:
-            self.user = users.get(d["user"])
         if "utc_datetime" in d:
             self.utc_datetime = datetime.strptime(
                 d["utc_datetime"], '%Y-%m-%dT%H:%M:%S.%f')
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Mapping, Optional
+
+from . import bulk
+from .objects import Object
+
+__all__ = ["PermissionChange", "PermissionSyncReport", "sync_permissions"]
+
+_KINDS = ("users", "groups", "projects")
+# Methods of Object reading all and setting one permission of each kind
+_METHODS = {
+    "users": ("get_all_user_permissions", "set_user_permissions"),
+    "groups": ("get_all_group_permissions", "set_group_permissions"),
+    "projects": ("get_all_project_group_permissions",
+                 "set_project_group_permissions"),
+}
+_LEVELS = ("none", "read", "write", "grant")
+
+
+class PermissionChange:
+    """A permission of an object that differs from the target state.
+
+    `kind` is "users", "groups", "projects" or "public"; for "public",
+    `principal_id` is None and the permissions are booleans.
+    """
+
+    def __init__(self, object_id: int, kind: str, principal_id: Optional[int],
+                 current: Any, target: Any):
+        self.object_id = object_id
+        self.kind = kind
+        self.principal_id = principal_id
+        self.current = current
+        self.target = target
+
+    def __repr__(self) -> str:
+        principal = "" if self.principal_id is None \
+            else f" {self.principal_id}"
+        return f"PermissionChange (object {self.object_id}, " \
+            + f"{self.kind}{principal}: {self.current} -> {self.target})"
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, PermissionChange) \
+            and vars(self) == vars(other)
+
+    def __hash__(self) -> int:
+        return hash((self.object_id, self.kind, self.principal_id,
+                     self.current, self.target))
+
+    def apply(self):
+        """Set the permission to the target state."""
+        obj = Object({"object_id": self.object_id})
+        if self.kind == "public":
+            obj.set_public(self.target)
+        else:
+            getattr(obj, _METHODS[self.kind][1])(self.principal_id,
+                                                 self.target)
+
+
+class PermissionSyncReport:
+    """Result of :func:`sync_permissions`.
+
+    Attributes:
+        changes: All permissions that differed from the target state.
+        read_errors: Exceptions of failed reads by object ID.
+        write_errors: Exceptions of failed changes by change.
+        dry_run: Whether the changes were only computed, not applied.
+    """
+
+    def __init__(self, changes: List[PermissionChange],
+                 read_errors: Dict[int, Exception],
+                 write_errors: Dict[PermissionChange, Exception],
+                 dry_run: bool):
+        self.changes = changes
+        self.read_errors = read_errors
+        self.write_errors = write_errors
+        self.dry_run = dry_run
+
+    def __repr__(self) -> str:
+        action = "planned" if self.dry_run else "applied"
+        errors = len(self.read_errors) + len(self.write_errors)
+        return f"PermissionSyncReport ({len(self.changes)} changes " \
+            + f"{action}, {errors} errors)"
+
+    @property
+    def ok(self) -> bool:
+        """Whether all reads and changes succeeded."""
+        return not self.read_errors and not self.write_errors
+
+    def raise_for_errors(self):
+        """Raise the first error, reads first, if any."""
+        for error in self.read_errors.values():
+            raise error
+        for error in self.write_errors.values():
+            raise error
+
+
+def sync_permissions(targets: Mapping[int, Mapping[str, Any]],
+                     exact: bool = False, dry_run: bool = False,
+                     max_workers: int = 8,
+                     deadline: Optional[float] = None) -> PermissionSyncReport:
+    """Bring the permissions of many objects into a target state.
+
+    The current permissions of all objects are read concurrently, compared
+    with the target and only the differing permissions are changed (again
+    concurrently). With `dry_run`, the changes are only reported.
+
+    The target of an object maps "users", "groups" and "projects" to
+    mappings of IDs to permissions ("none", "read", "write" or "grant"),
+    and "public" to a bool. Only the given kinds are read and changed.
+
+    .. code-block::
+
+        target = {"projects": {4: "write"}, "public": False}
+        report = sync_permissions({i: target for i in object_ids},
+                                  dry_run=True)
+        print(report.changes)
+
+    Args:
+        targets (Mapping): Target state by object ID.
+        exact (bool): Also remove (set to "none") the permissions of users,
+            groups and projects of a given kind that are not in the target.
+        dry_run (bool): Only compute the changes.
+        max_workers (int): Number of parallel requests.
+        deadline (float): Seconds after which outstanding requests fail.
+
+    Returns:
+        PermissionSyncReport: The changes and errors.
+    """
+    if not isinstance(exact, bool) or not isinstance(dry_run, bool):
+        raise TypeError()
+    for object_id, target in targets.items():
+        _check_target(object_id, target)
+
+    def read(object_id: int) -> List[PermissionChange]:
+        target = targets[object_id]
+        obj = Object({"object_id": object_id})
+        changes = []
+        for kind in _KINDS:
+            if kind in target:
+                current = getattr(obj, _METHODS[kind][0])()
+                changes += _diff(object_id, kind, current, target[kind],
+                                 exact)
+        if "public" in target:
+            public = obj.get_public()
+            if public != target["public"]:
+                changes.append(PermissionChange(object_id, "public", None,
+                                                public, target["public"]))
+        return changes
+
+    state = bulk.run(read, list(targets), max_workers,
+                     key=lambda index, object_id: object_id,
+                     deadline=deadline)
+    changes = [c for object_changes in state if object_changes is not None
+               for c in object_changes]
+    read_errors = {object_id: state.errors[object_id] for object_id in targets
+                   if object_id in state.errors}
+    write_errors: Dict[PermissionChange, Exception] = {}
+    if not dry_run:
+        applied = bulk.run(PermissionChange.apply, changes, max_workers,
+                           deadline=deadline)
+        write_errors = {change: applied.errors[index]
+                        for index, change in enumerate(changes)
+                        if index in applied.errors}
+    return PermissionSyncReport(changes, read_errors, write_errors, dry_run)
+
+
+def _check_target(object_id: Any, target: Mapping[str, Any]):
+    if not isinstance(object_id, int) or not isinstance(target, Mapping):
+        raise TypeError()
+    for kind, value in target.items():
+        if kind == "public":
+            if not isinstance(value, bool):
+                raise TypeError()
+        elif kind in _KINDS:
+            for principal_id, permissions in value.items():
+                if not isinstance(principal_id, int) or \
+                        not isinstance(permissions, str):
+                    raise TypeError()
+                if permissions not in _LEVELS:
+                    raise ValueError(f"Unknown permissions {permissions}.")
+        else:
+            raise ValueError(f"Unknown permission kind {kind}.")
+
+
+def _diff(object_id: int, kind: str, current: Mapping[str, str],
+          target: Mapping[int, str], exact: bool) -> List[PermissionChange]:
+    # The API returns the IDs as strings
+    current_ids = {int(k): v for k, v in current.items()}
+    changes = []
+    for principal_id, permissions in target.items():
+        old = current_ids.get(principal_id, "none")
+        if old != permissions:
+            changes.append(PermissionChange(object_id, kind, principal_id,
+                                            old, permissions))
+    if exact:
+        for principal_id, old in current_ids.items():
+            if principal_id not in target and old != "none":
+                changes.append(PermissionChange(object_id, kind,
+                                                principal_id, old, "none"))
+    return changes
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import email.utils
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Iterable, Iterator, Mapping, Optional
+
+__all__ = ["RetryPolicy", "RateLimiter", "DeadlineExceeded", "deadline",
+           "get_remaining_time"]
+
+
+class DeadlineExceeded(Exception):
+    """Raised when an operation did not finish before its deadline."""
+
+
+class RetryPolicy:
+    """When and how often failed requests are repeated.
+
+    Requests are retried on connection errors, timeouts and the given status
+    codes, with exponential backoff (``backoff_factor * 2 ** (attempt - 1)``
+    seconds, at most `max_backoff`) and full jitter. A `Retry-After` header
+    sent with the response takes precedence over the backoff, but is capped
+    at `max_backoff` and the time left until the current deadline. By default
+    only idempotent methods are retried, so objects or files are never
+    created twice.
+
+    Arguments:
+        max_attempts: Maximum number of attempts per request, 1 disables
+            retries.
+        backoff_factor: Base delay in seconds.
+        max_backoff: Maximum delay in seconds between two attempts.
+        jitter: Randomize delays so parallel clients do not retry in lockstep.
+        statuses: HTTP status codes that are retried.
+        methods: HTTP methods that are retried.
+        respect_retry_after: Wait as long as the server asks to via
+            `Retry-After`.
+    """
+
+    def __init__(self, max_attempts: int = 3, backoff_factor: float = 0.5,
+                 max_backoff: float = 30.0, jitter: bool = True,
+                 statuses: Iterable[int] = (429, 502, 503, 504),
+                 methods: Iterable[str] = ("GET", "HEAD", "OPTIONS", "PUT",
+                                           "DELETE"),
+                 respect_retry_after: bool = True):
+        if not isinstance(max_attempts, int) or max_attempts < 1:
+            raise ValueError("max_attempts has to be a positive integer.")
+        self.max_attempts = max_attempts
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.statuses = frozenset(statuses)
+        self.methods = frozenset(m.upper() for m in methods)
+        self.respect_retry_after = respect_retry_after
+
+    def __repr__(self) -> str:
+        return f"RetryPolicy (max. {self.max_attempts} attempts)"
+
+    def should_retry(self, method: str, attempt: int,
+                     status_code: Optional[int] = None) -> bool:
+        """Whether a request should be repeated.
+
+        Arguments:
+            method: HTTP method of the request.
+            attempt: Number of attempts made so far.
+            status_code: Status code of the response, None if the request
+                failed without a response.
+        """
+        if attempt >= self.max_attempts or method.upper() not in self.methods:
+            return False
+        return status_code is None or status_code in self.statuses
+
+    def get_delay(self, attempt: int,
+                  headers: Optional[Mapping[str, str]] = None) -> float:
+        """Seconds to wait before the next attempt.
+
+        Arguments:
+            attempt: Number of attempts made so far.
+            headers: Headers of the failed response, if any.
+        """
+        if self.respect_retry_after and headers is not None:
+            retry_after = parse_retry_after(headers.get("Retry-After"))
+            if retry_after is not None:
+                delay = min(retry_after, self.max_backoff)
+                remaining = get_remaining_time()
+                if remaining is not None:
+                    delay = min(delay, max(0.0, remaining))
+                return delay
+        delay = min(self.max_backoff,
+                    self.backoff_factor * 2 ** (attempt - 1))
+        return random.uniform(0, delay) if self.jitter else delay
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a `Retry-After` header (seconds or HTTP date) into seconds."""
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return max(0.0, (date - datetime.now(timezone.utc)).total_seconds())
+
+
+class RateLimiter:
+    """Token bucket limiting the request rate of a client.
+
+    The bucket holds up to `burst` tokens and is refilled with `rate` tokens
+    per second. Every request takes one token and waits if none is left.
+    The limiter is thread-safe and shared by all requests of a client.
+
+    Arguments:
+        rate: Sustained number of requests per second.
+        burst: Maximum number of requests sent at once after a pause.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate and burst have to be positive.")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"RateLimiter ({self.rate}/s, burst {self.burst})"
+
+    def reserve(self, max_wait: Optional[float] = None) -> float:
+        """Take a token and return the seconds to wait before using it.
+
+        Arguments:
+            max_wait: Raise :class:`DeadlineExceeded` instead of reserving a
+                token if the wait would be longer.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(float(self.burst), self._tokens +
+                               (now - self._updated) * self.rate)
+            self._updated = now
+            wait = max(0.0, (1.0 - self._tokens) / self.rate)
+            if max_wait is not None and wait > max_wait:
+                raise DeadlineExceeded("Rate limit exceeds the deadline.")
+            self._tokens -= 1.0
+            return wait
+
+    def acquire(self, max_wait: Optional[float] = None):
+        """Wait until a request may be sent."""
+        wait = self.reserve(max_wait)
+        if wait > 0:
+            time.sleep(wait)
+
+
+_deadline: contextvars.ContextVar[Optional[float]] = \
+    contextvars.ContextVar("sampledbapi_deadline", default=None)
+
+
+@contextlib.contextmanager
+def deadline(seconds: float) -> Iterator[None]:
+    """Limit the total time of all requests within a `with` block.
+
+    Requests (including retries and waits for the rate limiter) started
+    after the deadline, or which would end after it, raise
+    :class:`DeadlineExceeded`. Nested deadlines can only shorten the
+    time. Bulk operations started within the block pass the deadline on to
+    their workers.
+
+    .. code-block::
+
+        with deadline(600):
+            objs = objects.get_many(ids)
+
+    Arguments:
+        seconds: Time limit in seconds.
+    """
+    end = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(end if current is None else min(current, end))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def get_remaining_time() -> Optional[float]:
+    """Seconds left until the current deadline, None without deadline."""
+    end = _deadline.get()
+    return None if end is None else end - time.monotonic()
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import codecs
+import json
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+__all__ = ["iter_json_array", "read_json_object"]
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+
+class _Buffer:
+    """Text buffer filled from an iterable of UTF-8 encoded chunks."""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self, min_length: int = 1) -> bool:
+        """Read chunks until at least `min_length` characters are buffered
+        after the current position, return False if the data ended before."""
+        if self.pos > 0:
+            self.text = self.text[self.pos:]
+            self.pos = 0
+        while len(self.text) < min_length and not self.eof:
+            try:
+                chunk = next(self._chunks)
+            except StopIteration:
+                self.text += self._decoder.decode(b"", final=True)
+                self.eof = True
+            else:
+                self.text += self._decoder.decode(chunk)
+        return len(self.text) >= min_length
+
+    def skip_whitespace(self) -> str:
+        """Skip whitespace and return the next character ("" at the end)."""
+        while True:
+            while self.pos < len(self.text) and \
+                    self.text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                return ""
+
+
+def iter_json_array(chunks: Iterable[bytes],
+                    skip_field: Optional[str] = None) -> Iterator[Any]:
+    """Decode a JSON array incrementally and yield its elements.
+
+    Only the element currently being decoded and one chunk of the input are
+    held in memory, so the memory needed stays roughly constant regardless
+    of the length of the array.
+
+    Args:
+        chunks (Iterable[bytes]): UTF-8 encoded JSON text, e.g.
+            `Response.iter_content()`.
+        skip_field (str): Name of a string field of the elements (e.g.
+            "base64_content") that is skipped while decoding instead of
+            being held in memory.
+
+    Returns:
+        Iterator: The decoded elements of the array.
+    """
+    buf = _Buffer(chunks)
+    if buf.skip_whitespace() != "[":
+        raise Exception("JSON could not be parsed: expected an array")
+    buf.pos += 1
+    first = True
+    while True:
+        char = buf.skip_whitespace()
+        if char == "]":
+            buf.pos += 1
+            break
+        if not first:
+            if char != ",":
+                raise Exception("JSON could not be parsed: expected ',' or "
+                                f"']' but found {char!r}")
+            buf.pos += 1
+            char = buf.skip_whitespace()
+        first = False
+        if skip_field is not None and char == "{":
+            yield _decode_object(buf, skip_field, None)[0]
+        else:
+            yield _decode_value(buf)
+    if buf.skip_whitespace() != "":
+        raise Exception("JSON could not be parsed: extra data after array")
+
+
+def read_json_object(chunks: Iterable[bytes], stream_field: str,
+                     sink: Callable[[str], None]) -> Tuple[Dict, bool]:
+    """Decode a JSON object incrementally, streaming one string field.
+
+    The content of the string field `stream_field` is passed to `sink` in
+    pieces while it is decoded instead of being stored, so even very large
+    strings (like base64 encoded files) are never held in memory at once.
+
+    Args:
+        chunks (Iterable[bytes]): UTF-8 encoded JSON text.
+        stream_field (str): Name of the string field to stream.
+        sink (Callable): Called with each decoded piece of the field.
+
+    Returns:
+        Tuple: The other fields of the object and whether the streamed
+        field was present as string.
+    """
+    buf = _Buffer(chunks)
+    if buf.skip_whitespace() != "{":
+        raise Exception("JSON could not be parsed: expected an object")
+    result = _decode_object(buf, stream_field, sink)
+    if buf.skip_whitespace() != "":
+        raise Exception("JSON could not be parsed: extra data after object")
+    return result
+
+
+def _decode_value(buf: _Buffer) -> Any:
+    while True:
+        available = len(buf.text) - buf.pos
+        try:
+            value, end = _decoder.raw_decode(buf.text, buf.pos)
+        except json.JSONDecodeError as e:
+            if buf.eof:
+                raise Exception("JSON could not be parsed: " + str(e))
+            # Wait until the buffer has doubled before decoding again,
+            # so large elements are not re-parsed for every chunk.
+            buf.fill(2 * available)
+            continue
+        if end == len(buf.text) and not buf.eof:
+            # A number at the end of the buffer might be incomplete
+            buf.fill(available + 1)
+            continue
+        buf.pos = end
+        return value
+
+
+def _decode_object(buf: _Buffer, field: str,
+                   sink: Optional[Callable[[str], None]]) -> Tuple[Dict, bool]:
+    """Decode the object at the current position, passing the content of
+    the string `field` to `sink` (or dropping it) instead of storing it."""
+    buf.pos += 1
+    result: Dict[str, Any] = {}
+    found = False
+    first = True
+    while True:
+        char = buf.skip_whitespace()
+        if char == "}":
+            buf.pos += 1
+            return result, found
+        if not first:
+            if char != ",":
+                raise Exception("JSON could not be parsed: expected ',' or "
+                                f"'}}' but found {char!r}")
+            buf.pos += 1
+            char = buf.skip_whitespace()
+        first = False
+        if char != '"':
+            raise Exception("JSON could not be parsed: expected a key")
+        pieces: List[str] = []
+        _read_string(buf, pieces.append)
+        key = "".join(pieces)
+        if buf.skip_whitespace() != ":":
+            raise Exception("JSON could not be parsed: expected ':'")
+        buf.pos += 1
+        if key == field and buf.skip_whitespace() == '"':
+            _read_string(buf, sink)
+            found = True
+        else:
+            buf.skip_whitespace()
+            result[key] = _decode_value(buf)
+
+
+def _read_string(buf: _Buffer, sink: Optional[Callable[[str], None]]):
+    """Read the string starting at the current position and pass its
+    decoded content to `sink` in pieces."""
+    buf.pos += 1
+    while True:
+        text = buf.text
+        quote = text.find('"', buf.pos)
+        backslash = text.find("\\", buf.pos, None if quote == -1 else quote)
+        end = quote if backslash == -1 else backslash
+        if end == -1:
+            if sink is not None and buf.pos < len(text):
+                sink(text[buf.pos:])
+            buf.pos = len(text)
+            if not buf.fill():
+                raise Exception("JSON could not be parsed: unterminated "
+                                "string")
+            continue
+        if sink is not None and end > buf.pos:
+            sink(text[buf.pos:end])
+        buf.pos = end
+        if end == quote:
+            buf.pos += 1
+            return
+        # Escape sequence, \uXXXX might be followed by a low surrogate
+        buf.fill(6)
+        length = 2
+        if buf.text[buf.pos + 1:buf.pos + 2] == "u":
+            length = 6
+            if buf.text[buf.pos + 2:buf.pos + 4].lower() in ("d8", "d9",
+                                                             "da", "db"):
+                buf.fill(12)
+                if buf.text[buf.pos + 6:buf.pos + 8] == "\\u":
+                    length = 12
+        try:
+            piece = json.loads('"' + buf.text[buf.pos:buf.pos + length] + '"')
+        except ValueError as e:
+            raise Exception("JSON could not be parsed: " + str(e))
+        if sink is not None:
+            sink(piece)
+        buf.pos += length
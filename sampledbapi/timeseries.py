@@ -0,0 +1,176 @@
+"""Vectorized conversion between time series and NumPy arrays.
+
+Time series (see :class:`~sampledbapi.utils.TimeSeries`) hold one row per
+point with the UTC timestamp, the magnitude in the time series' units and,
+optionally, the magnitude in base units. This module decodes them into
+NumPy arrays and encodes arrays or pandas objects back into time series
+JSON without converting the points one by one in Python.
+
+Requires the optional dependency `numpy`
+(``pip install sampledbapi[timeseries]``).
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Union
+
+from .utils import TimeSeries
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore
+
+__all__ = ["TimeSeriesArrays", "to_arrays", "from_arrays", "from_frame"]
+
+
+class TimeSeriesArrays:
+    """Points of a time series as NumPy arrays.
+
+    Attributes:
+        times: UTC timestamps (`datetime64[us]`).
+        values: Magnitudes in `units` (`float64`).
+        values_in_base_units: Magnitudes in base units (`float64`), or None
+            if the time series does not contain them.
+        units: Units of `values`.
+    """
+
+    def __init__(self, times: Any, values: Any,
+                 values_in_base_units: Any = None, units: str = "1"):
+        self.times = times
+        self.values = values
+        self.values_in_base_units = values_in_base_units
+        self.units = units
+
+    def __repr__(self) -> str:
+        return f"TimeSeriesArrays ({len(self)} points, {self.units})"
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def to_json(self) -> Dict:
+        """Encode the arrays as time series JSON, see :func:`from_arrays`."""
+        return from_arrays(self.times, self.values, self.units,
+                           self.values_in_base_units)
+
+
+def to_arrays(timeseries: Union[TimeSeries, Dict]) -> TimeSeriesArrays:
+    """Decode a time series into NumPy arrays.
+
+    The data may be a list of rows, as returned by the API, or CSV text with
+    one row per line and quoted timestamps.
+
+    Args:
+        timeseries (TimeSeries or dict): The time series, e.g. a value of
+            `Object.data`, or its JSON.
+
+    Returns:
+        TimeSeriesArrays: Timestamps, values and units.
+    """
+    _require_numpy()
+    if isinstance(timeseries, TimeSeries):
+        data, units = timeseries.data, timeseries.units
+    elif isinstance(timeseries, dict):
+        data, units = timeseries.get("data"), timeseries.get("units")
+    else:
+        raise TypeError()
+    if isinstance(data, str):
+        text = data.replace("\r", "").strip()
+        columns = text.split("\n", 1)[0].count(",") + 1 if text else 2
+        # One flat list of all fields, the columns are every n-th field
+        fields = text.replace('"', "").replace("\n", ",").split(",") \
+            if text else []
+        if len(fields) != columns * (text.count("\n") + 1 if text else 0):
+            raise ValueError("The rows of the time series differ in length.")
+        times = np.array(fields[0::columns], dtype="datetime64[us]")
+        columns_data = [np.array(fields[i::columns], dtype=np.float64)
+                        for i in range(1, columns)]
+    elif isinstance(data, list):
+        columns = len(data[0]) if data else 2
+        if any(len(row) != columns for row in data):
+            raise ValueError("The rows of the time series differ in length.")
+        times = np.array([row[0] for row in data], dtype="datetime64[us]")
+        columns_data = [np.array([row[i] for row in data], dtype=np.float64)
+                        for i in range(1, columns)]
+    else:
+        raise TypeError()
+    if columns not in (2, 3):
+        raise ValueError("Time series rows have 2 or 3 columns.")
+    return TimeSeriesArrays(
+        times, columns_data[0],
+        columns_data[1] if columns == 3 else None,
+        "1" if units is None else str(units))
+
+
+def from_arrays(times: Any, values: Any, units: str = "1",
+                values_in_base_units: Any = None) -> Dict:
+    """Encode arrays as time series JSON.
+
+    .. code-block::
+
+        data = {"temperature": from_arrays(times, values, "degC")}
+        objects.create(action_id, data)
+
+    Args:
+        times (array-like): UTC timestamps, anything NumPy converts to
+            `datetime64`.
+        values (array-like): Magnitudes in `units`.
+        units (str): Units of the values.
+        values_in_base_units (array-like): Magnitudes in base units, if
+            known.
+
+    Returns:
+        dict: Time series JSON (`"_type": "timeseries"`).
+    """
+    _require_numpy()
+    if not isinstance(units, str):
+        raise TypeError()
+    times = np.asarray(times, dtype="datetime64[us]")
+    columns = [np.asarray(values, dtype=np.float64)]
+    if values_in_base_units is not None:
+        columns.append(np.asarray(values_in_base_units, dtype=np.float64))
+    if times.ndim != 1 or any(c.shape != times.shape for c in columns):
+        raise ValueError("times and values have to be 1-dimensional arrays "
+                         "of the same length.")
+    # datetime_as_string separates date and time with "T"
+    stamps = [s.replace("T", " ") for s in
+              np.datetime_as_string(times, unit="us").tolist()]
+    # Rows are tuples (serialized as JSON arrays as well), creating a list
+    # for each row takes several times longer
+    rows = list(zip(stamps, *(c.tolist() for c in columns)))
+    return {"_type": "timeseries", "units": units, "data": rows}
+
+
+def from_frame(frame: Any, units: str = "1", column: Any = None,
+               base_units_column: Any = None) -> Dict:
+    """Encode a pandas DataFrame or Series as time series JSON.
+
+    The index has to be a DatetimeIndex; timezone-aware indices are
+    converted to UTC.
+
+    Args:
+        frame (DataFrame or Series): The time series.
+        units (str): Units of the values.
+        column: Column with the values, by default the first one (ignored
+            for a Series).
+        base_units_column: Column with the values in base units, if any.
+
+    Returns:
+        dict: Time series JSON (`"_type": "timeseries"`).
+    """
+    index = frame.index
+    if getattr(index, "tz", None) is not None:
+        index = index.tz_convert("UTC").tz_localize(None)
+    if hasattr(frame, "columns"):
+        values = frame[frame.columns[0] if column is None else column]
+        base = None if base_units_column is None \
+            else frame[base_units_column].to_numpy()
+    else:
+        values, base = frame, None
+    return from_arrays(index.to_numpy(), values.to_numpy(), units, base)
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("Time series arrays require numpy, install it "
+                          "with 'pip install sampledbapi[timeseries]'.")
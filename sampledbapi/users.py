@@ -1,8 +1,10 @@
-from typing import List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional
 
-from .comm import SampleDBObject, get_data
+from . import bulk
+from .bulk import BulkResult
+from .comm import SampleDBObject, get_client, get_data, iter_data
 
-__all__ = ["User", "get_list", "get", "get_current"]
+__all__ = ["User", "get_list", "iter_list", "get", "get_many", "get_current"]
 
 
 class User(SampleDBObject):
@@ -24,12 +26,38 @@ def get_list() -> List[User]:
     Returns:
         List: List of :class:`~sampledbapi.users.User` objects.
     """
-    return [User(d) for d in get_data("users")]
+    entities = [User(d) for d in get_data("users")]
+    identity_map = get_client().identity_map
+    for entity in entities:
+        identity_map.put(("users", entity.user_id), entity)
+    return entities
+
+
+def iter_list() -> Iterator[User]:
+    """Iterate over all users while the list is streamed from the server.
+
+    The request is sent immediately, so errors are raised by this call and
+    not by the first iteration.
+
+    Returns:
+        Iterator: Iterator over :class:`~sampledbapi.users.User` objects.
+    """
+    identity_map = get_client().identity_map
+    entries = iter_data("users")
+
+    def decode() -> Iterator[User]:
+        for d in entries:
+            user = User(d)
+            identity_map.put(("users", user.user_id), user)
+            yield user
+    return decode()
 
 
 def get(user_id: int) -> User:
     """Get the specific user (user_id).
 
+    Users contained in a configured mirror are read from it.
+
     Args:
         user_id (int): ID of the user to be retrieved.
 
@@ -37,11 +65,37 @@ def get(user_id: int) -> User:
         User: Requested :class:`~sampledbapi.users.User`.
     """
     if isinstance(user_id, int):
-        return User(get_data(f"users/{user_id}"))
+        return get_client().identity_map.get_or_fetch(
+            ("users", user_id), lambda: User(_get_user_data(user_id)))
     else:
         raise TypeError()
 
 
+def _get_user_data(user_id: int) -> Dict:
+    mirror = get_client().active_mirror
+    d = None if mirror is None else mirror.get_user(user_id)
+    return get_data(f"users/{user_id}") if d is None else d
+
+
+def get_many(user_ids: Iterable[int], max_workers: int = 8,
+             deadline: Optional[float] = None) -> BulkResult:
+    """Get several users concurrently.
+
+    Repeated IDs are only fetched once. A failing request does not abort the
+    others, its error is reported in the result instead.
+
+    Args:
+        user_ids (Iterable[int]): IDs of the users.
+        max_workers (int): Number of parallel requests.
+        deadline (float): Seconds after which outstanding requests fail.
+
+    Returns:
+        BulkResult: :class:`~sampledbapi.users.User` objects in input order
+        and errors by ID, see :class:`~sampledbapi.bulk.BulkResult`.
+    """
+    return bulk.get_many(get, user_ids, max_workers, deadline)
+
+
 def get_current() -> User:
     """Get the current user.
 
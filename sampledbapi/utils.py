@@ -1,17 +1,22 @@
-from datetime import datetime
-from typing import Optional, Dict
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Tuple, Union
 
-from .comm import SampleDBObject
+from .comm import SampleDBObject, get_client
 
 
 class TimeSeries(SampleDBObject):
-    data: Optional[str] = None
+    # CSV text or rows of UTC timestamp, magnitude and optionally the
+    # magnitude in base units
+    data: Optional[Union[str, List]] = None
     units: Optional[str] = None
 
 
 class Quantity(SampleDBObject):
     value: Optional[float] = None
     units: Optional[str] = None
+    magnitude: Optional[float] = None
+    magnitude_in_base_units: Optional[float] = None
+    dimensionality: Optional[str] = None
 
 
 def json2timeseries(data: Dict) -> Optional[TimeSeries]:
@@ -21,7 +26,21 @@ def json2timeseries(data: Dict) -> Optional[TimeSeries]:
 
 
 def timeseries2json(timeseries: TimeSeries) -> Dict:
-    return {'_type': 'timeseries', 'data': str(timeseries.data), 'units': str(timeseries.units)}
+    data: Any = timeseries.data
+    if hasattr(data, 'tolist'):
+        # NumPy array of rows
+        data = data.tolist()
+    if isinstance(data, (list, tuple)):
+        data = [[_timestamp(row[0]), *row[1:]] for row in data]
+    else:
+        data = str(data)
+    return {'_type': 'timeseries', 'data': data, 'units': str(timeseries.units)}
+
+
+def _timestamp(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S.%f')
+    return value
 
 
 def json2objectreference(data: Dict) -> Optional[int]:
@@ -37,7 +56,7 @@ def objectreference2json(obj_id: int) -> Dict:
 def json2bool(data: Dict) -> Optional[bool]:
     if '_type' not in data or data['_type'] != 'bool':
         return None
-    return data['value'] == 'True'
+    return data['value'] in (True, 'True')
 
 
 def bool2json(value: bool) -> Dict:
@@ -75,28 +94,171 @@ def text2json(text: str) -> Dict:
 
 
 def str2datetime(data: str) -> datetime:
-    return datetime.strptime(data, '%Y-%m-%d %H:%M:%S')
+    # fromisoformat is much faster than strptime and also parses fractional
+    # seconds and UTC offsets ("Z" only since Python 3.11); datetimes with
+    # an offset are converted to naive UTC like the usual "utc_datetime"
+    if data.endswith('Z'):
+        data = data[:-1] + '+00:00'
+    try:
+        result = datetime.fromisoformat(data)
+    except ValueError:
+        return datetime.strptime(data, '%Y-%m-%d %H:%M:%S')
+    if result.tzinfo is not None:
+        result = result.astimezone(timezone.utc).replace(tzinfo=None)
+    return result
 
 
 def file2json(file_id: int):
     return {'_type': 'file', 'file_id': file_id}
 
 
-def convert_json(data: Dict):
-    for key in data:
-        if type(data[key]) is Dict:
-            data[key] = convert_json(data[key])
-        if key == '_type':
-            if data[key] == 'text':
-                data[key] = json2text(data[key])
-            if data[key] == 'datetime':
-                data[key] = json2datetime(data[key])
-            if data[key] == 'quantity':
-                data[key] = json2quantity(data[key])
-            if data[key] == 'bool':
-                data[key] = json2bool(data[key])
-            if data[key] == 'object_reference':
-                data[key] = json2objectreference(data[key])
-            if data[key] == 'timeseries':
-                data[key] = json2timeseries(data[key])
-    return data
+# Decoders of typed values by their "_type"; other types are kept as they are
+_DECODERS: Dict[str, Callable[[Dict], Any]] = {
+    'text': lambda data: data['text'],
+    'datetime': lambda data: str2datetime(data['utc_datetime']),
+    'quantity': Quantity,
+    'bool': lambda data: data['value'] in (True, 'True'),
+    'object_reference': lambda data: int(data['object_id']),
+    'timeseries': TimeSeries,
+}
+
+
+def _decode(value: Any) -> Any:
+    if type(value) is dict:
+        if '_type' in value:
+            decoder = _DECODERS.get(value['_type'])
+            return value if decoder is None else decoder(value)
+        return {key: _decode(v) for key, v in value.items()}
+    if type(value) is list:
+        return [_decode(v) for v in value]
+    return value
+
+
+class LazyData(Mapping):
+    """Read-only view of object data that decodes properties on access.
+
+    The raw data is kept and each top-level property is decoded (like
+    :func:`convert_json` does) when it is read. Decoded values are not
+    memoized, which keeps the view as small as the raw data it wraps; use
+    :meth:`materialize` to read all properties repeatedly.
+
+    .. code-block::
+
+        configure_data(lazy=True)
+        names = [obj.data["name"] for obj in objects.get_list()]
+
+    Arguments:
+        raw: Object data as returned by the API.
+    """
+
+    # Without a per-instance __dict__ or memo, constructing the view only
+    # allocates one small object that the garbage collector has to track
+    __slots__ = ('raw',)
+
+    def __init__(self, raw: Dict):
+        self.raw = raw
+
+    def __repr__(self) -> str:
+        return f"LazyData ({len(self.raw)} properties)"
+
+    def __getitem__(self, key: str) -> Any:
+        return _decode(self.raw[key])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.raw)
+
+    def __len__(self) -> int:
+        return len(self.raw)
+
+    def materialize(self) -> Dict[str, Any]:
+        """Decode all properties.
+
+        Returns:
+            dict: The decoded data, like :func:`convert_json` returns it.
+        """
+        return {key: self[key] for key in self.raw}
+
+
+def compile_schema(schema: Any) -> Callable[[Any], Any]:
+    """Compile a schema into a converter for data following it.
+
+    The converter decodes typed values (e.g. "text" or "quantity") like
+    :func:`convert_json`, but looks up the decoder of each property once
+    instead of for every value. Values not matching the schema are decoded
+    generically, so the converter can be reused for data of other versions
+    of the schema.
+
+    Args:
+        schema (dict): Schema, e.g. :attr:`Action.schema
+            <sampledbapi.actions.Action.schema>`.
+
+    Returns:
+        Function converting data.
+    """
+    if not isinstance(schema, dict):
+        return _decode
+    kind = schema.get('type')
+    if kind == 'object':
+        # Typed properties are decoded inline, nested objects and arrays by
+        # their own converters
+        decoders: Dict[str, Tuple[str, Callable[[Dict], Any]]] = {}
+        children: Dict[str, Callable[[Any], Any]] = {}
+        for name, child in schema.get('properties', {}).items():
+            t = child.get('type') if isinstance(child, dict) else None
+            if t in _DECODERS:
+                decoders[name] = (t, _DECODERS[t])
+            elif t in ('object', 'array'):
+                children[name] = compile_schema(child)
+
+        def convert_object(value: Any) -> Any:
+            if type(value) is not dict or '_type' in value:
+                return _decode(value)
+            result = {}
+            for key, v in value.items():
+                typed = decoders.get(key)
+                if typed is not None and type(v) is dict \
+                        and v.get('_type') == typed[0]:
+                    result[key] = typed[1](v)
+                else:
+                    result[key] = children.get(key, _decode)(v)
+            return result
+        return convert_object
+    if kind == 'array':
+        convert_item = compile_schema(schema.get('items'))
+
+        def convert_array(value: Any) -> Any:
+            if type(value) is not list:
+                return _decode(value)
+            return [convert_item(v) for v in value]
+        return convert_array
+    return _decode
+
+
+def convert_json(data: Any, schema: Optional[Dict] = None,
+                 action_id: Optional[int] = None) -> Any:
+    """Decode the typed values in object data, including nested objects
+    and arrays.
+
+    Text becomes str, datetimes datetime, quantities :class:`Quantity`,
+    bools bool, object references IDs and time series :class:`TimeSeries`;
+    other values are kept as they are. The data is not modified.
+
+    Args:
+        data: Object data.
+        schema (dict): Schema of the data. It is compiled with
+            :func:`compile_schema` and, if `action_id` is given, the
+            converter is cached for the action by the current client.
+        action_id (int): Action the data was created with.
+
+    Returns:
+        The decoded data.
+    """
+    if schema is None:
+        return _decode(data)
+    if action_id is None:
+        return compile_schema(schema)(data)
+    converters = get_client().schema_converters
+    converter = converters.get(action_id)
+    if converter is None:
+        converter = converters[action_id] = compile_schema(schema)
+    return converter(data)
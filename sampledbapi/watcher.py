@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import contextvars
+import os
+import tempfile
+import threading
+from typing import Callable, Collection, List, Optional, Tuple
+
+from .object_log import (ObjectLogEntry, _newest_log_entry_id,
+                         get_object_log_entries)
+
+__all__ = ["ObjectLogWatcher"]
+
+_Subscription = Tuple[Callable[[ObjectLogEntry], None],
+                      Optional[Collection[str]], Optional[Collection[int]]]
+
+
+class ObjectLogWatcher:
+    """Watch the object log and pass new entries to callbacks.
+
+    The watcher polls the object log for entries after the last one it has
+    seen. While entries arrive it polls every `min_interval` seconds, each
+    poll without new entries multiplies the interval by `backoff` up to
+    `max_interval`. If a `checkpoint_file` is given, the ID of the last
+    processed entry is stored in it, so a restarted watcher continues where
+    the previous one stopped.
+
+    Errors while fetching the log in the background (e.g. connection errors,
+    error responses that persist after the retries, exceeded deadlines or
+    invalid responses) do not stop the watcher: the interval grows as after
+    an empty poll and polling continues. They are passed to `on_error`, if
+    given; exceptions raised by `on_error` or by a subscribed callback stop
+    the watcher.
+
+    .. code-block::
+
+        watcher = ObjectLogWatcher("watcher.checkpoint")
+        watcher.subscribe(print, types=["CREATE_OBJECT"])
+        watcher.start()
+        ...
+        watcher.stop()
+
+    Polling runs in a background thread (:meth:`start`) or as an asyncio
+    task (:meth:`run_async`), both using the client that is active when
+    they are started.
+
+    Arguments:
+        checkpoint_file: File storing the ID of the last processed entry.
+        after_id: ID of the entry after which to start if there is no
+            checkpoint yet, None to start with the entries created after
+            the first poll.
+        min_interval: Shortest time in seconds between two polls.
+        max_interval: Longest time in seconds between two polls.
+        backoff: Factor by which the interval grows after an empty poll.
+        on_error: Function called with each error while fetching the log in
+            the background.
+    """
+
+    def __init__(self, checkpoint_file: Optional[str] = None,
+                 after_id: Optional[int] = None, min_interval: float = 1.0,
+                 max_interval: float = 60.0, backoff: float = 2.0,
+                 on_error: Optional[Callable[[Exception], None]] = None):
+        if not (after_id is None or isinstance(after_id, int)):
+            raise TypeError()
+        if min_interval <= 0 or max_interval < min_interval or backoff < 1:
+            raise ValueError("Invalid polling intervals.")
+        self.checkpoint_file = checkpoint_file
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.on_error = on_error
+        self.interval = min_interval
+        self.last_id = after_id
+        if checkpoint_file is not None and os.path.exists(checkpoint_file):
+            with open(checkpoint_file) as f:
+                self.last_id = int(f.read().strip())
+        self._subscriptions: List[_Subscription] = []
+        self._poll_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+
+    def __repr__(self) -> str:
+        return f"ObjectLogWatcher (after {self.last_id})"
+
+    def subscribe(self, callback: Callable[[ObjectLogEntry], None],
+                  types: Optional[Collection[str]] = None,
+                  object_ids: Optional[Collection[int]] = None):
+        """Register a callback for new log entries.
+
+        Arguments:
+            callback: Function called with each matching
+                :class:`~sampledbapi.object_log.ObjectLogEntry`.
+            types: Only entries of these types (e.g. "EDIT_OBJECT").
+            object_ids: Only entries of these objects.
+        """
+        self._subscriptions.append((
+            callback, None if types is None else frozenset(types),
+            None if object_ids is None else frozenset(object_ids)))
+
+    def poll(self) -> int:
+        """Fetch new log entries once and dispatch them.
+
+        Entries are dispatched in order and the checkpoint is saved after
+        the poll. If a callback raises, the exception propagates and the
+        checkpoint points to the last entry dispatched completely, so the
+        failed entry is dispatched again by the next poll.
+
+        Returns:
+            int: Number of new entries.
+        """
+        return self._poll()
+
+    def _poll(self, on_error: Optional[Callable[[Exception], None]] = None
+              ) -> int:
+        # Errors while fetching are passed to on_error if given, errors of
+        # the callbacks always propagate
+        with self._poll_lock:
+            try:
+                if self.last_id is None:
+                    # Start with entries created from now on
+                    self._set_checkpoint(_newest_log_entry_id())
+                    return 0
+                entries = get_object_log_entries(after_id=self.last_id)
+            except Exception as e:
+                if on_error is None:
+                    raise
+                on_error(e)
+                return 0
+            entries.sort(key=lambda e: e.log_entry_id or 0)
+            try:
+                for entry in entries:
+                    for callback, types, object_ids in self._subscriptions:
+                        if (types is None or entry.type in types) and \
+                                (object_ids is None or
+                                 entry.object_id in object_ids):
+                            callback(entry)
+                    self.last_id = entry.log_entry_id
+            finally:
+                if entries:
+                    self._set_checkpoint(self.last_id)
+            self._adapt(len(entries))
+            return len(entries)
+
+    def start(self):
+        """Start polling in a background thread."""
+        if self._thread is not None and self._thread.is_alive():
+            raise Exception("The watcher is already running.")
+        self._stop.clear()
+        self._error = None
+        context = contextvars.copy_context()
+        self._thread = threading.Thread(target=context.run,
+                                        args=(self._run,), daemon=True,
+                                        name="ObjectLogWatcher")
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop polling and wait for the background thread.
+
+        Raises the exception that ended the thread, if any.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    @property
+    def running(self) -> bool:
+        """Whether the background thread is polling."""
+        return self._thread is not None and self._thread.is_alive()
+
+    async def run_async(self):
+        """Poll as an asyncio task until :meth:`stop` is called or the task
+        is cancelled.
+
+        Requests run in the default executor, so the event loop is not
+        blocked.
+        """
+        self._stop.clear()
+        loop = asyncio.get_running_loop()
+        while not self._stop.is_set():
+            context = contextvars.copy_context()
+            await loop.run_in_executor(None, context.run, self._poll,
+                                       self._handle_error)
+            if self._stop.is_set():
+                break
+            await asyncio.sleep(self.interval)
+
+    def _run(self):
+        try:
+            while not self._stop.is_set():
+                self._poll(self._handle_error)
+                self._stop.wait(self.interval)
+        except BaseException as e:
+            self._error = e
+
+    def _handle_error(self, error: Exception):
+        # Back off as after an empty poll and keep polling
+        self._adapt(0)
+        if self.on_error is not None:
+            self.on_error(error)
+
+    def _adapt(self, count: int):
+        if count > 0:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.max_interval,
+                                self.interval * self.backoff)
+
+    def _set_checkpoint(self, last_id: Optional[int]):
+        self.last_id = last_id
+        if self.checkpoint_file is None or last_id is None:
+            return
+        directory = os.path.dirname(os.path.abspath(self.checkpoint_file))
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(str(last_id))
+            os.replace(tmp, self.checkpoint_file)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.remove(tmp)
+            raise
@@ -65,7 +65,7 @@ out = setup(
     # What does your project relate to?
     keywords="api sampledb",
 
-    packages=["sampledbapi"],
+    packages=["sampledbapi", "sampledbapi.aio"],
 
     package_dir={"sampledbapi": "./sampledbapi"},
 
@@ -75,6 +75,11 @@ out = setup(
 
     # Requirements
     # install_requires=requirements,
+    extras_require={
+        "async": ["httpx"],
+        "timeseries": ["numpy"],
+        "export": ["pyarrow", "pandas"],
+    },
 
     # Entry point (none so far)
     # entry_points={
@@ -0,0 +1,123 @@
+import asyncio
+import pytest
+from test import test_instruments, test_locations, test_objects, test_users
+
+httpx = pytest.importorskip("httpx")
+
+from sampledbapi import aio
+
+ADDRESS = "http://128.176.208.107:8000"
+
+MOCKS = {
+    "/api/v1/users/me": test_users.mock_user(),
+    "/api/v1/users/1": test_users.mock_user(),
+    "/api/v1/users": test_users.mock_users(),
+    "/api/v1/locations/1": test_locations.mock_location(),
+    "/api/v1/objects": test_objects.mock_objects(),
+    "/api/v1/objects/1": test_objects.mock_object(),
+    "/api/v1/objects/1/versions/1": test_objects.mock_object(),
+    "/api/v1/objects/2": '{"object_id": 2, "version_id": 1, "action_id": 1, "user_id": 1, "data": {}}',
+    "/api/v1/objects/1/related_objects": test_objects.mock_related_objects(),
+    "/api/v1/objects/1/locations": test_objects.mock_location_occurences(),
+    "/api/v1/instruments": test_instruments.mock_instruments(),
+    "/api/v1/instruments/1/log_entries": test_instruments.mock_log_entries(),
+    "/api/v1/object_log_entries/": '[{"log_entry_id": 1, "type": "CREATE_OBJECT", "object_id": 1, "user_id": 1}]',
+}
+
+
+def handler(request):
+    if request.method == "POST":
+        return httpx.Response(201, headers={"Location": "/api/v1/objects/1/versions/0"})
+    if request.url.path in MOCKS:
+        return httpx.Response(200, text=MOCKS[request.url.path])
+    return httpx.Response(404, text="Not found")
+
+
+def run(coroutine):
+    async def with_client():
+        client = aio.AsyncClient(ADDRESS, "Success", max_concurrency=2,
+                                 transport=httpx.MockTransport(handler))
+        async with client:
+            with client.activate():
+                return await coroutine
+    return asyncio.run(with_client())
+
+class TestAio():
+
+    def test_objects_get(self):
+        obj = run(aio.objects.get(2))
+        assert obj.object_id == 2
+        assert obj.version_editor.name == "Nils Weber"
+
+    def test_objects_get_fail(self):
+        with pytest.raises(TypeError):
+            run(aio.objects.get('Test'))
+
+    def test_objects_get_list(self):
+        assert len(run(aio.objects.get_list(q='Test', limit=3))) == 3
+
+    def test_objects_create(self):
+        assert run(aio.objects.create(1, {'name': 'Test'})) == 1
+
+    def test_get_related_objects(self):
+        async def related():
+            return await aio.objects.get_related_objects(await aio.objects.get(1))
+        referenced, referencing = run(related())
+        assert referenced[0].object_id == 1
+        assert referencing[0].object_id == 1
+
+    def test_get_location_occurences(self):
+        async def occurences():
+            return await aio.objects.get_location_occurences(await aio.objects.get(1))
+        occs = run(occurences())
+        assert len(occs) == 3
+        assert occs[0].location.name == "IG1"
+        assert occs[0].user.user_id == 1
+
+    def test_instruments(self):
+        async def instruments():
+            insts = await aio.instruments.get_list()
+            return insts, await aio.instruments.get_log_entry_list(insts[0])
+        insts, logs = run(instruments())
+        assert insts[0].instrument_scientists[0].user_id == 1
+        assert logs[0].author.user_id == 1
+
+    def test_object_log(self):
+        entries = run(aio.object_log.get_object_log_entries(after_id=0))
+        assert entries[0].object_id == 1
+        with pytest.raises(TypeError):
+            run(aio.object_log.get_object_log_entries('Test'))
+
+    def test_users(self):
+        assert len(run(aio.users.get_list())) == 3
+        assert run(aio.users.get_current()).user_id == 1
+
+    def test_errors(self):
+        with pytest.raises(Exception):
+            run(aio.locations.get(2))
+        with pytest.raises(Exception):
+            asyncio.run(aio.AsyncClient().get_data("users/me"))
+
+    def test_authenticate(self):
+        async def authenticate(api_key):
+            client = aio.AsyncClient(transport=httpx.MockTransport(handler))
+            await client.authenticate(ADDRESS, api_key)
+            await client.aclose()
+        asyncio.run(authenticate("Success"))
+
+    def test_event_loops(self):
+        client = aio.AsyncClient(ADDRESS, "Success", transport=httpx.MockTransport(handler))
+        async def get():
+            await client.get_data("users/me")
+            return list(client._pools.values())
+        first = asyncio.run(get())
+        second = asyncio.run(get())
+        # The pool of the finished loop is dropped, each loop has its own
+        assert len(first) == len(second) == 1
+        assert first[0][0] is not second[0][0]
+        async def close():
+            http = (await get())[0][0]
+            await client.aclose()
+            return http
+        assert asyncio.run(close()).is_closed
+        assert len(client._pools) == 0
@@ -0,0 +1,221 @@
+import hashlib
+import json
+import threading
+import time
+import pytest
+from sampledbapi import bulk, comm, instruments, locations, objects, users
+from test import test_authentication, test_instruments, test_locations, test_users
+
+class TestBulk():
+
+    @pytest.fixture(autouse=True)
+    def test_init(self, requests_mock):
+        test_authentication.mock_authenticate(requests_mock)
+        requests_mock.get("http://128.176.208.107:8000/api/v1/objects/2", text='{"object_id": 2}')
+        requests_mock.get("http://128.176.208.107:8000/api/v1/objects/3", status_code=404)
+        requests_mock.get("http://128.176.208.107:8000/api/v1/users/1", text=test_users.mock_user())
+        requests_mock.get("http://128.176.208.107:8000/api/v1/locations/1", text=test_locations.mock_location())
+        requests_mock.get("http://128.176.208.107:8000/api/v1/instruments/1", text=test_instruments.mock_instrument())
+
+    def test_run_order_and_errors(self):
+        def square(i):
+            if i == 3:
+                raise ValueError(i)
+            return i * i
+        result = bulk.run(square, iter(range(10)), max_workers=3, window=2)
+        assert result.results == [0, 1, 4, None, 16, 25, 36, 49, 64, 81]
+        assert list(result.errors) == [3]
+        assert not result.ok
+        with pytest.raises(ValueError):
+            result.raise_for_errors()
+
+    def test_run_window(self):
+        lock = threading.Lock()
+        active = [0, 0]
+        # The first three items only finish together, so they overlap
+        barrier = threading.Barrier(3, timeout=5)
+        def work(i):
+            with lock:
+                active[0] += 1
+                active[1] = max(active)
+            if i < 3:
+                barrier.wait()
+            # Stay active long enough for a fourth worker to start if the
+            # window was not respected
+            time.sleep(0.01)
+            with lock:
+                active[0] -= 1
+            return i
+        assert bulk.run(work, range(20), max_workers=4, window=3).ok
+        assert active[1] == 3
+        active[1] = 0
+        assert bulk.run(work, range(3, 20), max_workers=4).ok
+        assert active[1] == 4
+
+    def test_run_fail(self):
+        with pytest.raises(ValueError):
+            bulk.run(str, [1], max_workers=0)
+
+    def test_run_uses_client(self, requests_mock):
+        requests_mock.get("http://other:8000/api/v1/users/5", text='{"user_id": 5}')
+        with comm.Client("http://other:8000", "Other").activate():
+            result = users.get_many([5])
+        assert result[0].user_id == 5
+
+    def test_objects_get_many(self, requests_mock):
+        result = objects.get_many([2, 3, 1, 2])
+        assert len(result) == 4
+        assert [o.object_id if o else None for o in result] == [2, None, 1, 2]
+        assert result[0] is result[3]
+        assert list(result.errors) == [3]
+        assert sum(r.path == "/api/v1/objects/2" for r in requests_mock.request_history) == 1
+
+    def test_get_many_fail(self):
+        with pytest.raises(TypeError):
+            objects.get_many([1, 'Test'])
+
+    def test_get_many(self, requests_mock):
+        assert users.get_many([1, 1])[0].name == "Nils Weber"
+        assert locations.get_many([1]).ok
+        assert instruments.get_many([1])[0].instrument_id == 1
+
+    def test_run_progress(self):
+        reports = []
+        result = bulk.run(str, [1, 22, 333], max_workers=2,
+                          progress=lambda p: reports.append((p.done, p.failed, p.bytes, p.total)),
+                          size=lambda item: item)
+        assert result.results == ["1", "22", "333"]
+        assert [r[0] for r in reports] == [1, 2, 3]
+        assert reports[-1] == (3, 0, 356, 3)
+
+    def test_upload_files(self, requests_mock, tmp_path):
+        names = []
+        def record(request, context):
+            names.append(json.loads(b"".join(request.body))["original_file_name"])
+            return ""
+        requests_mock.post("http://128.176.208.107:8000/api/v1/objects/1/files/",
+                           headers={"Location": "/api/v1/objects/1/files/5"}, text=record)
+        requests_mock.post("http://128.176.208.107:8000/api/v1/objects/2/files/",
+                           headers={"Location": "/api/v1/objects/2/files/6"}, text=record)
+        paths = []
+        for i in range(3):
+            path = tmp_path / f"file{i}.bin"
+            path.write_bytes(b"x" * (i + 1) * 100)
+            paths.append(str(path))
+        reports = []
+        result = objects.upload_files(iter([(1, paths[0]), (2, paths[1], "Renamed"),
+                                            (1, str(tmp_path / "missing.bin")), (1, paths[2])]),
+                                      max_workers=2, progress=reports.append)
+        assert result.results == [5, 6, None, 5]
+        assert list(result.errors) == [2]
+        assert reports[-1].done == 4
+        assert reports[-1].failed == 1
+        assert reports[-1].bytes == 100 + 200 + 300
+        assert reports[-1].throughput > 0
+        assert "Renamed" in names
+
+    def test_upload_files_fail(self):
+        result = objects.upload_files([("Test", "a")])
+        assert isinstance(result.errors[0], TypeError)
+
+    def test_upload_files_dedupe(self, requests_mock, tmp_path):
+        content = b"content"
+        requests_mock.get("http://128.176.208.107:8000/api/v1/objects/1/files",
+                          text=json.dumps([{"object_id": 1, "file_id": 4, "storage": "database",
+                                            "hash": {"algorithm": "sha256",
+                                                     "hexdigest": hashlib.sha256(content).hexdigest()}}]))
+        requests_mock.post("http://128.176.208.107:8000/api/v1/objects/1/files/",
+                           headers={"Location": "/api/v1/objects/1/files/5"})
+        same = tmp_path / "same.bin"
+        same.write_bytes(content)
+        other = tmp_path / "other.bin"
+        other.write_bytes(b"other")
+        reports = []
+        result = objects.upload_files([(1, str(same)), (1, str(other)), (1, str(same))], max_workers=1,
+                                      dedupe=True, progress=reports.append)
+        assert result.results == [4, 5, 4]
+        assert result.skipped == [0, 2]
+        assert reports[-1].bytes == len(b"other")
+        assert reports[-1].skipped == 2
+        assert reports[-1].skipped_bytes == 2 * len(content)
+        paths = [r.path for r in requests_mock.request_history]
+        assert paths.count("/api/v1/objects/1/files") == 1
+        assert sum(r.method == "POST" for r in requests_mock.request_history) == 1
+        with pytest.raises(TypeError):
+            objects.upload_files([(1, str(other))], dedupe="Test")
+
+    def test_upload_files_dedupe_concurrent(self, requests_mock, tmp_path, monkeypatch):
+        # Listing the files of object 1 does not block uploads to object 2
+        listing = threading.Event()
+        release = threading.Event()
+        get_file_list = objects.Object.get_file_list
+        def blocking_file_list(obj, *args, **kwargs):
+            if obj.object_id == 1:
+                listing.set()
+                release.wait(5)
+            return get_file_list(obj, *args, **kwargs)
+        monkeypatch.setattr(objects.Object, "get_file_list", blocking_file_list)
+        uploaded = []
+        def upload(request, context):
+            uploaded.append(request.path)
+            return ""
+        for object_id in (1, 2):
+            requests_mock.get(f"http://128.176.208.107:8000/api/v1/objects/{object_id}/files", text="[]")
+            requests_mock.post(f"http://128.176.208.107:8000/api/v1/objects/{object_id}/files/",
+                               headers={"Location": f"/api/v1/objects/{object_id}/files/5"}, text=upload)
+        path = tmp_path / "file.bin"
+        path.write_bytes(b"content")
+        def items():
+            yield (1, str(path))
+            listing.wait(5)
+            yield (2, str(path))
+        result = objects.upload_files(items(), max_workers=2, dedupe=True,
+                                      progress=lambda p: release.set())
+        assert result.results == [5, 5]
+        assert uploaded == ["/api/v1/objects/2/files/", "/api/v1/objects/1/files/"]
+
+    def mock_create(self, requests_mock, fail_names=()):
+        counter = iter(range(100, 1000))
+        def create(request, context):
+            data = request.json()["data"]
+            if data["name"] in fail_names:
+                context.status_code = 400
+                return ""
+            context.headers["Location"] = f"/api/v1/objects/{next(counter)}/versions/0"
+            return ""
+        requests_mock.post("http://128.176.208.107:8000/api/v1/objects/", text=create)
+
+    def test_create_many(self, requests_mock):
+        self.mock_create(requests_mock, fail_names=["b"])
+        reports = []
+        result = objects.create_many(1, ({"name": n} for n in "abcd"), max_workers=1,
+                                     progress=reports.append)
+        assert result.results == [100, None, 101, 102]
+        assert list(result.errors) == [1]
+        assert result.skipped == []
+        assert reports[-1].done == 4
+
+    def test_create_many_journal(self, requests_mock, tmp_path):
+        journal = str(tmp_path / "import.journal")
+        self.mock_create(requests_mock, fail_names=["c"])
+        first = objects.create_many(1, [{"name": n} for n in "abcd"], max_workers=2, journal=journal)
+        assert list(first.errors) == [2]
+        with open(journal, "a") as f:
+            f.write('{"index": 7, "obj')
+        self.mock_create(requests_mock)
+        count = len(requests_mock.request_history)
+        second = objects.create_many(1, [{"name": n} for n in "abcd"], journal=journal)
+        assert second.ok
+        assert second.skipped == [0, 1, 3]
+        assert second.results[:2] == first.results[:2]
+        assert second.results[3] == first.results[3]
+        assert len(requests_mock.request_history) == count + 1
+        third = objects.create_many(1, [{"name": n} for n in "abcd"], journal=journal)
+        assert third.skipped == [0, 1, 2, 3]
+        changed = objects.create_many(1, [{"name": "x"}], journal=journal)
+        assert list(changed.errors) == [0]
+
+    def test_create_many_fail(self):
+        with pytest.raises(TypeError):
+            objects.create_many("Test", [])
+        assert isinstance(objects.create_many(1, ["Test"]).errors[0], TypeError)
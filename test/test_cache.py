@@ -0,0 +1,242 @@
+import os
+import time
+import pytest
+from sampledbapi import actions, comm, locations, objects, users
+from sampledbapi.cache import HashIndex, IdentityMap, ResponseCache, VersionCache
+from test import test_actions, test_authentication, test_locations, test_objects, test_users
+
+def mock_object_with_user():
+    return '{"object_id": 2, "version_id": 1, "action_id": 1, "user_id": 1, "data": {}}'
+
+class TestCache():
+
+    @pytest.fixture(autouse=True)
+    def test_init(self, requests_mock):
+        test_authentication.mock_authenticate(requests_mock)
+        comm.configure_cache()
+        requests_mock.get("http://128.176.208.107:8000/api/v1/users", text=test_users.mock_users())
+        requests_mock.get("http://128.176.208.107:8000/api/v1/users/1", text=test_users.mock_user())
+        requests_mock.get("http://128.176.208.107:8000/api/v1/locations/1", text=test_locations.mock_location())
+        requests_mock.get("http://128.176.208.107:8000/api/v1/objects",
+                          text=f'[{mock_object_with_user()},{mock_object_with_user()},{mock_object_with_user()}]')
+        yield
+        comm.configure_cache()
+
+    def test_lookups_served_from_memory(self, requests_mock):
+        objs = objects.get_list()
+        assert len(objs) == 3
+        assert objs[0].version_editor is objs[2].version_editor
+        assert sum(r.path == "/api/v1/users/1" for r in requests_mock.request_history) == 1
+        stats = comm.get_client().identity_map.stats()
+        assert stats["hits"] == 2
+        assert stats["misses"] == 1
+
+    def test_get_list_fills_cache(self, requests_mock):
+        users.get_list()
+        users.get(1)
+        assert requests_mock.request_history[-1].path == "/api/v1/users"
+
+    def test_invalidate(self, requests_mock):
+        loc = locations.get(1)
+        assert locations.get(1) is loc
+        comm.get_client().identity_map.invalidate("locations", 1)
+        assert locations.get(1) is not loc
+        comm.get_client().identity_map.invalidate("locations")
+        assert len(comm.get_client().identity_map) == 0
+
+    def test_disabled(self, requests_mock):
+        comm.configure_cache(enabled=False)
+        assert users.get(1) is not users.get(1)
+
+    def test_ttl(self):
+        identity_map = IdentityMap(ttl=0.01)
+        identity_map.put(("users", 1), "User")
+        assert identity_map.get(("users", 1)) == "User"
+        time.sleep(0.02)
+        assert identity_map.get(("users", 1)) is None
+
+    def test_lru_eviction(self):
+        identity_map = IdentityMap(maxsize=2)
+        identity_map.put(("users", 1), 1)
+        identity_map.put(("users", 2), 2)
+        identity_map.get(("users", 1))
+        identity_map.put(("users", 3), 3)
+        assert identity_map.get(("users", 2)) is None
+        assert identity_map.get(("users", 1)) == 1
+        assert identity_map.stats()["evictions"] == 1
+
+    def test_configure_fail(self):
+        with pytest.raises(TypeError):
+            IdentityMap(maxsize='Test')
+        with pytest.raises(ValueError):
+            IdentityMap(maxsize=0)
+
+
+class TestResponseCache():
+
+    @pytest.fixture(autouse=True)
+    def test_init(self, requests_mock):
+        test_authentication.mock_authenticate(requests_mock)
+        comm.configure_response_cache()
+        yield
+        comm.configure_response_cache()
+
+    def test_etag_revalidation(self, requests_mock):
+        requests_mock.get("http://128.176.208.107:8000/api/v1/actions",
+                          [{"text": test_actions.mock_actions(), "headers": {"ETag": '"v1"'}},
+                           {"status_code": 304}])
+        assert len(actions.get_list()) == 3
+        acts = actions.get_list()
+        assert len(acts) == 3
+        assert acts[0].name == "Create"
+        assert requests_mock.request_history[-1].headers["If-None-Match"] == '"v1"'
+        assert comm.get_client().response_cache.stats()["revalidations"] == 1
+
+    def test_last_modified(self, requests_mock):
+        date = "Wed, 21 Oct 2015 07:28:00 GMT"
+        requests_mock.get("http://128.176.208.107:8000/api/v1/locations",
+                          [{"text": f"[{test_locations.mock_location()}]", "headers": {"Last-Modified": date}},
+                           {"status_code": 304}])
+        locations.get_list()
+        assert len(locations.get_list()) == 1
+        assert requests_mock.request_history[-1].headers["If-Modified-Since"] == date
+
+    def test_payload_copied(self, requests_mock):
+        requests_mock.get("http://128.176.208.107:8000/api/v1/users/1",
+                          [{"text": test_users.mock_user(), "headers": {"ETag": '"v1"'}},
+                           {"status_code": 304}])
+        data = comm.get_data("users/1")
+        data["name"] = "Changed"
+        assert comm.get_data("users/1")["name"] != "Changed"
+
+    def test_no_validators(self, requests_mock):
+        requests_mock.get("http://128.176.208.107:8000/api/v1/users/1", text=test_users.mock_user())
+        comm.get_data("users/1")
+        comm.get_data("users/1")
+        assert "If-None-Match" not in requests_mock.request_history[-1].headers
+        assert len(comm.get_client().response_cache) == 0
+
+    def test_fallback_ttl(self, requests_mock):
+        comm.configure_response_cache(fallback_ttl=0.05)
+        requests_mock.get("http://128.176.208.107:8000/api/v1/users/1", text=test_users.mock_user())
+        count = len(requests_mock.request_history)
+        comm.get_data("users/1")
+        comm.get_data("users/1")
+        assert len(requests_mock.request_history) == count + 1
+        time.sleep(0.06)
+        comm.get_data("users/1")
+        assert len(requests_mock.request_history) == count + 2
+
+    def test_uncached_path(self, requests_mock):
+        requests_mock.get("http://128.176.208.107:8000/api/v1/objects/1",
+                          text=test_users.mock_user(), headers={"ETag": '"v1"'})
+        comm.get_data("objects/1")
+        assert len(comm.get_client().response_cache) == 0
+
+    def test_write_invalidates(self, requests_mock):
+        requests_mock.get("http://128.176.208.107:8000/api/v1/locations",
+                          text=f"[{test_locations.mock_location()}]", headers={"ETag": '"v1"'})
+        requests_mock.post("http://128.176.208.107:8000/api/v1/locations/")
+        locations.get_list()
+        assert len(comm.get_client().response_cache) == 1
+        comm.post_data("locations/", {})
+        assert len(comm.get_client().response_cache) == 0
+
+    def test_eviction(self):
+        cache = ResponseCache(maxsize=1)
+        cache.store(cache.key("users/1"), {"ETag": "a"}, 1)
+        cache.store(cache.key("users/2"), {"ETag": "b"}, 2)
+        assert len(cache) == 1
+        assert cache.lookup(cache.key("users/1")) == (None, {})
+
+    def test_configure_fail(self):
+        with pytest.raises(TypeError):
+            ResponseCache(fallback_ttl="Test")
+        with pytest.raises(ValueError):
+            ResponseCache(maxsize=0)
+
+
+class TestVersionCache():
+
+    @pytest.fixture(autouse=True)
+    def test_init(self, requests_mock, tmp_path):
+        test_authentication.mock_authenticate(requests_mock)
+        requests_mock.get("http://128.176.208.107:8000/api/v1/objects/1/versions/1", text=test_objects.mock_object())
+        comm.configure_version_cache(str(tmp_path))
+        yield
+        comm.configure_version_cache(None)
+
+    def test_get_version_cached(self, requests_mock):
+        obj = objects.get(1)
+        first = obj.get_version(1)
+        count = len(requests_mock.request_history)
+        second = obj.get_version(1)
+        assert len(requests_mock.request_history) == count
+        assert second.version_id == first.version_id == 1
+        assert second.data == first.data
+
+    def test_shared_between_clients(self, requests_mock, tmp_path):
+        objects.get(1).get_version(1)
+        client = comm.Client()
+        client.authenticate("http://128.176.208.107:8000", "abc")
+        client.configure_version_cache(str(tmp_path))
+        count = len(requests_mock.request_history)
+        with client.activate():
+            assert objects.Object({"object_id": 1, "version_id": 2, "action_id": 1}).get_version(1).version_id == 1
+        assert len(requests_mock.request_history) == count
+
+    def test_keyed_by_server(self, tmp_path):
+        cache = VersionCache(str(tmp_path))
+        cache.put("http://a", 1, 1, {"object_id": 1})
+        assert cache.get("http://a", 1, 1) == {"object_id": 1}
+        assert cache.get("http://b", 1, 1) is None
+        assert cache.get("http://a", 1, 2) is None
+
+    def test_corrupt_file(self, tmp_path):
+        cache = VersionCache(str(tmp_path))
+        cache.put("http://a", 1, 1, {"object_id": 1})
+        path = cache._path("http://a", 1, 1)
+        with open(path, "wb") as f:
+            f.write(b"garbage")
+        assert cache.get("http://a", 1, 1) is None
+        assert not os.path.exists(path)
+
+    def test_eviction(self, tmp_path):
+        cache = VersionCache(str(tmp_path), max_bytes=2000)
+        for i in range(20):
+            cache.put("http://a", 1, i, {"data": os.urandom(64).hex()})
+            os.utime(cache._path("http://a", 1, i), (i, i))
+        cache.get("http://a", 1, 0)
+        assert cache.size() <= 2000
+        assert cache.get("http://a", 1, 19) is not None
+        assert cache.get("http://a", 1, 1) is None
+
+    def test_clear(self, tmp_path):
+        cache = VersionCache(str(tmp_path))
+        cache.put("http://a", 1, 1, {"object_id": 1})
+        cache.clear()
+        assert cache.size() == 0
+
+    def test_configure_fail(self, tmp_path):
+        with pytest.raises(TypeError):
+            VersionCache(str(tmp_path), max_bytes="Test")
+        with pytest.raises(ValueError):
+            VersionCache(str(tmp_path), max_bytes=0)
+
+
+class TestHashIndex():
+
+    def test_get_put(self, tmp_path):
+        path = str(tmp_path / "index.sqlite")
+        with HashIndex(path) as index:
+            assert index.get("http://a", 1, "abc") is None
+            index.put("http://a", 1, "abc", 5)
+            assert index.get("http://a", 1, "abc") == 5
+            assert index.get("http://a", 2, "abc") is None
+            assert index.get("http://b", 1, "abc") is None
+        with HashIndex(path) as index:
+            assert index.get("http://a", 1, "abc") == 5
+
+    def test_init_fail(self):
+        with pytest.raises(TypeError):
+            HashIndex(1)
@@ -0,0 +1,125 @@
+import threading
+import pytest
+from sampledbapi import comm, objects, users
+from test import test_authentication
+
+class TestComm():
+
+    @pytest.fixture(autouse=True)
+    def test_init(self, requests_mock):
+        requests_mock.get("http://128.176.208.107:8000/api/v1/users/1", text='{"user_id": 1}')
+        test_authentication.mock_authenticate(requests_mock)
+        yield
+        comm.configure_session()
+
+    def test_session_reused(self, requests_mock):
+        session = comm.get_session()
+        users.get(1)
+        users.get(1)
+        assert comm.get_session() is session
+
+    def test_configure_session(self, requests_mock):
+        session = comm.get_session()
+        comm.configure_session(pool_connections=2, pool_maxsize=20, keep_alive=False)
+        new_session = comm.get_session()
+        assert new_session is not session
+        assert new_session.adapters["https://"]._pool_maxsize == 20
+        assert new_session.headers["Connection"] == "close"
+        assert users.get(1).user_id == 1
+
+    def test_configure_session_fail(self):
+        with pytest.raises(TypeError):
+            comm.configure_session(pool_maxsize='Test')
+        with pytest.raises(ValueError):
+            comm.configure_session(pool_maxsize=0)
+
+    def test_close_session(self, requests_mock):
+        session = comm.get_session()
+        comm.close_session()
+        assert comm.get_session() is not session
+
+    def test_client_activate(self, requests_mock):
+        requests_mock.get("http://other:8000/api/v1/users/me", text='{"user_id": 2}')
+        requests_mock.get("http://other:8000/api/v1/users/1", text='{"user_id": 3}')
+        client = comm.Client()
+        client.authenticate("http://other:8000", "Other")
+        assert comm.get_client() is not client
+        with client.activate():
+            assert comm.get_client() is client
+            assert users.get(1).user_id == 3
+        assert users.get(1).user_id == 1
+
+    def test_client_threads(self, requests_mock):
+        requests_mock.get("http://other:8000/api/v1/users/1", text='{"user_id": 3}')
+        client = comm.Client("http://other:8000", "Other")
+        results = {}
+
+        def worker():
+            with client.activate():
+                results["other"] = users.get(1).user_id
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+        assert results["other"] == 3
+        assert users.get(1).user_id == 1
+
+    def test_client_context_manager(self, requests_mock):
+        with comm.Client("http://other:8000", "Other") as client:
+            session = client.get_session()
+        assert client.get_session() is not session
+
+    def test_client_not_authenticated(self):
+        with pytest.raises(Exception):
+            comm.Client().get_data("users/me")
+
+    def test_lazy_references(self, requests_mock):
+        comm.configure_references(lazy=True)
+        try:
+            occurence = objects.LocationOccurence({"object_id": 1, "location": 1, "user": 1})
+            assert requests_mock.request_history[-1].path == "/api/v1/users/me"
+            assert occurence.get_reference_id("location") == 1
+            assert occurence.get_reference_id("responsible_user") is None
+            assert occurence.user.user_id == 1
+            assert requests_mock.request_history[-1].path == "/api/v1/users/1"
+            assert occurence.get_reference_id("user") == 1
+        finally:
+            comm.configure_references(lazy=False)
+
+    def test_lazy_references_client(self, requests_mock):
+        requests_mock.get("http://other:8000/api/v1/users/1", text='{"user_id": 3}')
+        client = comm.Client("http://other:8000", "Other")
+        client.configure_references(lazy=True)
+        with client.activate():
+            obj = objects.Object({"object_id": 1, "user_id": 1})
+        assert obj.version_editor.user_id == 3
+
+    def test_eager_references(self, requests_mock):
+        obj = objects.Object({"object_id": 1, "user_id": 1})
+        assert requests_mock.request_history[-1].path == "/api/v1/users/1"
+        assert obj.version_editor.user_id == 1
+        assert obj.get_reference_id("version_editor") == 1
+        with pytest.raises(AttributeError):
+            obj.get_reference_id("object_id")
+        with pytest.raises(TypeError):
+            comm.configure_references('Test')
+
+    def test_model_fields(self):
+        assert "update" not in objects.Object._fields
+        assert "version_editor" in objects.Object._fields
+        obj = objects.Object({"object_id": 1, "update": 2, "get_version": 3})
+        assert obj.object_id == 1
+        assert callable(obj.update) and callable(obj.get_version)
+
+    def test_lazy_data(self):
+        comm.configure_data(lazy=True)
+        try:
+            obj = objects.Object({"object_id": 1, "data": {"name": {"_type": "text", "text": "A"}}})
+            assert obj.data.raw == {"name": {"_type": "text", "text": "A"}}
+            assert obj.data["name"] == "A"
+        finally:
+            comm.configure_data(lazy=False)
+        obj = objects.Object({"object_id": 1, "data": {"name": {"_type": "text", "text": "A"}}})
+        assert obj.data == {"name": "A"}
+        with pytest.raises(TypeError):
+            comm.configure_data('Test')
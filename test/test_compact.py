@@ -0,0 +1,46 @@
+import json
+import pickle
+import pytest
+from sampledbapi import instruments, objects, users
+from sampledbapi.compact import CompactInstrumentLogEntry, CompactModel, CompactObject, CompactUser
+from test import test_authentication, test_objects, test_users
+
+class TestCompact():
+
+    @pytest.fixture(autouse=True)
+    def test_init(self, requests_mock):
+        test_authentication.mock_authenticate(requests_mock)
+        requests_mock.get("http://128.176.208.107:8000/api/v1/users/1", text=test_users.mock_user())
+
+    def test_compact_object(self, requests_mock):
+        count = len(requests_mock.request_history)
+        obj = CompactObject(dict(json.loads(test_objects.mock_object()), user_id=1, unknown=2))
+        assert not hasattr(obj, "__dict__")
+        assert obj.object_id == 1 and obj.user_id == 1
+        assert obj.utc_datetime is None
+        assert not hasattr(obj, "unknown")
+        assert len(requests_mock.request_history) == count
+        assert repr(obj) == "CompactObject (object_id 1)"
+        with pytest.raises(AttributeError):
+            obj.other = 1
+        full = obj.to_model()
+        assert isinstance(full, objects.Object)
+        assert full.version_editor.user_id == 1
+
+    def test_compact_user(self):
+        user = CompactUser(json.loads(test_users.mock_user()))
+        assert user.to_dict()["name"] == "Nils Weber"
+        assert isinstance(user.to_model(), users.User)
+        assert pickle.loads(pickle.dumps(user)) == user
+        assert user != CompactUser({})
+
+    def test_compact_instrument_log_entry(self):
+        entry = CompactInstrumentLogEntry(2, {"log_entry_id": 3, "versions": []})
+        assert entry.instrument_id == 2
+        full = entry.to_model()
+        assert isinstance(full, instruments.InstrumentLogEntry)
+        assert full.instrument_id == 2 and full.log_entry_id == 3
+
+    def test_fields(self):
+        assert CompactModel._fields == ()
+        assert CompactUser._fields == ("user_id", "name", "orcid", "affiliation", "role", "email")
@@ -0,0 +1,113 @@
+import pytest
+from datetime import datetime
+from sampledbapi import comm, export, objects
+from sampledbapi.compact import CompactObject
+from test import test_authentication
+
+pa = pytest.importorskip("pyarrow")
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "name": {"type": "text"},
+        "mass": {"type": "quantity", "units": "g"},
+        "created": {"type": "datetime"},
+        "ok": {"type": "bool"},
+        "sample": {"type": "object_reference"},
+        "details": {"type": "object", "properties": {"operator": {"type": "user"}}},
+        "tags": {"type": "tags"}
+    }
+}
+
+def mock_data(i):
+    data = {
+        "name": {"_type": "text", "text": {"en": f"Sample {i}", "de": f"Probe {i}"} if i == 1 else f"Sample {i}"},
+        "mass": {"_type": "quantity", "dimensionality": "[mass]", "magnitude": i / 2,
+                 "magnitude_in_base_units": i / 2000, "units": "g"},
+        "created": {"_type": "datetime", "utc_datetime": f"2023-12-2{i} 11:11:11"},
+        "ok": {"_type": "bool", "value": True},
+        "sample": {"_type": "object_reference", "object_id": i + 10},
+        "details": {"operator": {"_type": "user", "user_id": 1}},
+        "tags": {"_type": "tags", "tags": ["a"]}
+    }
+    if i == 2:
+        del data["mass"]
+    return data
+
+def mock_payload(i):
+    return {"object_id": i, "version_id": 0, "action_id": 1, "schema": SCHEMA, "data": mock_data(i)}
+
+class TestExport():
+
+    @pytest.fixture(autouse=True)
+    def test_init(self, requests_mock):
+        test_authentication.mock_authenticate(requests_mock)
+        self.objects = [objects.Object(mock_payload(i)) for i in range(1, 4)]
+
+    def test_schema_columns(self):
+        assert export.schema_columns(SCHEMA) == [
+            ("object_id", "id"), ("version_id", "id"), ("action_id", "id"), ("name", "text"),
+            ("mass", "quantity"), ("mass.units", "units"), ("created", "datetime"), ("ok", "bool"),
+            ("sample", "object_reference"), ("details.operator", "user")]
+
+    def test_to_table(self):
+        table = export.to_table(iter(self.objects), chunk_size=2)
+        assert table.num_rows == 3
+        assert table.schema.field("mass").type == pa.float64()
+        assert table.schema.field("created").type == pa.timestamp("us")
+        rows = table.to_pylist()
+        assert rows[0]["name"] == "Sample 1"
+        assert rows[0]["mass"] == 0.5 and rows[0]["mass.units"] == "g"
+        assert rows[1]["mass"] is None and rows[1]["mass.units"] is None
+        assert rows[2]["created"] == datetime(2023, 12, 23, 11, 11, 11)
+        assert rows[2]["sample"] == 13
+        assert rows[2]["details.operator"] == 1
+        assert rows[2]["ok"] is True
+
+    def test_quantity_in_base_units(self):
+        # Older SampleDB versions only send the magnitude in base units
+        payload = mock_payload(1)
+        del payload["data"]["mass"]["magnitude"]
+        rows = export.to_table([objects.Object(payload)]).to_pylist()
+        assert rows[0]["mass"] == 0.0005
+
+    def test_iter_batches(self):
+        batches = list(export.iter_batches(self.objects, SCHEMA, chunk_size=2))
+        assert [b.num_rows for b in batches] == [2, 1]
+        assert list(export.iter_batches([], SCHEMA)) == []
+
+    def test_compact_and_lazy(self):
+        compact = [CompactObject(mock_payload(i)) for i in range(1, 4)]
+        comm.configure_data(lazy=True)
+        try:
+            lazy = [objects.Object(mock_payload(i)) for i in range(1, 4)]
+        finally:
+            comm.configure_data(lazy=False)
+        expected = export.to_table(self.objects)
+        assert export.to_table(compact).equals(expected)
+        assert export.to_table(lazy).equals(expected)
+
+    def test_to_dataframe(self):
+        pytest.importorskip("pandas")
+        frame = export.to_dataframe(self.objects)
+        assert list(frame["object_id"]) == [1, 2, 3]
+        assert str(frame["created"].dtype).startswith("datetime64")
+
+    def test_write_parquet(self, tmp_path):
+        pq = pytest.importorskip("pyarrow.parquet")
+        path = str(tmp_path / "objects.parquet")
+        assert export.write_parquet(iter(self.objects), path, chunk_size=2) == 3
+        assert pq.ParquetFile(path).num_row_groups == 2
+        assert pq.read_table(path).equals(export.to_table(self.objects))
+
+    def test_write_arrow(self, tmp_path):
+        path = str(tmp_path / "objects.arrow")
+        assert export.write_arrow(self.objects, path) == 3
+        with pa.ipc.open_file(path) as reader:
+            assert reader.read_all().equals(export.to_table(self.objects))
+
+    def test_export_fail(self):
+        with pytest.raises(TypeError):
+            export.to_table(self.objects, chunk_size="1")
+        with pytest.raises(ValueError):
+            export.to_table(self.objects, chunk_size=0)
@@ -0,0 +1,71 @@
+import json
+import pytest
+from sampledbapi import graph
+from test import test_authentication
+
+URL = "http://128.176.208.107:8000/api/v1/objects"
+
+# 2 references 1, 3 references 2, 4 references 1, 5 references 3
+ACTIONS = {1: 1, 2: 2, 3: 3, 4: 9, 5: 3}
+REFERENCED = {1: [], 2: [1], 3: [2], 4: [1], 5: [3]}
+
+def mock_graph(requests_mock):
+    for object_id, action_id in ACTIONS.items():
+        requests_mock.get(f"{URL}/{object_id}", text=json.dumps(
+            {"object_id": object_id, "version_id": 0, "action_id": action_id, "data": {}}))
+        referencing = [i for i, ids in REFERENCED.items() if object_id in ids]
+        requests_mock.get(f"{URL}/{object_id}/related_objects", text=json.dumps(
+            {"referenced_objects": [{"object_id": i} for i in REFERENCED[object_id]],
+             "referencing_objects": [{"object_id": i} for i in referencing]}))
+
+class TestGraph():
+
+    @pytest.fixture(autouse=True)
+    def test_init(self, requests_mock):
+        test_authentication.mock_authenticate(requests_mock)
+        mock_graph(requests_mock)
+
+    def test_crawl_all(self, requests_mock):
+        g = graph.crawl([1])
+        assert set(g.objects) == {1, 2, 3, 4, 5}
+        assert g.depth == {1: 0, 2: 1, 4: 1, 3: 2, 5: 3}
+        assert sorted(g.edges()) == [(2, 1), (3, 2), (4, 1), (5, 3)]
+        assert sorted(g.referencing[1]) == [2, 4]
+        paths = [r.path for r in requests_mock.request_history]
+        assert paths.count("/api/v1/objects/1/related_objects") == 1
+        assert 3 in g and len(g) == 5
+
+    def test_max_depth(self, requests_mock):
+        g = graph.crawl([1], max_depth=1)
+        assert set(g.objects) == {1, 2, 4}
+        assert sorted(g.edges()) == [(2, 1), (4, 1)]
+        assert "/api/v1/objects/2/related_objects" not in [r.path for r in requests_mock.request_history]
+
+    def test_direction(self):
+        assert set(graph.crawl([3], direction="referenced").objects) == {3, 2, 1}
+        assert set(graph.crawl([3], direction="referencing").objects) == {3, 5}
+
+    def test_action_filter(self):
+        g = graph.crawl([1], action_ids=[2, 3])
+        assert set(g.objects) == {1, 2, 3, 5}
+
+    def test_dfs_and_max_objects(self):
+        g = graph.crawl([1], order="dfs", max_workers=1)
+        assert set(g.objects) == {1, 2, 3, 4, 5}
+        assert list(g.objects)[0] == 1
+        assert len(graph.crawl([1], max_objects=2, max_workers=1)) == 2
+
+    def test_errors(self, requests_mock):
+        requests_mock.get(f"{URL}/4", status_code=403)
+        g = graph.crawl([1])
+        assert set(g.errors) == {4}
+        assert 4 not in g
+        assert sorted(g.referencing[1]) == [2]
+
+    def test_crawl_fail(self):
+        with pytest.raises(TypeError):
+            graph.crawl(["1"])
+        with pytest.raises(ValueError):
+            graph.crawl([1], direction="up")
+        with pytest.raises(ValueError):
+            graph.crawl([1], order="random")
@@ -202,4 +202,9 @@ class TestInstruments():
         objAtt = instruments.get(1).get_log_entry(1).get_object_attachment(1)
         assert objAtt.object_attachment_id == 1
         assert objAtt.object_id == 1
-        assert 'InstrumentLogObjectAttachment' in repr(objAtt)
\ No newline at end of file
+        assert 'InstrumentLogObjectAttachment' in repr(objAtt)
+
+    def test_iter_log_entry_list(self, requests_mock):
+        logs = list(instruments.get(1).iter_log_entry_list())
+        assert len(logs) == 3
+        assert logs[0].author is not None
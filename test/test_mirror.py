@@ -0,0 +1,179 @@
+import json
+import threading
+import pytest
+import requests
+from sampledbapi import comm, objects
+from sampledbapi.mirror import Mirror
+from sampledbapi.object_log import _newest_log_entry_id
+from test import test_actions, test_authentication, test_locations, test_users
+
+def mock_object(object_id, action_id=1, name="Sample"):
+    return {"object_id": object_id, "version_id": 0, "action_id": action_id,
+            "schema": {"title": "Basic Sample Information"}, "data": {"name": {"_type": "text", "text": name}}}
+
+def mock_entities(mock, key):
+    entities = []
+    for i in range(1, 4):
+        entity = json.loads(mock())
+        entity[key] = i
+        entities.append(entity)
+    return entities
+
+def mock_log(request, context):
+    # Entries after the requested ID, like the server
+    after_id = int(request.qs.get("after_id", ["0"])[0])
+    return [entry for entry in (mock_log_entry(1, 1), mock_log_entry(5, 3)) if entry["log_entry_id"] > after_id]
+
+def mock_log_entry(log_entry_id, object_id):
+    return {"log_entry_id": log_entry_id, "type": "EDIT_OBJECT", "object_id": object_id, "user_id": 1,
+            "data": {}, "utc_datetime": "2022-11-21T09:39:08.470159"}
+
+class TestMirror():
+
+    @pytest.fixture(autouse=True)
+    def test_init(self, requests_mock, tmp_path):
+        test_authentication.mock_authenticate(requests_mock)
+        requests_mock.get("http://128.176.208.107:8000/api/v1/objects",
+                          json=[mock_object(3, 2), mock_object(2), mock_object(1)])
+        requests_mock.get("http://128.176.208.107:8000/api/v1/object_log_entries/", json=mock_log)
+        requests_mock.get("http://128.176.208.107:8000/api/v1/actions", json=mock_entities(test_actions.mock_action, "action_id"))
+        requests_mock.get("http://128.176.208.107:8000/api/v1/users", json=mock_entities(test_users.mock_user, "user_id"))
+        requests_mock.get("http://128.176.208.107:8000/api/v1/locations", json=mock_entities(test_locations.mock_location, "location_id"))
+        self.mirror = Mirror(str(tmp_path / "mirror.sqlite"))
+        self.mirror.initial_import()
+        yield
+        comm.configure_mirror(None)
+        self.mirror.close()
+
+    def test_initial_import(self):
+        assert self.mirror.checkpoint == 5
+        assert self.mirror.address == "http://128.176.208.107:8000"
+        assert [d["object_id"] for d in self.mirror.get_objects()] == [3, 2, 1]
+        assert [d["object_id"] for d in self.mirror.get_objects(action_id=1)] == [2, 1]
+        assert [d["object_id"] for d in self.mirror.get_objects(limit=1, offset=1)] == [2]
+        assert len(self.mirror.get_actions()) == 3
+        assert len(self.mirror.get_users()) == 3
+        assert [loc.location_id for loc in self.mirror.get_locations()] == [1, 2, 3]
+
+    def test_initial_import_checkpoint(self, requests_mock):
+        # The newest log entry is searched for, the log is not listed completely
+        log = [r for r in requests_mock.request_history if r.path == "/api/v1/object_log_entries/"]
+        assert [r.qs["after_id"] for r in log] == [["0"]]
+
+    def test_newest_log_entry_id(self, requests_mock):
+        def large_log(request, context):
+            after_id = int(request.qs["after_id"][0])
+            return [mock_log_entry(i, 1) for i in range(after_id + 1, 5001)]
+        requests_mock.get("http://128.176.208.107:8000/api/v1/object_log_entries/", json=large_log)
+        count = len(requests_mock.request_history)
+        assert _newest_log_entry_id(limit=10) == 5000
+        assert len(requests_mock.request_history) - count < 30
+        assert _newest_log_entry_id(4995, limit=10) == 5000
+        assert _newest_log_entry_id(5000) == 5000
+        requests_mock.get("http://128.176.208.107:8000/api/v1/object_log_entries/", json=[])
+        assert _newest_log_entry_id() == 0
+
+    def test_reimport(self, requests_mock):
+        # Reads are answered from the previous import while the objects are streamed
+        read = []
+        def stream(request, context):
+            reader = threading.Thread(target=lambda: read.append(self.mirror.get_object(3)))
+            reader.start()
+            reader.join(5)
+            return [mock_object(4)]
+        requests_mock.get("http://128.176.208.107:8000/api/v1/objects", json=stream)
+        count = len(requests_mock.request_history)
+        self.mirror.initial_import()
+        assert read[0]["object_id"] == 3
+        assert [d["object_id"] for d in self.mirror.get_objects()] == [4]
+        assert [d["object_id"] for d in self.mirror.get_objects(action_id=1)] == [4]
+        assert requests_mock.request_history[count].qs["after_id"] == ["5"]
+
+    def test_sync(self, requests_mock):
+        requests_mock.get("http://128.176.208.107:8000/api/v1/object_log_entries/?after_id=5",
+                          json=[mock_log_entry(6, 2), mock_log_entry(7, 2), mock_log_entry(8, 4)])
+        requests_mock.get("http://128.176.208.107:8000/api/v1/objects/2", json=mock_object(2, name="Changed"))
+        requests_mock.get("http://128.176.208.107:8000/api/v1/objects/4", json=mock_object(4))
+        assert self.mirror.sync() == 2
+        assert self.mirror.checkpoint == 8
+        assert self.mirror.get_object(2)["data"]["name"]["text"] == "Changed"
+        assert [d["object_id"] for d in self.mirror.get_objects()] == [4, 3, 2, 1]
+        paths = [r.path for r in requests_mock.request_history]
+        assert paths.count("/api/v1/objects/2") == 1
+        assert "/api/v1/objects/1" not in paths
+
+    def test_sync_removes_unreadable(self, requests_mock):
+        requests_mock.get("http://128.176.208.107:8000/api/v1/object_log_entries/?after_id=5",
+                          json=[mock_log_entry(6, 2), mock_log_entry(7, 3)])
+        requests_mock.get("http://128.176.208.107:8000/api/v1/objects/2", status_code=403)
+        requests_mock.get("http://128.176.208.107:8000/api/v1/objects/3", status_code=404)
+        assert self.mirror.sync() == 2
+        assert self.mirror.checkpoint == 7
+        assert [d["object_id"] for d in self.mirror.get_objects()] == [1]
+
+    def test_sync_requeues_failures(self, requests_mock):
+        requests_mock.get("http://128.176.208.107:8000/api/v1/object_log_entries/?after_id=5",
+                          json=[mock_log_entry(6, 2), mock_log_entry(7, 4)])
+        requests_mock.get("http://128.176.208.107:8000/api/v1/objects/2", status_code=503)
+        requests_mock.get("http://128.176.208.107:8000/api/v1/objects/4", json=mock_object(4))
+        comm.configure_retries(max_attempts=1)
+        try:
+            with pytest.raises(requests.HTTPError):
+                self.mirror.sync()
+        finally:
+            comm.configure_retries()
+        assert self.mirror.checkpoint == 7
+        assert self.mirror.get_object(4)["object_id"] == 4
+        assert self.mirror.get_object(2)["data"]["name"]["text"] == "Sample"
+        requests_mock.get("http://128.176.208.107:8000/api/v1/object_log_entries/?after_id=7", json=[])
+        requests_mock.get("http://128.176.208.107:8000/api/v1/objects/2", json=mock_object(2, name="Changed"))
+        assert self.mirror.sync() == 1
+        assert self.mirror.get_object(2)["data"]["name"]["text"] == "Changed"
+        assert self.mirror.sync() == 0
+
+    def test_sync_without_import(self, tmp_path):
+        with Mirror(str(tmp_path / "empty.sqlite")) as mirror:
+            with pytest.raises(Exception):
+                mirror.sync()
+
+    def test_persistent(self, tmp_path):
+        with Mirror(str(tmp_path / "mirror.sqlite")) as mirror:
+            assert mirror.checkpoint == 5
+            assert mirror.get_object(3)["action_id"] == 2
+
+    def test_read_apis_use_mirror(self, requests_mock):
+        comm.configure_mirror(self.mirror)
+        count = len(requests_mock.request_history)
+        assert [o.object_id for o in objects.get_list(action_id=1)] == [2, 1]
+        assert objects.get(3).action_id == 2
+        assert len(requests_mock.request_history) == count
+        objects.get_list(q="name == 'Sample'")
+        assert len(requests_mock.request_history) == count + 1
+
+    def test_version_editor_from_mirror(self, requests_mock):
+        edited = dict(mock_object(2, name="Changed"), user_id=2)
+        requests_mock.get("http://128.176.208.107:8000/api/v1/object_log_entries/?after_id=5",
+                          json=[mock_log_entry(6, 2)])
+        requests_mock.get("http://128.176.208.107:8000/api/v1/objects/2", json=edited)
+        self.mirror.sync()
+        comm.configure_mirror(self.mirror)
+        count = len(requests_mock.request_history)
+        assert objects.get(2).version_editor.user_id == 2
+        assert [o.version_editor for o in objects.get_list(action_id=2)] == [None]
+        assert len(requests_mock.request_history) == count
+
+    def test_mirror_of_other_server(self, requests_mock):
+        with self.mirror._db:
+            self.mirror._set_meta("address", "http://other.example")
+        comm.configure_mirror(self.mirror)
+        requests_mock.get("http://128.176.208.107:8000/api/v1/objects/3", json=mock_object(3, name="Server"))
+        assert objects.get(3).data["name"] == "Server"
+
+    def test_missing_object_falls_back(self, requests_mock):
+        comm.configure_mirror(self.mirror)
+        requests_mock.get("http://128.176.208.107:8000/api/v1/objects/7", text=json.dumps(mock_object(7)))
+        assert objects.get(7).object_id == 7
+
+    def test_init_fail(self):
+        with pytest.raises(TypeError):
+            Mirror(1)
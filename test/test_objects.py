@@ -1,7 +1,11 @@
+import base64
+import hashlib
+import json
 import pytest
 import io
 import tempfile
 from sampledbapi import objects
+from sampledbapi.cache import HashIndex
 from test import test_authentication, test_users, test_locations
 
 def mock_object():
@@ -44,6 +48,14 @@ def mock_file():
             "base64_content": "Test64"
         }'''
 
+def mock_file_with_content(requests_mock, content, hexdigest=None):
+    requests_mock.get("http://128.176.208.107:8000/api/v1/objects/1/files/2",
+                      text=json.dumps({"object_id": 1, "file_id": 2, "storage": "database",
+                                       "original_file_name": "Test.bin",
+                                       "base64_content": base64.b64encode(content).decode(),
+                                       "hash": {"algorithm": "sha256",
+                                                "hexdigest": hexdigest or hashlib.sha256(content).hexdigest()}}))
+
 def mock_files():
     return f'[{mock_file()},{mock_file()},{mock_file()}]'
     
@@ -272,6 +284,57 @@ class TestObjects():
         assert file.base64_content == 'Test64'
         assert 'File' in repr(file)
     
+    def test_get_file_list_without_content(self, requests_mock):
+        files = objects.get(1).get_file_list(include_content=False)
+        assert len(files) == 3
+        assert files[0].original_file_name == 'Test.txt'
+        assert files[0].base64_content is None
+        with pytest.raises(TypeError):
+            objects.get(1).get_file_list(include_content='Test')
+
+    def test_download_file(self, requests_mock, tmp_path):
+        content = bytes(range(256)) * 1000 + b"\x00"
+        mock_file_with_content(requests_mock, content)
+        dest = str(tmp_path / "file.bin")
+        file = objects.get(1).download_file(2, dest)
+        assert file.file_id == 2
+        assert file.base64_content is None
+        with open(dest, "rb") as f:
+            assert f.read() == content
+        buffer = io.BytesIO()
+        objects.get(1).download_file(2, buffer)
+        assert buffer.getvalue() == content
+
+    def test_download_file_hash_mismatch(self, requests_mock, tmp_path):
+        mock_file_with_content(requests_mock, b"content", hexdigest="0" * 64)
+        dest = str(tmp_path / "file.bin")
+        with pytest.raises(Exception):
+            objects.get(1).download_file(2, dest)
+        assert list(tmp_path.iterdir()) == []
+
+    def test_download_file_without_content(self, requests_mock, tmp_path):
+        requests_mock.get("http://128.176.208.107:8000/api/v1/objects/1/files/3",
+                          text='{"object_id": 1, "file_id": 3, "storage": "url", "url": "http://example.com"}')
+        with pytest.raises(Exception):
+            objects.get(1).download_file(3, str(tmp_path / "file.bin"))
+        with pytest.raises(TypeError):
+            objects.get(1).download_file('Test', str(tmp_path / "file.bin"))
+
+    def test_file_save(self, requests_mock, tmp_path):
+        content = b"some initial binary data: \x00\x01" * 10000
+        mock_file_with_content(requests_mock, content)
+        file = objects.get(1).get_file(2)
+        file.save(str(tmp_path / "a.bin"))
+        assert (tmp_path / "a.bin").read_bytes() == content
+        listed = objects.File({"object_id": 1, "file_id": 2})
+        listed.save(str(tmp_path / "b.bin"))
+        assert (tmp_path / "b.bin").read_bytes() == content
+        file.base64_content = base64.b64encode(b"other").decode()
+        with pytest.raises(Exception):
+            file.save(str(tmp_path / "c.bin"))
+        with pytest.raises(TypeError):
+            file.save(1)
+
     def test_upload_file_default(self, requests_mock):
         f = tempfile.NamedTemporaryFile(delete=False)
         f.close()
@@ -286,13 +349,85 @@ class TestObjects():
         f.close()
         objects.get(1).upload_file(f.name, 'Testfile')
     
+    def test_upload_file_dedupe(self, requests_mock, tmp_path):
+        content = b"some initial binary data: \x00\x01"
+        path = tmp_path / "file.bin"
+        path.write_bytes(content)
+        requests_mock.get("http://128.176.208.107:8000/api/v1/objects/1/files",
+                          text=json.dumps([{"object_id": 1, "file_id": 4, "storage": "database",
+                                            "base64_content": base64.b64encode(content).decode(),
+                                            "hash": {"algorithm": "sha256",
+                                                     "hexdigest": hashlib.sha256(content).hexdigest()}}]))
+        obj = objects.get(1)
+        count = len(requests_mock.request_history)
+        assert obj.upload_file(str(path), dedupe=True) == 4
+        assert not any(r.method == "POST" for r in requests_mock.request_history[count:])
+        path.write_bytes(b"other")
+        assert obj.upload_file(str(path), dedupe=True) == 0
+        assert requests_mock.last_request.method == "POST"
+        with pytest.raises(TypeError):
+            obj.upload_file(str(path), dedupe="Test")
+
+    def test_upload_file_dedupe_index(self, requests_mock, tmp_path):
+        path = tmp_path / "file.bin"
+        path.write_bytes(b"content")
+        index = HashIndex(str(tmp_path / "index.sqlite"))
+        obj = objects.get(1)
+        assert obj.upload_file(str(path), dedupe=index) == 0
+        count = len(requests_mock.request_history)
+        assert obj.upload_file(str(path), dedupe=index) == 0
+        assert len(requests_mock.request_history) == count
+        index.close()
+
+    def test_find_file(self, requests_mock):
+        content = b"content"
+        mock_file_with_content(requests_mock, content)
+        requests_mock.get("http://128.176.208.107:8000/api/v1/objects/1/files",
+                          text=json.dumps([{"object_id": 1, "file_id": 2, "storage": "database",
+                                            "hash": {"algorithm": "sha256",
+                                                     "hexdigest": hashlib.sha256(content).hexdigest()}}]))
+        obj = objects.get(1)
+        assert obj.find_file(hashlib.sha256(content).hexdigest()) == 2
+        assert obj.find_file(hashlib.sha256(b"other").hexdigest()) is None
+        with pytest.raises(TypeError):
+            obj.find_file(1)
+
     def test_upload_file_raw_fail(self, requests_mock):
         with pytest.raises(TypeError):
             objects.get(1).upload_file_raw(1, io.BytesIO(b"some initial binary data: \x00\x01"))
         
     def test_upload_file_raw_success(self, requests_mock):
         objects.get(1).upload_file_raw('TestFile', io.BytesIO(b"some initial binary data: \x00\x01"))
-    
+
+    def test_upload_file_raw_body(self, requests_mock):
+        content = bytes(range(256)) * 2000 + b"\x00"
+        assert objects.get(1).upload_file_raw('Test "File"', io.BytesIO(content)) == 0
+        request = requests_mock.last_request
+        body = b"".join(request.body)
+        assert int(request.headers["Content-Length"]) == len(body)
+        data = json.loads(body)
+        assert data["original_file_name"] == 'Test "File"'
+        assert base64.b64decode(data["base64_content"]) == content
+        assert data["hash"] == {"algorithm": "sha256", "hexdigest": hashlib.sha256(content).hexdigest()}
+
+    def test_upload_file_raw_unseekable(self, requests_mock):
+        class Pipe(io.RawIOBase):
+            def __init__(self, content):
+                self.content = content
+            def readable(self):
+                return True
+            def readinto(self, b):
+                n = min(len(b), 7, len(self.content))
+                b[:n] = self.content[:n]
+                self.content = self.content[n:]
+                return n
+        content = b"0123456789" * 10
+        objects.get(1).upload_file_raw('Test', Pipe(content))
+        request = requests_mock.last_request
+        assert "Content-Length" not in request.headers
+        data = json.loads(b"".join(request.body))
+        assert base64.b64decode(data["base64_content"]) == content
+
     def test_post_link_fail(self, requests_mock):
         with pytest.raises(TypeError):
             objects.get(1).post_link(1)
@@ -339,4 +474,21 @@ class TestObjects():
         json = {'_type': 'object_reference', 'object_id': '1'}
         obj = objects.Object.from_json(json)
         json2 = obj.to_json()
-        assert json == json2
\ No newline at end of file
+        assert json == json2
+
+    def test_iter_list(self, requests_mock):
+        def page(request, context):
+            offset = int(request.qs.get('offset', ['0'])[0])
+            limit = int(request.qs['limit'][0])
+            ids = range(offset, min(offset + limit, 5))
+            return '[' + ','.join(f'{{"object_id": {i}}}' for i in ids) + ']'
+        requests_mock.get("http://128.176.208.107:8000/api/v1/objects", text=page)
+        for prefetch in (True, False):
+            objs = list(objects.iter_list(q='Test', page_size=2, prefetch=prefetch))
+            assert [o.object_id for o in objs] == [0, 1, 2, 3, 4]
+
+    def test_iter_list_fail(self, requests_mock):
+        with pytest.raises(TypeError):
+            objects.iter_list(q=1)
+        with pytest.raises(ValueError):
+            objects.iter_list(page_size=0)
@@ -0,0 +1,67 @@
+import pytest
+from sampledbapi.permissions import PermissionChange, sync_permissions
+from test import test_authentication
+
+URL = "http://128.176.208.107:8000/api/v1/objects"
+
+class TestPermissions():
+
+    @pytest.fixture(autouse=True)
+    def test_init(self, requests_mock):
+        test_authentication.mock_authenticate(requests_mock)
+        for object_id, groups, public in ((1, '{"2": "read"}', "false"), (2, '{"2": "write", "3": "read"}', "true")):
+            requests_mock.get(f"{URL}/{object_id}/permissions/users", text='{"1": "grant"}')
+            requests_mock.get(f"{URL}/{object_id}/permissions/groups", text=groups)
+            requests_mock.get(f"{URL}/{object_id}/permissions/public", text=public)
+            requests_mock.put(f"{URL}/{object_id}/permissions/groups/2")
+            requests_mock.put(f"{URL}/{object_id}/permissions/groups/3")
+            requests_mock.put(f"{URL}/{object_id}/permissions/public")
+        requests_mock.get(f"{URL}/3/permissions/groups", status_code=403)
+
+    def puts(self, requests_mock):
+        return sorted(r.path for r in requests_mock.request_history if r.method == "PUT")
+
+    def test_dry_run(self, requests_mock):
+        target = {"groups": {2: "write"}, "public": False}
+        report = sync_permissions({1: target, 2: target}, dry_run=True)
+        assert report.ok
+        assert report.dry_run
+        assert report.changes == [PermissionChange(1, "groups", 2, "read", "write"),
+                                  PermissionChange(2, "public", None, True, False)]
+        assert self.puts(requests_mock) == []
+        assert "2 changes planned" in repr(report)
+
+    def test_apply_minimal_diff(self, requests_mock):
+        target = {"groups": {2: "write"}}
+        report = sync_permissions({1: target, 2: target})
+        assert len(report.changes) == 1
+        assert self.puts(requests_mock) == ["/api/v1/objects/1/permissions/groups/2"]
+        assert requests_mock.last_request.json() == "write"
+        assert not any("permissions/users" in r.path for r in requests_mock.request_history)
+
+    def test_exact(self, requests_mock):
+        report = sync_permissions({2: {"groups": {2: "write"}}}, exact=True)
+        assert report.changes == [PermissionChange(2, "groups", 3, "read", "none")]
+        assert self.puts(requests_mock) == ["/api/v1/objects/2/permissions/groups/3"]
+
+    def test_errors(self, requests_mock):
+        requests_mock.put(f"{URL}/1/permissions/groups/2", status_code=500)
+        report = sync_permissions({1: {"groups": {2: "write"}}, 3: {"groups": {2: "write"}}})
+        assert not report.ok
+        assert list(report.read_errors) == [3]
+        assert list(report.write_errors) == [PermissionChange(1, "groups", 2, "read", "write")]
+        assert "2 errors" in repr(report)
+        with pytest.raises(Exception):
+            report.raise_for_errors()
+
+    def test_invalid_target(self):
+        with pytest.raises(TypeError):
+            sync_permissions({"1": {}})
+        with pytest.raises(TypeError):
+            sync_permissions({1: {"public": "yes"}})
+        with pytest.raises(ValueError):
+            sync_permissions({1: {"groups": {1: "admin"}}})
+        with pytest.raises(ValueError):
+            sync_permissions({1: {"roles": {}}})
+        with pytest.raises(TypeError):
+            sync_permissions({1: {}}, dry_run="yes")
@@ -0,0 +1,119 @@
+import time
+import pytest
+import requests
+from sampledbapi import comm, objects, users
+from sampledbapi.retry import DeadlineExceeded, RateLimiter, RetryPolicy, deadline, parse_retry_after
+from test import test_authentication, test_users
+
+USERS = "http://128.176.208.107:8000/api/v1/users/1"
+
+class TestRetry():
+
+    @pytest.fixture(autouse=True)
+    def test_init(self, requests_mock):
+        test_authentication.mock_authenticate(requests_mock)
+        comm.configure_cache(enabled=False)
+        comm.configure_retries(backoff_factor=0)
+        yield
+        comm.configure_cache()
+        comm.configure_retries()
+        comm.configure_rate_limit(None)
+        comm.configure_timeout()
+
+    def test_retry_status(self, requests_mock):
+        requests_mock.get(USERS, [{"status_code": 503}, {"status_code": 502},
+                                  {"text": test_users.mock_user()}])
+        assert users.get(1).user_id == 1
+        assert requests_mock.call_count == 4
+
+    def test_retry_exhausted(self, requests_mock):
+        requests_mock.get(USERS, status_code=503)
+        with pytest.raises(requests.HTTPError):
+            users.get(1)
+        assert requests_mock.call_count == 4
+
+    def test_retry_connection_error(self, requests_mock):
+        requests_mock.get(USERS, [{"exc": requests.exceptions.ConnectionError},
+                                  {"text": test_users.mock_user()}])
+        assert users.get(1).user_id == 1
+
+    def test_post_not_retried(self, requests_mock):
+        requests_mock.post("http://128.176.208.107:8000/api/v1/objects/", status_code=503)
+        with pytest.raises(requests.HTTPError):
+            objects.create(1, {'name': 'Test'})
+        assert requests_mock.call_count == 2
+
+    def test_retry_after(self, requests_mock):
+        requests_mock.get(USERS, [{"status_code": 429, "headers": {"Retry-After": "0.05"}},
+                                  {"text": test_users.mock_user()}])
+        start = time.monotonic()
+        users.get(1)
+        assert time.monotonic() - start >= 0.05
+
+    def test_retry_after_capped(self):
+        policy = RetryPolicy(max_backoff=2)
+        assert policy.get_delay(1, {"Retry-After": "86400"}) == 2
+        assert policy.get_delay(1, {"Retry-After": "1"}) == 1
+        with deadline(0.5):
+            assert policy.get_delay(1, {"Retry-After": "1"}) <= 0.5
+
+    def test_parse_retry_after(self):
+        assert parse_retry_after("3") == 3
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+        assert parse_retry_after("Test") is None
+        assert parse_retry_after(None) is None
+
+    def test_policy(self):
+        policy = RetryPolicy(max_attempts=3, backoff_factor=1, max_backoff=3, jitter=False)
+        assert policy.should_retry("GET", 1)
+        assert policy.should_retry("GET", 2, 503)
+        assert not policy.should_retry("GET", 3, 503)
+        assert not policy.should_retry("GET", 1, 404)
+        assert not policy.should_retry("POST", 1, 503)
+        assert [policy.get_delay(a) for a in (1, 2, 3)] == [1, 2, 3]
+        assert 0 <= RetryPolicy(backoff_factor=1).get_delay(2) <= 2
+        with pytest.raises(ValueError):
+            RetryPolicy(max_attempts=0)
+
+    def test_rate_limiter(self):
+        limiter = RateLimiter(rate=100, burst=2)
+        assert limiter.reserve() == 0
+        assert limiter.reserve() == 0
+        assert 0 < limiter.reserve() <= 0.01
+        with pytest.raises(DeadlineExceeded):
+            limiter.reserve(max_wait=0)
+        with pytest.raises(ValueError):
+            RateLimiter(rate=0)
+
+    def test_rate_limit(self, requests_mock):
+        requests_mock.get(USERS, text=test_users.mock_user())
+        comm.configure_rate_limit(50, burst=1)
+        start = time.monotonic()
+        for i in range(4):
+            users.get(1)
+        assert time.monotonic() - start >= 0.05
+
+    def test_timeout(self, requests_mock):
+        requests_mock.get(USERS, text=test_users.mock_user())
+        comm.configure_timeout(connect=1, read=2)
+        users.get(1)
+        assert requests_mock.request_history[-1].timeout == (1, 2)
+        with deadline(0.5):
+            users.get(1)
+        assert max(requests_mock.request_history[-1].timeout) <= 0.5
+        with pytest.raises(TypeError):
+            comm.configure_timeout('Test')
+
+    def test_deadline(self, requests_mock):
+        requests_mock.get(USERS, status_code=503, headers={"Retry-After": "10"})
+        with pytest.raises(DeadlineExceeded):
+            with deadline(1):
+                users.get(1)
+        with pytest.raises(DeadlineExceeded):
+            with deadline(0):
+                users.get(1)
+
+    def test_bulk_deadline(self, requests_mock):
+        requests_mock.get(USERS, status_code=503, headers={"Retry-After": "10"})
+        result = users.get_many([1], deadline=1)
+        assert isinstance(result.errors[1], DeadlineExceeded)
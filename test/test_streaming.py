@@ -0,0 +1,84 @@
+import json
+import pytest
+from sampledbapi import comm, object_log, objects, users
+from sampledbapi.streaming import iter_json_array, read_json_object
+from test import test_authentication, test_users
+
+def chunked(text, size=1):
+    data = text.encode()
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+class TestStreaming():
+
+    @pytest.fixture(autouse=True)
+    def test_init(self, requests_mock):
+        test_authentication.mock_authenticate(requests_mock)
+        requests_mock.get("http://128.176.208.107:8000/api/v1/users", text=test_users.mock_users())
+        requests_mock.get("http://128.176.208.107:8000/api/v1/object_log_entries/",
+                          text='[{"log_entry_id": 1, "object_id": 1}, {"log_entry_id": 2, "object_id": 1}]')
+
+    def test_iter_json_array(self):
+        values = [{"a": [1, 2.5, {"b": 'Münster " ]'}]}, 12345, "x", None, True, [], {}]
+        text = ' [ ' + ' , '.join(json.dumps(v, ensure_ascii=False) for v in values) + ' ] \n'
+        for size in (1, 3, 1000):
+            assert list(iter_json_array(chunked(text, size))) == values
+
+    def test_iter_json_array_empty(self):
+        assert list(iter_json_array(chunked(' [ ] '))) == []
+
+    def test_iter_json_array_fail(self):
+        for text in ('', '{"a": 1}', '[1, 2', '[1 2]', '[{"a": }]', '[1] 2'):
+            with pytest.raises(Exception):
+                list(iter_json_array(chunked(text, 2)))
+
+    def test_iter_json_array_skip_field(self):
+        text = '[{"id": 1, "content": "' + 'x' * 5000 + '", "n": [1]}, {"id": 2, "content": null}, 3]'
+        assert list(iter_json_array(chunked(text, 100), skip_field="content")) == \
+            [{"id": 1, "n": [1]}, {"id": 2, "content": None}, 3]
+
+    def test_read_json_object(self):
+        content = 'abc\\"\n Münster \U0001F600 ' * 50
+        text = json.dumps({"a": 1, "content": content, "b": {"content": "x"}}, ensure_ascii=False)
+        ascii_text = json.dumps({"content": content, "a": 1}, ensure_ascii=True)
+        for t in (text, ascii_text):
+            for size in (1, 5, 1000):
+                pieces = []
+                fields, found = read_json_object(chunked(t, size), "content", pieces.append)
+                assert "".join(pieces) == content
+                assert found
+                assert fields["a"] == 1
+
+    def test_read_json_object_missing(self):
+        fields, found = read_json_object(chunked('{"a": "b"}'), "content", lambda piece: None)
+        assert fields == {"a": "b"}
+        assert not found
+
+    def test_read_json_object_fail(self):
+        for text in ('', '[]', '{"a" 1}', '{"content": "abc', '{"a": 1} 2', '{1: 2}'):
+            with pytest.raises(Exception):
+                read_json_object(chunked(text, 2), "content", lambda piece: None)
+
+    def test_iter_data(self, requests_mock):
+        assert len(list(comm.iter_data("users", chunk_size=7))) == 3
+
+    def test_iter_data_fail(self, requests_mock):
+        requests_mock.get("http://128.176.208.107:8000/api/v1/users", status_code=404)
+        with pytest.raises(Exception):
+            comm.iter_data("users")
+
+    def test_users_iter_list(self, requests_mock):
+        assert [u.name for u in users.iter_list()] == ["Nils Weber"] * 3
+        requests_mock.get("http://128.176.208.107:8000/api/v1/users", status_code=404)
+        with pytest.raises(Exception):
+            users.iter_list()
+
+    def test_iter_object_log_entries(self, requests_mock):
+        assert [e.log_entry_id for e in object_log.iter_object_log_entries()] == [1, 2]
+        assert len(list(object_log.iter_object_log_entries(after_id=1))) == 2
+        with pytest.raises(TypeError):
+            object_log.iter_object_log_entries('Test')
+
+    def test_objects_iter_list_unpaginated(self, requests_mock):
+        objs = list(objects.iter_list(action_id=1, page_size=None))
+        assert len(objs) == 3
+        assert requests_mock.request_history[-1].qs == {'action_id': ['1']}
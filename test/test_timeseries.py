@@ -0,0 +1,81 @@
+import json
+import pytest
+from sampledbapi import timeseries
+from datetime import datetime
+from sampledbapi.utils import TimeSeries, json2timeseries, timeseries2json
+
+np = pytest.importorskip("numpy")
+
+CSV = '"2023-12-22 11:11:11.111111",20.0,293.15\n"2023-12-22 12:11:11.111111",21.0,294.15'
+ROWS = [["2023-12-22 11:11:11.111111", 20.0], ["2023-12-22 12:11:11", 21.5]]
+
+class TestTimeSeries():
+
+    def test_to_arrays_csv(self):
+        arrays = timeseries.to_arrays(json2timeseries({'_type': 'timeseries', 'data': CSV, 'units': 'degC'}))
+        assert arrays.times.dtype == np.dtype("datetime64[us]")
+        assert arrays.times[1] == np.datetime64("2023-12-22T12:11:11.111111")
+        assert arrays.values.tolist() == [20.0, 21.0]
+        assert arrays.values_in_base_units.tolist() == [293.15, 294.15]
+        assert arrays.units == "degC"
+        assert repr(arrays) == "TimeSeriesArrays (2 points, degC)"
+
+    def test_to_arrays_rows(self):
+        arrays = timeseries.to_arrays({'_type': 'timeseries', 'data': ROWS, 'units': 'K'})
+        assert len(arrays) == 2
+        assert arrays.times[1] == np.datetime64("2023-12-22T12:11:11")
+        assert arrays.values.dtype == np.float64
+        assert arrays.values_in_base_units is None
+
+    def test_to_arrays_empty(self):
+        assert len(timeseries.to_arrays(TimeSeries({'data': '', 'units': 'K'}))) == 0
+        assert len(timeseries.to_arrays({'data': [], 'units': 'K'})) == 0
+
+    def test_to_arrays_fail(self):
+        with pytest.raises(TypeError):
+            timeseries.to_arrays("data")
+        with pytest.raises(ValueError):
+            timeseries.to_arrays({'data': '"2023-12-22 11:11:11",1\n"2023-12-22 12:11:11",2,3'})
+        with pytest.raises(ValueError):
+            timeseries.to_arrays({'data': [["2023-12-22 11:11:11"]]})
+
+    def test_from_arrays(self):
+        times = np.array(["2023-12-22T11:11:11.111111", "2023-12-22T12:11:11"], dtype="datetime64[us]")
+        payload = timeseries.from_arrays(times, np.array([20.0, 21.5]), "degC")
+        assert json.loads(json.dumps(payload)) == {'_type': 'timeseries', 'units': 'degC', 'data': [
+            ["2023-12-22 11:11:11.111111", 20.0], ["2023-12-22 12:11:11.000000", 21.5]]}
+        arrays = timeseries.to_arrays(json.loads(json.dumps(payload)))
+        assert (arrays.times == times).all()
+        assert len(arrays.to_json()["data"][0]) == 2
+
+    def test_from_arrays_roundtrip(self):
+        times = np.datetime64("2023-01-01T00:00:00", "us") + np.arange(1000).astype("timedelta64[ms]")
+        values = np.random.default_rng(1).random(1000)
+        payload = timeseries.from_arrays(times, values, "V", values * 1000)
+        arrays = timeseries.to_arrays(payload)
+        assert (arrays.times == times).all()
+        assert (arrays.values == values).all()
+        assert (arrays.values_in_base_units == values * 1000).all()
+
+    def test_from_arrays_fail(self):
+        with pytest.raises(TypeError):
+            timeseries.from_arrays([], [], 1)
+        with pytest.raises(ValueError):
+            timeseries.from_arrays(["2023-12-22T11:11:11"], [1.0, 2.0])
+
+    def test_timeseries2json(self):
+        rows = [[datetime(2023, 12, 22, 11, 11, 11, 111111), 20.0], ["2023-12-22 12:11:11", 21.5]]
+        payload = timeseries2json(TimeSeries({'data': rows, 'units': 'degC'}))
+        assert json.loads(json.dumps(payload))['data'] == [
+            ["2023-12-22 11:11:11.111111", 20.0], ["2023-12-22 12:11:11", 21.5]]
+        array = np.array([[1.0, 20.0], [2.0, 21.5]])
+        assert timeseries2json(TimeSeries({'data': array, 'units': 'K'}))['data'] == [[1.0, 20.0], [2.0, 21.5]]
+        assert timeseries2json(TimeSeries({'data': CSV, 'units': 'K'}))['data'] == CSV
+
+    def test_from_frame(self):
+        pd = pytest.importorskip("pandas")
+        index = pd.date_range("2023-12-22 12:00", periods=3, freq="h", tz="Europe/Berlin")
+        frame = pd.DataFrame({"T": [1.0, 2.0, 3.0], "T_base": [274.15, 275.15, 276.15]}, index=index)
+        payload = timeseries.from_frame(frame, "degC", base_units_column="T_base")
+        assert payload["data"][0] == ("2023-12-22 11:00:00.000000", 1.0, 274.15)
+        assert timeseries.from_frame(frame["T"], "degC")["data"][2] == ("2023-12-22 13:00:00.000000", 3.0)
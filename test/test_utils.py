@@ -1,4 +1,6 @@
-from sampledbapi. utils import *
+import pytest
+from sampledbapi import comm
+from sampledbapi.utils import *
 from test import test_authentication, test_users
 
 class TestUtils():
@@ -53,6 +55,14 @@ class TestUtils():
         json2 = datetime2json(datetime)
         assert json == json2
         
+    def test_str2datetime(self):
+        assert str2datetime('2020-01-03 11:11:11') == datetime(2020, 1, 3, 11, 11, 11)
+        assert str2datetime('2020-01-03T11:11:11.470159') == datetime(2020, 1, 3, 11, 11, 11, 470159)
+        assert str2datetime('2020-01-03 12:11:11.500+01:00') == datetime(2020, 1, 3, 11, 11, 11, 500000)
+        assert str2datetime('2020-01-03T11:11:11Z') == datetime(2020, 1, 3, 11, 11, 11)
+        with pytest.raises(ValueError):
+            str2datetime('03.01.2020')
+        
     def test_json2text_fail(self):
         assert json2text('') is None
         assert json2text({'_type': 'test'}) is None
@@ -62,3 +72,79 @@ class TestUtils():
         text = json2text(json)
         json2 = text2json(text)
         assert json == json2
+    
+    def test_json2bool_value(self):
+        assert json2bool({'_type': 'bool', 'value': True}) is True
+        assert json2bool({'_type': 'bool', 'value': False}) is False
+
+
+DATA = {
+    'name': {'_type': 'text', 'text': 'Sample'},
+    'created': {'_type': 'datetime', 'utc_datetime': '2020-01-03 11:11:11'},
+    'mass': {'_type': 'quantity', 'value': 2.5, 'units': 'g', 'magnitude_in_base_units': 0.0025,
+             'dimensionality': '[mass]'},
+    'file': {'_type': 'file', 'file_id': 1},
+    'parts': [{'sample': {'_type': 'object_reference', 'object_id': 3},
+               'ok': {'_type': 'bool', 'value': True}}],
+    'details': {'comment': {'_type': 'text', 'text': 'Nested'}}
+}
+
+SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'name': {'type': 'text'},
+        'created': {'type': 'datetime'},
+        'mass': {'type': 'quantity'},
+        'file': {'type': 'file'},
+        'parts': {'type': 'array', 'items': {'type': 'object', 'properties': {
+            'sample': {'type': 'object_reference'}, 'ok': {'type': 'bool'}}}},
+        'details': {'type': 'object', 'properties': {'comment': {'type': 'text'}}}
+    }
+}
+
+
+class TestConvertJson():
+    
+    def check(self, data):
+        assert data['name'] == 'Sample'
+        assert data['created'] == datetime(2020, 1, 3, 11, 11, 11)
+        assert isinstance(data['mass'], Quantity) and data['mass'].value == 2.5
+        assert data['mass'].magnitude_in_base_units == 0.0025
+        assert data['mass'].dimensionality == '[mass]'
+        assert data['file'] == {'_type': 'file', 'file_id': 1}
+        assert data['parts'] == [{'sample': 3, 'ok': True}]
+        assert data['details'] == {'comment': 'Nested'}
+    
+    def test_convert_json(self):
+        self.check(convert_json(DATA))
+        assert DATA['name'] == {'_type': 'text', 'text': 'Sample'}
+    
+    def test_compile_schema(self):
+        self.check(compile_schema(SCHEMA)(DATA))
+    
+    def test_compile_schema_mismatch(self):
+        # Data of another schema version is decoded generically
+        data = dict(DATA, name=[{'_type': 'text', 'text': 'A'}], extra={'_type': 'bool', 'value': 'True'},
+                    details={'_type': 'text', 'text': 'Flat'})
+        converted = compile_schema(SCHEMA)(data)
+        assert converted['name'] == ['A']
+        assert converted['extra'] is True
+        assert converted['details'] == 'Flat'
+    
+    def test_converter_cache(self, requests_mock):
+        test_authentication.mock_authenticate(requests_mock)
+        self.check(convert_json(DATA, SCHEMA, action_id=7))
+        converter = comm.get_client().schema_converters[7]
+        self.check(convert_json(DATA, {'type': 'object'}, action_id=7))
+        assert comm.get_client().schema_converters[7] is converter
+    
+    def test_lazy_data(self):
+        data = LazyData(DATA)
+        assert len(data) == 6 and 'name' in data
+        assert data['name'] == 'Sample'
+        assert repr(data) == 'LazyData (6 properties)'
+        assert data['mass'] is not data['mass']
+        assert not hasattr(data, '__dict__')
+        assert data.get('missing') is None
+        assert data.raw is DATA
+        self.check(data.materialize())
@@ -0,0 +1,157 @@
+import asyncio
+import time
+import pytest
+import requests
+from sampledbapi import comm
+from sampledbapi.watcher import ObjectLogWatcher
+from test import test_authentication
+
+URL = "http://128.176.208.107:8000/api/v1/object_log_entries/"
+
+def mock_log_entry(log_entry_id, object_id, type="EDIT_OBJECT"):
+    return {"log_entry_id": log_entry_id, "type": type, "object_id": object_id, "user_id": 1,
+            "data": {}, "utc_datetime": "2022-11-21T09:39:08.470159"}
+
+class TestObjectLogWatcher():
+
+    @pytest.fixture(autouse=True)
+    def test_init(self, requests_mock):
+        test_authentication.mock_authenticate(requests_mock)
+        requests_mock.get(URL, json=[mock_log_entry(1, 1), mock_log_entry(2, 1)])
+        requests_mock.get(URL + "?after_id=2",
+                          json=[mock_log_entry(4, 2, "CREATE_OBJECT"), mock_log_entry(3, 1)])
+        requests_mock.get(URL + "?after_id=4", json=[])
+
+    def test_poll_dispatch(self):
+        watcher = ObjectLogWatcher(after_id=2)
+        all_entries, created, object_1 = [], [], []
+        watcher.subscribe(all_entries.append)
+        watcher.subscribe(created.append, types=["CREATE_OBJECT"])
+        watcher.subscribe(object_1.append, object_ids=[1])
+        assert watcher.poll() == 2
+        assert [e.log_entry_id for e in all_entries] == [3, 4]
+        assert [e.log_entry_id for e in created] == [4]
+        assert [e.log_entry_id for e in object_1] == [3]
+        assert watcher.last_id == 4
+        assert watcher.poll() == 0
+
+    def test_start_from_now(self):
+        watcher = ObjectLogWatcher()
+        assert watcher.poll() == 0
+        assert watcher.last_id == 2
+
+    def test_checkpoint_file(self, tmp_path):
+        path = str(tmp_path / "checkpoint")
+        watcher = ObjectLogWatcher(path, after_id=2)
+        watcher.poll()
+        assert ObjectLogWatcher(path, after_id=0).last_id == 4
+
+    def test_callback_error(self, tmp_path):
+        path = str(tmp_path / "checkpoint")
+        watcher = ObjectLogWatcher(path, after_id=2)
+
+        def fail(entry):
+            if entry.log_entry_id == 4:
+                raise ValueError()
+
+        watcher.subscribe(fail)
+        with pytest.raises(ValueError):
+            watcher.poll()
+        assert ObjectLogWatcher(path).last_id == 3
+
+    def test_adaptive_interval(self):
+        watcher = ObjectLogWatcher(after_id=2, min_interval=1, max_interval=5, backoff=2)
+        watcher.poll()
+        assert watcher.interval == 1
+        for interval in [2, 4, 5, 5]:
+            watcher.poll()
+            assert watcher.interval == interval
+        watcher.last_id = 2
+        watcher.poll()
+        assert watcher.interval == 1
+
+    def test_thread(self):
+        watcher = ObjectLogWatcher(after_id=2, min_interval=0.01)
+        entries = []
+        watcher.subscribe(entries.append)
+        watcher.start()
+        assert watcher.running
+        with pytest.raises(Exception):
+            watcher.start()
+        for _ in range(100):
+            if len(entries) == 2:
+                break
+            time.sleep(0.01)
+        watcher.stop()
+        assert not watcher.running
+        assert len(entries) == 2
+
+    def test_thread_error(self, requests_mock):
+        # Client errors and invalid responses do not stop the watcher, errors of callbacks do
+        requests_mock.get(URL + "?after_id=2",
+                          [{"status_code": 403}, {"text": "invalid"}, {"json": [mock_log_entry(3, 1)]}])
+        errors = []
+        def callback(entry):
+            raise ValueError()
+        watcher = ObjectLogWatcher(after_id=2, min_interval=0.01, max_interval=0.05, on_error=errors.append)
+        watcher.subscribe(callback)
+        watcher.start()
+        watcher._thread.join(5)
+        with pytest.raises(ValueError):
+            watcher.stop()
+        assert len(errors) == 2
+
+    def test_thread_request_error(self, requests_mock):
+        requests_mock.get(URL + "?after_id=2",
+                          [{"status_code": 503}, {"json": [mock_log_entry(3, 1)]}])
+        comm.configure_retries(max_attempts=1)
+        try:
+            errors, entries = [], []
+            watcher = ObjectLogWatcher(after_id=2, min_interval=0.01, max_interval=0.05,
+                                       on_error=errors.append)
+            watcher.subscribe(entries.append)
+            watcher.start()
+            for _ in range(100):
+                if entries:
+                    break
+                time.sleep(0.01)
+            watcher.stop()
+            assert len(errors) == 1 and isinstance(errors[0], requests.HTTPError)
+            assert [e.log_entry_id for e in entries] == [3]
+        finally:
+            comm.configure_retries()
+
+    def test_on_error_raises(self, requests_mock):
+        requests_mock.get(URL + "?after_id=2", status_code=503)
+        comm.configure_retries(max_attempts=1)
+        try:
+            def on_error(e):
+                raise ValueError()
+            watcher = ObjectLogWatcher(after_id=2, min_interval=0.01, on_error=on_error)
+            watcher.start()
+            watcher._thread.join(5)
+            with pytest.raises(ValueError):
+                watcher.stop()
+        finally:
+            comm.configure_retries()
+
+    def test_async(self):
+        watcher = ObjectLogWatcher(after_id=2, min_interval=0.01)
+        entries = []
+        watcher.subscribe(entries.append)
+
+        async def main():
+            task = asyncio.ensure_future(watcher.run_async())
+            while len(entries) < 2:
+                await asyncio.sleep(0.01)
+            watcher.stop()
+            await asyncio.wait_for(task, 5)
+
+        asyncio.run(main())
+        assert [e.log_entry_id for e in entries] == [3, 4]
+
+    def test_init_fail(self):
+        with pytest.raises(TypeError):
+            ObjectLogWatcher(after_id="Test")
+        with pytest.raises(ValueError):
+            ObjectLogWatcher(min_interval=0)